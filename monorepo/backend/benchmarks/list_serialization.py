@@ -0,0 +1,104 @@
+"""
+Compare the two ways of serving a GET /inbox page.
+
+  orm   - load Inbox instances restricted to the list view columns, build an
+          InboxListResponse from them and serialize it the way FastAPI does
+          for a response_model: dump, validate again, dump to JSON
+  rows  - select the same columns as plain Row tuples and serialize dicts
+          straight to JSON (what the route does)
+
+Both paths read the same rows, ordered like the list endpoint. Timings are
+the median of --repeat runs, split into query time and serialization time.
+
+Usage:
+    python benchmarks/query_plans.py --seed 200000   # add synthetic rows first
+    python benchmarks/list_serialization.py --limit 1000
+"""
+from typing import Any, Callable, Dict, List, Tuple
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+from sqlalchemy.orm import load_only
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import ASYNC_DATABASE_URL
+from models import Inbox
+from repositories.fieldsets import field_columns, parse_fields, row_dicts
+from repositories.pagination import keyset_order
+from routes.responses import json_response
+from schemas.inbox import INBOX_LIST_FIELDS, InboxListItem, InboxListResponse
+
+FIELDS = parse_fields(None, InboxListItem.model_fields, INBOX_LIST_FIELDS)
+
+def envelope(data: Any, count: int) -> Dict[str, Any]:
+    return {"success": True, "message": f"Found {count} inbox items", "data": data, "count": count}
+
+async def orm_path(session: AsyncSession, limit: int) -> Tuple[float, float, int]:
+    started = time.perf_counter()
+    statement = (
+        select(Inbox)
+        .options(load_only(*field_columns(Inbox, FIELDS), raiseload=True))
+        .order_by(*keyset_order(Inbox))
+        .limit(limit)
+    )
+    items = (await session.exec(statement)).all()
+    queried = time.perf_counter()
+
+    data = [{name: getattr(item, name) for name in FIELDS} for item in items]
+    response = InboxListResponse(**envelope(data, len(items)))
+    content = response.model_dump(exclude_unset=True)
+    body = InboxListResponse.model_validate(content).model_dump_json(exclude_unset=True)
+    finished = time.perf_counter()
+    session.expunge_all()
+    return queried - started, finished - queried, len(body)
+
+async def rows_path(session: AsyncSession, limit: int) -> Tuple[float, float, int]:
+    started = time.perf_counter()
+    statement = select(*field_columns(Inbox, FIELDS)).order_by(*keyset_order(Inbox)).limit(limit)
+    rows = (await session.execute(statement)).all()
+    queried = time.perf_counter()
+
+    body = json_response(envelope(row_dicts(rows, FIELDS), len(rows))).body
+    finished = time.perf_counter()
+    return queried - started, finished - queried, len(body)
+
+async def measure(
+    engine, path: Callable, limit: int, repeat: int
+) -> Tuple[float, float, int]:
+    query_times: List[float] = []
+    serialize_times: List[float] = []
+    size = 0
+    async with AsyncSession(engine) as session:
+        await path(session, limit)  # warm up
+        for _ in range(repeat):
+            query_time, serialize_time, size = await path(session, limit)
+            query_times.append(query_time)
+            serialize_times.append(serialize_time)
+    return statistics.median(query_times), statistics.median(serialize_times), size
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--limit", type=int, default=1000, help="page size")
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per path")
+    args = parser.parse_args()
+
+    engine = create_async_engine(ASYNC_DATABASE_URL)
+    try:
+        print(f"{'path':<6}{'query ms':>12}{'serialize ms':>15}{'total ms':>12}{'bytes':>10}")
+        for name, path in (("orm", orm_path), ("rows", rows_path)):
+            query_time, serialize_time, size = await measure(engine, path, args.limit, args.repeat)
+            total = query_time + serialize_time
+            print(f"{name:<6}{query_time * 1000:>12.2f}{serialize_time * 1000:>15.2f}{total * 1000:>12.2f}{size:>10}")
+    finally:
+        await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,199 @@
+"""
+Compare query plans for the inbox and claim list shapes with and without the
+triage indexes (migration 0b6c1601c6f0).
+
+Each shape runs under EXPLAIN (ANALYZE, BUFFERS) twice inside a transaction:
+once after dropping the triage indexes, once with them in place. The
+transaction is rolled back, so nothing is changed, but DROP INDEX takes an
+exclusive lock on the table while it runs. Use a local or staging database.
+
+Usage:
+    python benchmarks/query_plans.py --seed 200000   # add synthetic rows first
+    python benchmarks/query_plans.py                 # compare plans
+    python benchmarks/query_plans.py --cleanup       # remove synthetic rows
+"""
+from typing import Any, Dict, List, Tuple
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import ASYNC_DATABASE_URL
+
+# Indexes added by the triage migration, dropped for the "before" plans
+TRIAGE_INDEXES = [
+    "ix_inbox_status_created_at",
+    "ix_inbox_open_created_at",
+    "ix_inbox_open_priority_created_at",
+    "ix_inbox_assigned_to_status_created_at",
+    "ix_inbox_created_at_brin",
+    "ix_inbox_event_date_brin",
+    "ix_claims_status_created_at",
+    "ix_claims_created_at_brin",
+    "ix_claims_event_date_brin",
+]
+
+# The statements the list endpoints issue for common triage filters
+QUERY_SHAPES: List[Tuple[str, str]] = [
+    (
+        "inbox: status page",
+        "SELECT * FROM inbox WHERE inbox_status = 'new' "
+        "ORDER BY created_at DESC, id DESC LIMIT 50",
+    ),
+    (
+        "inbox: open items by priority",
+        "SELECT * FROM inbox WHERE inbox_status = 'new' AND priority = 'urgent' "
+        "ORDER BY created_at DESC, id DESC LIMIT 50",
+    ),
+    (
+        "inbox: assignee queue",
+        "SELECT * FROM inbox WHERE assigned_to = 'adjuster-7' AND inbox_status = 'processing' "
+        "ORDER BY created_at DESC, id DESC LIMIT 50",
+    ),
+    (
+        "inbox: unprocessed count",
+        "SELECT count(inbox.id) FROM inbox WHERE inbox_status IN ('new', 'processing')",
+    ),
+    (
+        "inbox: event date window",
+        "SELECT * FROM inbox WHERE event_date >= current_date - 7 AND event_date <= current_date "
+        "ORDER BY created_at DESC, id DESC LIMIT 50",
+    ),
+    (
+        "claims: status page",
+        "SELECT * FROM claims WHERE claim_status = 'submitted' "
+        "ORDER BY created_at DESC, id DESC LIMIT 50",
+    ),
+]
+
+SEED_INBOX = """
+INSERT INTO inbox (
+    id, first_name, last_name, date_of_birth, event_type, event_date, event_location,
+    damage_description, photos, contact_email, ingest_method, inbox_status, claim_status,
+    assigned_to, priority, created_at, updated_at
+)
+SELECT
+    'BENCH' || n,
+    'First' || (n % 5000),
+    'Last' || (n % 7000),
+    date '1970-01-01' + (n % 15000),
+    (ARRAY['collision', 'theft', 'weather', 'vandalism'])[1 + n % 4],
+    current_date - (:rows - n) / 200,
+    'Benchmark street ' || n,
+    'Synthetic benchmark row',
+    ARRAY[]::varchar[],
+    'bench' || n || '@example.com',
+    'email',
+    -- Most of a mature inbox is already processed
+    (ARRAY['converted', 'converted', 'converted', 'rejected', 'archived', 'new', 'processing'])[1 + n % 7],
+    'draft',
+    CASE WHEN n % 3 = 0 THEN 'adjuster-' || (n % 20) END,
+    (ARRAY['low', 'normal', 'normal', 'high', 'urgent'])[1 + n % 5],
+    now() - ((:rows - n) || ' seconds')::interval,
+    now() - ((:rows - n) || ' seconds')::interval
+FROM generate_series(1, :rows) AS n
+"""
+
+SEED_CLAIMS = """
+INSERT INTO claims (
+    id, claim_id, first_name, last_name, date_of_birth, event_type, event_date, event_location,
+    damage_description, photos, contact_email, ingest_method, claim_status, created_at, updated_at
+)
+SELECT
+    'BENCH' || n,
+    'BENCH' || n,
+    'First' || (n % 5000),
+    'Last' || (n % 7000),
+    date '1970-01-01' + (n % 15000),
+    (ARRAY['collision', 'theft', 'weather', 'vandalism'])[1 + n % 4],
+    current_date - (:rows - n) / 200,
+    'Benchmark street ' || n,
+    'Synthetic benchmark row',
+    ARRAY[]::varchar[],
+    'bench' || n || '@example.com',
+    'manual',
+    (ARRAY['submitted', 'approved', 'approved', 'closed', 'closed', 'denied'])[1 + n % 6],
+    now() - ((:rows - n) || ' seconds')::interval,
+    now() - ((:rows - n) || ' seconds')::interval
+FROM generate_series(1, :rows) AS n
+"""
+
+def plan_nodes(plan: Dict[str, Any]) -> List[str]:
+    """Flatten a JSON plan into node descriptions, outermost first"""
+    node = plan["Node Type"]
+    if "Index Name" in plan:
+        node = f"{node} using {plan['Index Name']}"
+    elif "Relation Name" in plan:
+        node = f"{node} on {plan['Relation Name']}"
+    nodes = [node]
+    for child in plan.get("Plans", []):
+        nodes.extend(plan_nodes(child))
+    return nodes
+
+async def explain(connection, sql: str) -> Tuple[float, List[str], int]:
+    result = await connection.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"))
+    output = result.scalar_one()
+    if isinstance(output, str):
+        output = json.loads(output)
+    plan = output[0]["Plan"]
+    buffers = plan.get("Shared Hit Blocks", 0) + plan.get("Shared Read Blocks", 0)
+    return output[0]["Execution Time"], plan_nodes(plan), buffers
+
+async def compare_plans(engine) -> None:
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        try:
+            await connection.execute(text("ANALYZE inbox"))
+            await connection.execute(text("ANALYZE claims"))
+
+            after = {name: await explain(connection, sql) for name, sql in QUERY_SHAPES}
+            for index in TRIAGE_INDEXES:
+                await connection.execute(text(f"DROP INDEX IF EXISTS {index}"))
+            before = {name: await explain(connection, sql) for name, sql in QUERY_SHAPES}
+        finally:
+            await transaction.rollback()
+
+    for name, _ in QUERY_SHAPES:
+        print(f"\n{name}")
+        for label, (ms, nodes, buffers) in (("before", before[name]), ("after", after[name])):
+            seq = " [seq scan]" if any(node.startswith("Seq Scan") for node in nodes) else ""
+            print(f"  {label:<7}{ms:>10.2f} ms {buffers:>8} buffers{seq}")
+            print(f"         {' -> '.join(nodes)}")
+
+async def seed(engine, rows: int) -> None:
+    async with engine.begin() as connection:
+        await connection.execute(text(SEED_INBOX), {"rows": rows})
+        await connection.execute(text(SEED_CLAIMS), {"rows": rows})
+    print(f"Inserted {rows} inbox rows and {rows} claims")
+
+async def cleanup(engine) -> None:
+    async with engine.begin() as connection:
+        await connection.execute(text("DELETE FROM inbox WHERE id LIKE 'BENCH%'"))
+        await connection.execute(text("DELETE FROM claims WHERE id LIKE 'BENCH%'"))
+    print("Removed benchmark rows")
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0, help="insert this many synthetic inbox rows and claims first")
+    parser.add_argument("--cleanup", action="store_true", help="remove synthetic rows and exit")
+    args = parser.parse_args()
+
+    engine = create_async_engine(ASYNC_DATABASE_URL)
+    try:
+        if args.cleanup:
+            await cleanup(engine)
+            return
+        if args.seed:
+            await seed(engine, args.seed)
+        await compare_plans(engine)
+    finally:
+        await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,18 +1,23 @@
 import ssl
+import time
+import uuid
 from asyncio import current_task
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator, Callable, Annotated
+from typing import AsyncGenerator, Callable, Annotated, Any, Dict, Optional
 
 import os
 from dotenv import load_dotenv
-from fastapi import Depends
+from fastapi import Depends, Request
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     async_scoped_session,
     async_sessionmaker,
     create_async_engine,
 )
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.orm.session import Session
 
 # Load environment variables
 load_dotenv()
@@ -20,17 +25,169 @@ load_dotenv()
 # Get database URL from environment
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# Optional read replica used for read-only repository methods
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+
+# Optional URL reaching the primary directly, bypassing pgbouncer, for work
+# that keeps session state (advisory locks, LISTEN) on its connection
+DATABASE_DIRECT_URL = os.getenv("DATABASE_DIRECT_URL")
+
+def to_async_url(url: Optional[str]) -> Optional[str]:
+    """Convert a postgresql:// URL to use the asyncpg driver"""
+    if url and url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://")
+    return url
+
 # Convert to async URL if needed
-if DATABASE_URL and DATABASE_URL.startswith("postgresql://"):
-    ASYNC_DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
-else:
-    ASYNC_DATABASE_URL = DATABASE_URL
+ASYNC_DATABASE_URL = to_async_url(DATABASE_URL)
+ASYNC_DATABASE_REPLICA_URL = to_async_url(DATABASE_REPLICA_URL)
+ASYNC_DATABASE_DIRECT_URL = to_async_url(DATABASE_DIRECT_URL)
+
+# Requests carrying this header read from the primary, so a client that has
+# just written sees its own changes regardless of replica lag
+READ_YOUR_WRITES_HEADER = "X-Read-Your-Writes"
+
+# Session.info keys used for replica routing
+ROUTE_KEY = "db_route"
+PIN_PRIMARY_KEY = "db_pin_primary"
+
+# Connection pool configuration. Sizes are per process, so with N uvicorn
+# workers the database sees up to N * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections.
+#   null      - open a new connection for every session (previous behaviour)
+#   queue     - keep a pool of persistent connections per worker
+#   pgbouncer - pooled, but safe behind pgbouncer in transaction mode
+DB_POOL_MODE = os.getenv("DB_POOL_MODE", "null").lower()
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+POOL_MODES = ("null", "queue", "pgbouncer")
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that records how long callers wait for a connection.
+
+    Wait time includes the time spent opening a new connection when the pool
+    has to grow, which is what a request actually pays before its first query.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - started
+            self.checkouts += 1
+            self.total_wait_time += waited
+            self.max_wait_time = max(self.max_wait_time, waited)
+
+
+def build_engine_kwargs(
+    pool_mode: str = DB_POOL_MODE,
+    pool_size: int = DB_POOL_SIZE,
+    max_overflow: int = DB_MAX_OVERFLOW,
+    pool_timeout: float = DB_POOL_TIMEOUT,
+    pool_recycle: int = DB_POOL_RECYCLE,
+    pool_pre_ping: bool = DB_POOL_PRE_PING,
+) -> Dict[str, Any]:
+    """
+    Build the pool related keyword arguments for create_async_engine
+
+    Args:
+        pool_mode: One of "null", "queue" or "pgbouncer"
+        pool_size: Number of persistent connections kept per worker
+        max_overflow: Extra connections allowed above pool_size under load
+        pool_timeout: Seconds to wait for a connection before giving up
+        pool_recycle: Seconds after which a connection is replaced
+        pool_pre_ping: Test connections for liveness on checkout
+
+    Returns:
+        Dictionary of engine keyword arguments (connect_args excluded)
+    """
+    if pool_mode not in POOL_MODES:
+        raise ValueError(f"Invalid DB_POOL_MODE: {pool_mode}. Valid modes are: {', '.join(POOL_MODES)}")
+
+    if pool_mode == "null":
+        return {"poolclass": NullPool, "pool_pre_ping": pool_pre_ping}
+
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": pool_timeout,
+        "pool_recycle": pool_recycle,
+        "pool_pre_ping": pool_pre_ping,
+    }
+
+
+def build_connect_args(pool_mode: str, ssl_args: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build asyncpg connect arguments for the given pool mode
+
+    pgbouncer in transaction mode hands each transaction a different server
+    connection, so asyncpg's prepared statement caches have to be disabled and
+    statement names made unique to avoid collisions between clients.
+    """
+    connect_args = dict(ssl_args)
+    if pool_mode == "pgbouncer":
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid.uuid4()}__"
+    return connect_args
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads to a replica engine when asked to.
+
+    Statements go to the replica only while a repository method marked as
+    read-only is running (see repositories.base.read_only) and the session has
+    not written anything yet. Once a session flushes or executes a DML
+    statement it is pinned to the primary for the rest of its life, so a
+    request always reads its own writes.
+    """
+
+    replica_bind = None
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if (
+            self.replica_bind is not None
+            and self.info.get(ROUTE_KEY) == "replica"
+            and not self.info.get(PIN_PRIMARY_KEY)
+            and not self._flushing
+        ):
+            return self.replica_bind
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _pin_after_flush(session, flush_context):
+    session.info[PIN_PRIMARY_KEY] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _pin_after_dml(orm_execute_state):
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info[PIN_PRIMARY_KEY] = True
+
 
 class DatabaseManager:
     def __init__(
         self,
         async_db_url: str,
         ssl_cert_path: str = "/etc/ssl/certs/ca-certificates.crt",
+        pool_mode: str = DB_POOL_MODE,
+        replica_db_url: Optional[str] = None,
+        direct_db_url: Optional[str] = None,
     ):
         try:
             self.ssl_context = ssl.create_default_context(cafile=ssl_cert_path)
@@ -39,18 +196,29 @@ class DatabaseManager:
             # If SSL context fails, try without SSL
             ssl_args = {}
 
-        self.async_engine = create_async_engine(
-            async_db_url,
-            future=True,
-            poolclass=NullPool,
-            pool_pre_ping=True,
-            echo=False,
-            connect_args=ssl_args,
+        self.pool_mode = pool_mode
+
+        self.async_engine = self._create_engine(async_db_url, ssl_args)
+        self.replica_engine: Optional[AsyncEngine] = (
+            self._create_engine(replica_db_url, ssl_args) if replica_db_url else None
+        )
+        # Unpooled, since it only serves a few long-lived connections
+        self.direct_engine: Optional[AsyncEngine] = (
+            create_async_engine(direct_db_url, future=True, echo=False, connect_args=ssl_args, poolclass=NullPool)
+            if direct_db_url else None
+        )
+
+        # Each manager gets its own session class so the replica bind is not shared
+        session_class = type(
+            "RoutingSession",
+            (RoutingSession,),
+            {"replica_bind": self.replica_engine.sync_engine if self.replica_engine else None},
         )
 
         self.async_session_factory = async_sessionmaker(
             self.async_engine,
             class_=AsyncSession,
+            sync_session_class=session_class,
             expire_on_commit=False,
         )
         self.async_scoped_session = async_scoped_session(
@@ -58,8 +226,37 @@ class DatabaseManager:
             scopefunc=current_task,
         )
 
-    async def get_async_session(self) -> AsyncGenerator[AsyncSession, None]:
+    def _create_engine(self, async_db_url: str, ssl_args: Dict[str, Any]) -> AsyncEngine:
+        return create_async_engine(
+            async_db_url,
+            future=True,
+            echo=False,
+            connect_args=build_connect_args(self.pool_mode, ssl_args),
+            **build_engine_kwargs(self.pool_mode),
+        )
+
+    @property
+    def session_engine(self) -> Optional[AsyncEngine]:
+        """
+        Engine whose connections keep session state until they are closed
+
+        Session advisory locks and LISTEN are tied to the server connection,
+        which pgbouncer in transaction mode swaps between transactions.
+
+        Returns:
+            The direct engine if configured, else the primary engine unless it
+            goes through pgbouncer, else None
+        """
+        if self.direct_engine is not None:
+            return self.direct_engine
+        if self.pool_mode == "pgbouncer":
+            return None
+        return self.async_engine
+
+    async def get_async_session(self, request: Request = None) -> AsyncGenerator[AsyncSession, None]:
         async with self.async_scoped_session() as session:
+            if request is not None and request.headers.get(READ_YOUR_WRITES_HEADER):
+                session.info[PIN_PRIMARY_KEY] = True
             yield session
 
     @asynccontextmanager
@@ -70,10 +267,56 @@ class DatabaseManager:
         finally:
             await async_session_.close()
 
+    def pool_stats(self) -> Dict[str, Any]:
+        """
+        Get live statistics for this worker's connection pools
+
+        Returns:
+            Dictionary with pool configuration, current usage and wait times,
+            plus a "replica" entry when a read replica is configured
+        """
+        stats = self._engine_pool_stats(self.async_engine)
+        if self.replica_engine is not None:
+            stats["replica"] = self._engine_pool_stats(self.replica_engine)
+        return stats
+
+    def _engine_pool_stats(self, engine: AsyncEngine) -> Dict[str, Any]:
+        pool = engine.pool
+        stats: Dict[str, Any] = {
+            "pid": os.getpid(),
+            "mode": self.pool_mode,
+            "pool_class": type(pool).__name__,
+        }
+
+        if not isinstance(pool, InstrumentedQueuePool):
+            return stats
+
+        stats.update({
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "checkouts": pool.checkouts,
+            "avg_wait_ms": round(pool.total_wait_time / pool.checkouts * 1000, 3) if pool.checkouts else 0.0,
+            "max_wait_ms": round(pool.max_wait_time * 1000, 3),
+        })
+        return stats
+
+    async def dispose(self) -> None:
+        """Close all pooled connections held by this worker"""
+        await self.async_engine.dispose()
+        if self.replica_engine is not None:
+            await self.replica_engine.dispose()
+        if self.direct_engine is not None:
+            await self.direct_engine.dispose()
+
 
 db_manager = DatabaseManager(
     async_db_url=ASYNC_DATABASE_URL,
+    replica_db_url=ASYNC_DATABASE_REPLICA_URL,
+    direct_db_url=ASYNC_DATABASE_DIRECT_URL,
 )
 
 get_async_session = db_manager.get_async_session
-get_async_session_temp = db_manager.get_async_session_temp
\ No newline at end of file
+get_async_session_temp = db_manager.get_async_session_temp
@@ -10,6 +10,12 @@ import os
 # Local imports
 from routes import api_router
 from database import db_manager
+from repositories.invalidation import invalidation_bus
+from repositories.partitions import partition_maintainer
+from repositories.archive import inbox_archiver
+from repositories.extraction import extraction_store
+from services.gemini import start_gemini_service, stop_gemini_service
+from services.schema_registry import schema_registry
 
 # Load environment variables
 load_dotenv()
@@ -50,12 +56,38 @@ async def on_startup():
         await conn.run_sync(SQLModel.metadata.create_all)
     
     logger.info("Database tables created")
+    
+    # Monthly partitions of inbox and claims, created ahead of time; expired
+    # months are only detached over a connection that keeps session locks
+    session_engine = db_manager.session_engine
+    await partition_maintainer.start(session_engine or db_manager.async_engine, detach=session_engine is not None)
+    
+    # Processed inbox items move to inbox_archive in the background
+    await inbox_archiver.start(db_manager.async_session_factory)
+    
+    # Gemini response schemas, validated before serving
+    schema_registry.load()
+    
+    # Shared Gemini client for every request in this worker
+    start_gemini_service()
+    
+    # Stored document extractions, evicted in the background
+    await extraction_store.start(db_manager.async_session_factory)
+    
+    # Cross-worker cache invalidation
+    await invalidation_bus.start(session_engine or db_manager.async_engine)
 
 @app.on_event("shutdown")
 async def on_shutdown():
     """
     Clean up resources on application shutdown.
     """
+    await invalidation_bus.stop()
+    await partition_maintainer.stop()
+    await inbox_archiver.stop()
+    await extraction_store.stop()
+    await stop_gemini_service()
+    await db_manager.dispose()
     logger.info("Shutting down application")
 
 # Root endpoint that redirects to docs
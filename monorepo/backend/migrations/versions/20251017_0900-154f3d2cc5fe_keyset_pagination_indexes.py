@@ -0,0 +1,33 @@
+"""keyset pagination indexes
+
+Revision ID: 154f3d2cc5fe
+Revises: 87f2d9e17542
+Create Date: 2025-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '154f3d2cc5fe'
+down_revision: Union[str, Sequence[str], None] = '87f2d9e17542'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built concurrently so large tables stay writable during the migration
+    with op.get_context().autocommit_block():
+        op.create_index('ix_inbox_created_at_id', 'inbox', ['created_at', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_claims_created_at_id', 'claims', ['created_at', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_claims_created_at_id', table_name='claims', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_inbox_created_at_id', table_name='inbox', postgresql_concurrently=True, if_exists=True)
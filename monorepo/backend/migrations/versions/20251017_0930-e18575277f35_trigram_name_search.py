@@ -0,0 +1,50 @@
+"""trigram name search
+
+Revision ID: e18575277f35
+Revises: 154f3d2cc5fe
+Create Date: 2025-10-17 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e18575277f35'
+down_revision: Union[str, Sequence[str], None] = '154f3d2cc5fe'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGRAM_INDEXES = [
+    ('ix_inbox_first_name_trgm', 'inbox', 'first_name'),
+    ('ix_inbox_last_name_trgm', 'inbox', 'last_name'),
+    ('ix_claims_first_name_trgm', 'claims', 'first_name'),
+    ('ix_claims_last_name_trgm', 'claims', 'last_name'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    with op.get_context().autocommit_block():
+        for name, table, column in TRIGRAM_INDEXES:
+            op.create_index(
+                name,
+                table,
+                [column],
+                unique=False,
+                postgresql_using='gin',
+                postgresql_ops={column: 'gin_trgm_ops'},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The extension is left installed; other objects may depend on it
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(TRIGRAM_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
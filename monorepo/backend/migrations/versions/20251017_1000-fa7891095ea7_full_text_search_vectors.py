@@ -0,0 +1,53 @@
+"""full text search vectors
+
+Generated columns are filled in when they are added, which rewrites the
+table under an exclusive lock. Run this in a quiet window on large tables.
+
+Revision ID: fa7891095ea7
+Revises: e18575277f35
+Create Date: 2025-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fa7891095ea7'
+down_revision: Union[str, Sequence[str], None] = 'e18575277f35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INBOX_SEARCH_VECTOR = (
+    "setweight(to_tsvector('english'::regconfig, coalesce(email_subject, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(damage_description, '')), 'B') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(raw_email_content, '')), 'C')"
+)
+
+CLAIM_SEARCH_VECTOR = (
+    "setweight(to_tsvector('english'::regconfig, coalesce(damage_description, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(event_location, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('inbox', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(INBOX_SEARCH_VECTOR, persisted=True), nullable=True))
+    op.add_column('claims', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(CLAIM_SEARCH_VECTOR, persisted=True), nullable=True))
+
+    with op.get_context().autocommit_block():
+        op.create_index('ix_inbox_search_vector', 'inbox', ['search_vector'], unique=False, postgresql_using='gin', postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_claims_search_vector', 'claims', ['search_vector'], unique=False, postgresql_using='gin', postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_claims_search_vector', table_name='claims', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_inbox_search_vector', table_name='inbox', postgresql_concurrently=True, if_exists=True)
+
+    op.drop_column('claims', 'search_vector')
+    op.drop_column('inbox', 'search_vector')
@@ -0,0 +1,54 @@
+"""triage query indexes
+
+Composite and partial indexes for the inbox and claim list filters, plus BRIN
+indexes for date windows. benchmarks/query_plans.py shows the plans before
+and after.
+
+Revision ID: 0b6c1601c6f0
+Revises: fa7891095ea7
+Create Date: 2025-10-17 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b6c1601c6f0'
+down_revision: Union[str, Sequence[str], None] = 'fa7891095ea7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OPEN_INBOX_STATUSES = "inbox_status IN ('new', 'processing')"
+
+# (name, table, columns, extra create_index keyword arguments)
+INDEXES = [
+    ('ix_inbox_status_created_at', 'inbox', ['inbox_status', 'created_at', 'id'], {}),
+    ('ix_inbox_open_created_at', 'inbox', ['created_at', 'id'], {'postgresql_where': sa.text(OPEN_INBOX_STATUSES)}),
+    ('ix_inbox_open_priority_created_at', 'inbox', ['priority', 'created_at', 'id'], {'postgresql_where': sa.text(OPEN_INBOX_STATUSES)}),
+    ('ix_inbox_assigned_to_status_created_at', 'inbox', ['assigned_to', 'inbox_status', 'created_at'], {'postgresql_where': sa.text('assigned_to IS NOT NULL')}),
+    ('ix_inbox_created_at_brin', 'inbox', ['created_at'], {'postgresql_using': 'brin'}),
+    ('ix_inbox_event_date_brin', 'inbox', ['event_date'], {'postgresql_using': 'brin'}),
+    ('ix_claims_status_created_at', 'claims', ['claim_status', 'created_at', 'id'], {}),
+    ('ix_claims_created_at_brin', 'claims', ['created_at'], {'postgresql_using': 'brin'}),
+    ('ix_claims_event_date_brin', 'claims', ['event_date'], {'postgresql_using': 'brin'}),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True, **kwargs)
+        # Refresh planner statistics so the new indexes are costed correctly
+        op.execute('ANALYZE inbox')
+        op.execute('ANALYZE claims')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,70 @@
+"""inbox counters
+
+Counter table for GET /inbox/stats, maintained by triggers on inbox in the
+same transaction as each insert, update and delete, and backfilled from the
+current rows. TRUNCATE on inbox is not tracked; re-run the backfill after one.
+
+Revision ID: fcd817c2af34
+Revises: 0b6c1601c6f0
+Create Date: 2025-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from models.triggers import INBOX_COUNTERS_TRIGGERS, inbox_counters_function
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fcd817c2af34'
+down_revision: Union[str, Sequence[str], None] = '0b6c1601c6f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('inbox_counters',
+    sa.Column('dimension', sa.VARCHAR(length=20), nullable=False),
+    sa.Column('key', sa.VARCHAR(length=100), nullable=False),
+    sa.Column('count', sa.BigInteger(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('dimension', 'key')
+    )
+
+    op.execute(inbox_counters_function(with_total=True, slots=None))
+    for trigger in INBOX_COUNTERS_TRIGGERS:
+        op.execute(trigger)
+
+    # Backfill from the rows that exist now. CREATE TRIGGER holds a lock that
+    # blocks writes to inbox until this migration commits, so none are missed.
+    op.execute("""
+        INSERT INTO inbox_counters (dimension, key, count)
+        SELECT
+            CASE
+                WHEN GROUPING(inbox_status) = 0 THEN 'status'
+                WHEN GROUPING(priority) = 0 THEN 'priority'
+                WHEN GROUPING(assigned_to) = 0 THEN 'assignee'
+                ELSE 'total'
+            END,
+            coalesce(
+                CASE
+                    WHEN GROUPING(inbox_status) = 0 THEN inbox_status
+                    WHEN GROUPING(priority) = 0 THEN priority
+                    ELSE assigned_to
+                END,
+                ''
+            ),
+            count(*)
+        FROM inbox
+        GROUP BY GROUPING SETS ((inbox_status), (priority), (assigned_to), ())
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP TRIGGER IF EXISTS inbox_counters_update ON inbox')
+    op.execute('DROP TRIGGER IF EXISTS inbox_counters_insert_delete ON inbox')
+    op.execute('DROP FUNCTION IF EXISTS inbox_counters_trigger()')
+    op.drop_table('inbox_counters')
@@ -0,0 +1,100 @@
+"""document counts
+
+document_count columns on inbox and claims, maintained by a trigger on
+documents in the same transaction as each insert, delete and move between
+parents, and backfilled from the current rows.
+
+Revision ID: 5a3e9c4d7b21
+Revises: fcd817c2af34
+Create Date: 2025-10-17 11:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a3e9c4d7b21'
+down_revision: Union[str, Sequence[str], None] = 'fcd817c2af34'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A constant default is stored in the catalog, so neither table is rewritten
+    op.add_column('inbox', sa.Column('document_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('claims', sa.Column('document_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Parents are always updated claims first, then inbox
+    op.execute("""
+        CREATE FUNCTION documents_parent_count_trigger() RETURNS trigger AS $$
+        DECLARE
+            old_claim_id text;
+            old_inbox_id text;
+            new_claim_id text;
+            new_inbox_id text;
+        BEGIN
+            IF TG_OP <> 'INSERT' THEN
+                old_claim_id := OLD.claim_id;
+                old_inbox_id := OLD.inbox_id;
+            END IF;
+            IF TG_OP <> 'DELETE' THEN
+                new_claim_id := NEW.claim_id;
+                new_inbox_id := NEW.inbox_id;
+            END IF;
+
+            IF old_claim_id IS DISTINCT FROM new_claim_id THEN
+                UPDATE claims
+                SET document_count = document_count + CASE WHEN id = new_claim_id THEN 1 ELSE -1 END
+                WHERE id IN (old_claim_id, new_claim_id);
+            END IF;
+            IF old_inbox_id IS DISTINCT FROM new_inbox_id THEN
+                UPDATE inbox
+                SET document_count = document_count + CASE WHEN id = new_inbox_id THEN 1 ELSE -1 END
+                WHERE id IN (old_inbox_id, new_inbox_id);
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER documents_parent_count_insert_delete
+        AFTER INSERT OR DELETE ON documents
+        FOR EACH ROW EXECUTE FUNCTION documents_parent_count_trigger()
+    """)
+    op.execute("""
+        CREATE TRIGGER documents_parent_count_update
+        AFTER UPDATE OF claim_id, inbox_id ON documents
+        FOR EACH ROW
+        WHEN (
+            OLD.claim_id IS DISTINCT FROM NEW.claim_id
+            OR OLD.inbox_id IS DISTINCT FROM NEW.inbox_id
+        )
+        EXECUTE FUNCTION documents_parent_count_trigger()
+    """)
+
+    # Backfill from the rows that exist now. CREATE TRIGGER holds a lock that
+    # blocks writes to documents until this migration commits, so none are missed.
+    op.execute("""
+        UPDATE claims SET document_count = counts.n
+        FROM (SELECT claim_id, count(*) AS n FROM documents WHERE claim_id IS NOT NULL GROUP BY claim_id) AS counts
+        WHERE claims.id = counts.claim_id
+    """)
+    op.execute("""
+        UPDATE inbox SET document_count = counts.n
+        FROM (SELECT inbox_id, count(*) AS n FROM documents WHERE inbox_id IS NOT NULL GROUP BY inbox_id) AS counts
+        WHERE inbox.id = counts.inbox_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP TRIGGER IF EXISTS documents_parent_count_update ON documents')
+    op.execute('DROP TRIGGER IF EXISTS documents_parent_count_insert_delete ON documents')
+    op.execute('DROP FUNCTION IF EXISTS documents_parent_count_trigger()')
+    op.drop_column('claims', 'document_count')
+    op.drop_column('inbox', 'document_count')
@@ -0,0 +1,30 @@
+"""autoupload email domain index
+
+Revision ID: 9c1d4e7f2a86
+Revises: 5a3e9c4d7b21
+Create Date: 2025-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c1d4e7f2a86'
+down_revision: Union[str, Sequence[str], None] = '5a3e9c4d7b21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_autoupload_emails_domain'), 'autoupload_emails', ['domain'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_autoupload_emails_domain'), table_name='autoupload_emails', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,35 @@
+"""claim metadata gin indexes
+
+jsonb_path_ops GIN indexes on inbox and claims claim_metadata, for the
+metadata containment and key filters of the list endpoints.
+
+Revision ID: 3e7b2f9a5c14
+Revises: 9c1d4e7f2a86
+Create Date: 2025-10-17 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e7b2f9a5c14'
+down_revision: Union[str, Sequence[str], None] = '9c1d4e7f2a86'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_inbox_claim_metadata', 'inbox', ['claim_metadata'], unique=False, postgresql_using='gin', postgresql_ops={'claim_metadata': 'jsonb_path_ops'}, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_claims_claim_metadata', 'claims', ['claim_metadata'], unique=False, postgresql_using='gin', postgresql_ops={'claim_metadata': 'jsonb_path_ops'}, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_claims_claim_metadata', table_name='claims', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_inbox_claim_metadata', table_name='inbox', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,169 @@
+"""partition inbox and claims
+
+Rebuild inbox and claims as tables range partitioned by created_at, one
+partition per month from the oldest row to PREMAKE_MONTHS ahead; the app's
+partition maintainer keeps creating months from there.
+
+Each table is copied under an EXCLUSIVE lock (reads continue, writes wait),
+so run this in a maintenance window. Its indexes and triggers are recreated
+on the partitioned table, where they apply to every partition.
+
+Partitioning changes two guarantees, restored by triggers:
+- the primary key must include created_at, so id (and claim_id) uniqueness
+  across partitions is checked by a BEFORE trigger instead of an index;
+- documents can no longer reference claims(id) or inbox(id) with a foreign
+  key, so a delete trigger on each parent clears documents.claim_id and
+  documents.inbox_id, as ON DELETE SET NULL did.
+
+There is no default partition: rows must fall in a created month, and old
+months can be detached concurrently.
+
+Revision ID: 6d2a8f4c1e97
+Revises: 3e7b2f9a5c14
+Create Date: 2025-10-17 13:00:00.000000
+
+"""
+from datetime import date, datetime, timezone
+from typing import List, Sequence, Tuple, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from models.triggers import (
+    PARTITIONED_UNIQUE_FUNCTION,
+    documents_parent_delete_function,
+    partitioned_parent_triggers,
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6d2a8f4c1e97'
+down_revision: Union[str, Sequence[str], None] = '3e7b2f9a5c14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('inbox', 'claims')
+PREMAKE_MONTHS = 3
+
+# Column of documents pointing at each table
+DOCUMENT_COLUMNS = {'claims': 'claim_id', 'inbox': 'inbox_id'}
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _indexes(table: str) -> List[Tuple[str, str]]:
+    """Name and definition of every index of table except the primary key"""
+    return op.get_bind().execute(sa.text("""
+        SELECT i.relname, pg_get_indexdef(i.oid)
+        FROM pg_index x JOIN pg_class i ON i.oid = x.indexrelid
+        WHERE x.indrelid = CAST(:table AS regclass) AND NOT x.indisprimary
+        ORDER BY i.relname
+    """), {'table': table}).all()
+
+
+def _triggers(table: str) -> List[str]:
+    """Definitions of the user triggers on table"""
+    return op.get_bind().execute(sa.text("""
+        SELECT pg_get_triggerdef(oid) FROM pg_trigger
+        WHERE tgrelid = CAST(:table AS regclass) AND NOT tgisinternal
+        ORDER BY tgname
+    """), {'table': table}).scalars().all()
+
+
+def _rebuild(table: str, partitioned: bool) -> None:
+    """Copy table into a new partitioned (or plain) table that replaces it"""
+    bind = op.get_bind()
+    indexes = _indexes(table)
+    triggers = _triggers(table)
+    # Generated columns (search_vector) are recomputed, not copied
+    columns = ', '.join(
+        column['name'] for column in sa.inspect(bind).get_columns(table) if not column.get('computed')
+    )
+    rebuilt = f'{table}_rebuild'
+
+    op.execute(f'LOCK TABLE {table} IN EXCLUSIVE MODE')
+    op.execute(
+        f'CREATE TABLE {rebuilt} (LIKE {table} INCLUDING ALL EXCLUDING INDEXES)'
+        + (' PARTITION BY RANGE (created_at)' if partitioned else '')
+    )
+    if partitioned:
+        oldest, newest = bind.execute(sa.text(
+            f"SELECT date_trunc('month', min(created_at) AT TIME ZONE 'UTC')::date, "
+            f"date_trunc('month', max(created_at) AT TIME ZONE 'UTC')::date FROM {table}"
+        )).one()
+        current = datetime.now(timezone.utc).date().replace(day=1)
+        month = min(oldest or current, current)
+        last = max(newest or current, _add_months(current, PREMAKE_MONTHS))
+        while month <= last:
+            upper = _add_months(month, 1)
+            op.execute(
+                f'CREATE TABLE {table}_y{month.year:04d}m{month.month:02d} PARTITION OF {rebuilt} '
+                f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') TO ('{upper.isoformat()} 00:00:00+00')"
+            )
+            month = upper
+
+    op.execute(f'INSERT INTO {rebuilt} ({columns}) SELECT {columns} FROM {table}')
+    op.execute(f'DROP TABLE {table}')
+    op.execute(f'ALTER TABLE {rebuilt} RENAME TO {table}')
+    op.execute(
+        f'ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY '
+        + ('(id, created_at)' if partitioned else '(id)')
+    )
+
+    # Unique indexes must include the partition key, so claim_id becomes a
+    # plain index and its uniqueness moves to the trigger
+    for name, definition in indexes:
+        # Definitions read off a partitioned table say ON ONLY
+        definition = definition.replace(' ON ONLY ', ' ON ')
+        if name == f'ix_{table}_claim_id':
+            definition = definition.replace('CREATE UNIQUE INDEX', 'CREATE INDEX')
+            if not partitioned:
+                definition = definition.replace('CREATE INDEX', 'CREATE UNIQUE INDEX')
+        op.execute(definition)
+    # Created after the copy, so the inbox counters are not counted twice
+    for definition in triggers:
+        op.execute(definition)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    for foreign_key in sa.inspect(bind).get_foreign_keys('documents'):
+        if foreign_key['referred_table'] in TABLES:
+            op.drop_constraint(foreign_key['name'], 'documents', type_='foreignkey')
+
+    for table in TABLES:
+        _rebuild(table, partitioned=True)
+
+    op.execute(PARTITIONED_UNIQUE_FUNCTION)
+    op.execute(documents_parent_delete_function(skip_archiving=False))
+    for table in TABLES:
+        for trigger in partitioned_parent_triggers(table, DOCUMENT_COLUMNS[table]):
+            op.execute(trigger)
+
+
+def downgrade() -> None:
+    """Downgrade schema.
+
+    Only rows in attached partitions are copied back; detached partitions
+    are left as they are.
+    """
+    for table in TABLES:
+        op.execute(f'DROP TRIGGER IF EXISTS {table}_documents_set_null ON {table}')
+        op.execute(f'DROP TRIGGER IF EXISTS {table}_unique_keys ON {table}')
+    op.execute('DROP FUNCTION IF EXISTS documents_parent_delete_trigger()')
+    op.execute('DROP FUNCTION IF EXISTS partitioned_unique_trigger()')
+
+    for table in TABLES:
+        _rebuild(table, partitioned=False)
+        column = DOCUMENT_COLUMNS[table]
+        # References to rows that are gone (e.g. in detached partitions)
+        op.execute(f"""
+            UPDATE documents SET {column} = NULL
+            WHERE {column} IS NOT NULL
+              AND NOT EXISTS (SELECT 1 FROM {table} WHERE {table}.id = documents.{column})
+        """)
+        op.create_foreign_key(f'documents_{column}_fkey', 'documents', table, [column], ['id'], ondelete='SET NULL')
@@ -0,0 +1,58 @@
+"""inbox archive
+
+inbox_archive table for processed inbox items moved out of the inbox by the
+archival job. Documents of archived items keep their inbox_id: the job sets
+inbox.archiving for its transaction and the parent delete trigger leaves
+documents alone while it is on.
+
+Revision ID: b83e5d17a4f2
+Revises: 6d2a8f4c1e97
+Create Date: 2025-10-17 13:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from models.triggers import documents_parent_delete_function
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b83e5d17a4f2'
+down_revision: Union[str, Sequence[str], None] = '6d2a8f4c1e97'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('inbox_archive',
+    sa.Column('id', sa.VARCHAR(length=50), nullable=False),
+    sa.Column('claim_id', sa.VARCHAR(length=50), nullable=True),
+    sa.Column('inbox_status', sa.VARCHAR(length=20), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('data', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_inbox_archive_claim_id'), 'inbox_archive', ['claim_id'], unique=False)
+
+    op.execute(documents_parent_delete_function(skip_archiving=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Move archived items back into the inbox
+    columns = [
+        column['name'] for column in sa.inspect(op.get_bind()).get_columns('inbox') if not column.get('computed')
+    ]
+    op.execute(f"""
+        INSERT INTO inbox ({', '.join(columns)})
+        SELECT {', '.join(f'item.{name}' for name in columns)}
+        FROM inbox_archive, jsonb_populate_record(NULL::inbox, inbox_archive.data) AS item
+    """)
+    op.execute(documents_parent_delete_function(skip_archiving=False))
+    op.drop_index(op.f('ix_inbox_archive_claim_id'), table_name='inbox_archive')
+    op.drop_table('inbox_archive')
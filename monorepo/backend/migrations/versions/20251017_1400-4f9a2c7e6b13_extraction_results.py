@@ -0,0 +1,42 @@
+"""extraction results
+
+extraction_results table caching Gemini document extractions by content
+hash, with an index on last_used_at for least-recently-used eviction.
+
+Revision ID: 4f9a2c7e6b13
+Revises: b83e5d17a4f2
+Create Date: 2025-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f9a2c7e6b13'
+down_revision: Union[str, Sequence[str], None] = 'b83e5d17a4f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('extraction_results',
+    sa.Column('key', sa.VARCHAR(length=64), nullable=False),
+    sa.Column('schema_type', sa.VARCHAR(length=100), nullable=False),
+    sa.Column('model', sa.VARCHAR(length=100), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('last_used_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('result', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+    op.create_index('ix_extraction_results_last_used_at', 'extraction_results', ['last_used_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_extraction_results_last_used_at', table_name='extraction_results')
+    op.drop_table('extraction_results')
@@ -0,0 +1,42 @@
+"""inbox counters without total
+
+Drop the ('total', '') counter row, which every insert and delete on inbox
+upserted; the total is the sum of the status rows, so it is computed on read
+instead. The status, priority and assignee rows are still shared by every
+writer; d7e3a1f5b208 spreads them over slots.
+
+Revision ID: c5d8e2a7f913
+Revises: 4f9a2c7e6b13
+Create Date: 2025-10-17 14:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from models.triggers import inbox_counters_function
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d8e2a7f913'
+down_revision: Union[str, Sequence[str], None] = '4f9a2c7e6b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(inbox_counters_function(with_total=False, slots=None))
+    op.execute("DELETE FROM inbox_counters WHERE dimension = 'total'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Lock out inbox writes so the restored total matches the status rows
+    op.execute("LOCK TABLE inbox IN SHARE MODE")
+    op.execute(inbox_counters_function(with_total=True, slots=None))
+    op.execute("""
+        INSERT INTO inbox_counters (dimension, key, count)
+        SELECT 'total', '', coalesce(sum(count), 0) FROM inbox_counters WHERE dimension = 'status'
+    """)
@@ -0,0 +1,56 @@
+"""inbox counter slots
+
+Spread each inbox counter over INBOX_COUNTER_SLOTS rows. Every insert,
+update and delete on inbox upserts the rows of its status, priority and
+assignee and holds their locks until commit, so with one row per count
+concurrent webhook and bulk inserts queued behind each other. The trigger
+now writes to the slot picked by the transaction id and readers sum the
+slots. Existing counts stay in slot 0.
+
+Revision ID: d7e3a1f5b208
+Revises: c5d8e2a7f913
+Create Date: 2025-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from models.triggers import inbox_counters_function
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7e3a1f5b208'
+down_revision: Union[str, Sequence[str], None] = 'c5d8e2a7f913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Slots per count at this revision (models.inbox_counter.INBOX_COUNTER_SLOTS)
+SLOTS = 16
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('inbox_counters', sa.Column('slot', sa.SmallInteger(), server_default='0', nullable=False))
+    op.drop_constraint('inbox_counters_pkey', 'inbox_counters', type_='primary')
+    op.create_primary_key('inbox_counters_pkey', 'inbox_counters', ['dimension', 'key', 'slot'])
+    op.execute(inbox_counters_function(with_total=False, slots=SLOTS))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Lock out inbox writes while the slots are folded back into one row
+    op.execute("LOCK TABLE inbox IN SHARE MODE")
+    op.execute("""
+        WITH moved AS (
+            DELETE FROM inbox_counters WHERE slot <> 0 RETURNING dimension, key, count
+        )
+        INSERT INTO inbox_counters (dimension, key, slot, count)
+        SELECT dimension, key, 0, sum(count) FROM moved GROUP BY dimension, key
+        ON CONFLICT (dimension, key, slot) DO UPDATE SET count = inbox_counters.count + EXCLUDED.count
+    """)
+    op.drop_constraint('inbox_counters_pkey', 'inbox_counters', type_='primary')
+    op.drop_column('inbox_counters', 'slot')
+    op.create_primary_key('inbox_counters_pkey', 'inbox_counters', ['dimension', 'key'])
+    op.execute(inbox_counters_function(with_total=False, slots=None))
@@ -3,7 +3,12 @@ from .policyholder import Address, PolicyHolder
 from .autoupload_email import AutouploadEmail
 from .claim import Claim, EventType, ClaimStatus, IngestMethod
 from .inbox import Inbox, InboxStatus
+from .inbox_archive import InboxArchive
+from .inbox_counter import InboxCounter, CounterDimension
 from .document import Document
+from .extraction_result import ExtractionResult
+# Registers the triggers create_all adds to the tables it creates
+from . import triggers
 
 __all__ = [
     "TimestampModel",
@@ -16,5 +21,9 @@ __all__ = [
     "IngestMethod",
     "Inbox",
     "InboxStatus",
+    "InboxArchive",
+    "InboxCounter",
+    "CounterDimension",
     "Document",
+    "ExtractionResult",
 ]
\ No newline at end of file
@@ -38,7 +38,7 @@ class AutouploadEmail(SQLModel, table=True):
     )
 
     domain: str = Field(
-        sa_column=Column(VARCHAR(length=255), nullable=False)
+        sa_column=Column(VARCHAR(length=255), nullable=False, index=True)
     )
 
     policy_holder_id: str = Field(
@@ -8,13 +8,18 @@ class TimestampModel(SQLModel):
     def __init__(self):
         super().__init__()
 
-    def set_datetime(self) -> Field:
-        """Creates a Field for timestamps with default and server_default"""
+    def set_datetime(self, primary_key: bool = False) -> Field:
+        """Creates a Field for timestamps with default and server_default
+        
+        primary_key adds the column to the table's primary key, which
+        tables partitioned by that column need.
+        """
         return Field(
             default_factory=lambda: datetime.now(timezone.utc),
             sa_column=Column(
                 DateTime(timezone=True),
                 server_default=text("CURRENT_TIMESTAMP"),
                 nullable=False,
+                primary_key=primary_key,
             ),
         )
\ No newline at end of file
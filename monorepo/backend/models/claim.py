@@ -1,8 +1,8 @@
 from typing import List, Optional, TYPE_CHECKING
 from datetime import date, datetime
 from sqlmodel import Field, SQLModel, Column, Relationship
-from sqlalchemy import VARCHAR, ARRAY, Text, Boolean, Float
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import VARCHAR, ARRAY, Text, Boolean, Float, Integer, Index, Computed
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 import uuid
 import enum
 from .base import TimestampModel
@@ -45,6 +45,12 @@ class IngestMethod(enum.StrEnum):
     PORTAL = "portal"
     MOBILE = "mobile"
 
+# What happened weighs more than where it happened
+CLAIM_SEARCH_VECTOR = (
+    "setweight(to_tsvector('english'::regconfig, coalesce(damage_description, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(event_location, '')), 'B')"
+)
+
 class Claim(SQLModel, table=True):
     """
     Model for insurance claims
@@ -52,6 +58,27 @@ class Claim(SQLModel, table=True):
     Represents a claim filed by a policyholder for an insurance event
     """
     __tablename__ = "claims"
+    __table_args__ = (
+        # Keyset pagination order: created_at DESC, id DESC
+        Index("ix_claims_created_at_id", "created_at", "id"),
+        # Trigram indexes for substring and fuzzy name search (needs pg_trgm)
+        Index("ix_claims_first_name_trgm", "first_name", postgresql_using="gin", postgresql_ops={"first_name": "gin_trgm_ops"}),
+        Index("ix_claims_last_name_trgm", "last_name", postgresql_using="gin", postgresql_ops={"last_name": "gin_trgm_ops"}),
+        Index("ix_claims_search_vector", "search_vector", postgresql_using="gin"),
+        # Containment (@>) and jsonpath (@?) filters on claim_metadata
+        Index("ix_claims_claim_metadata", "claim_metadata", postgresql_using="gin", postgresql_ops={"claim_metadata": "jsonb_path_ops"}),
+        # Status filtered list, ordered by created_at DESC, id DESC
+        Index("ix_claims_status_created_at", "claim_status", "created_at", "id"),
+        # Small range indexes for date windows; rows arrive roughly in time order
+        Index("ix_claims_created_at_brin", "created_at", postgresql_using="brin"),
+        Index("ix_claims_event_date_brin", "event_date", postgresql_using="brin"),
+        # Monthly range partitions, managed by repositories.partitions
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+    # The table key is (id, created_at) as partitioning requires; id alone
+    # identifies a row, and id and claim_id are kept unique across partitions by a trigger
+    # (created by the partitioning migration, or by models.triggers under create_all)
+    __mapper_args__ = {"primary_key": ["id"]}
     
     id: str = Field(
         default_factory=generate_claim_id,
@@ -60,7 +87,7 @@ class Claim(SQLModel, table=True):
     
     # Basic claim information
     claim_id: str = Field(
-        sa_column=Column(VARCHAR(length=50), nullable=False, unique=True, index=True)
+        sa_column=Column(VARCHAR(length=50), nullable=False, index=True)
     )
     first_name: str = Field(index=True)
     last_name: str = Field(index=True)
@@ -108,6 +135,18 @@ class Claim(SQLModel, table=True):
     # Additional metadata
     claim_metadata: Optional[dict] = Field(default=None, sa_column=Column(JSONB))
     
-    # Timestamps
-    created_at: datetime = TimestampModel().set_datetime()
+    # Full-text search document, kept up to date by Postgres on every write
+    search_vector: Optional[str] = Field(
+        default=None,
+        sa_column=Column(TSVECTOR, Computed(CLAIM_SEARCH_VECTOR, persisted=True)),
+    )
+    
+    # Number of linked documents, kept up to date by a trigger on documents
+    document_count: int = Field(
+        default=0,
+        sa_column=Column(Integer, server_default="0", nullable=False, info={"read_only": True}),
+    )
+    
+    # Timestamps; created_at is the partition key
+    created_at: datetime = TimestampModel().set_datetime(primary_key=True)
     updated_at: datetime = TimestampModel().set_datetime()
\ No newline at end of file
@@ -1,7 +1,7 @@
 from typing import Optional
 from datetime import datetime
 from sqlmodel import Field, SQLModel, Column
-from sqlalchemy import VARCHAR, Text, ForeignKey
+from sqlalchemy import VARCHAR, Text
 import uuid
 from .base import TimestampModel
 
@@ -26,12 +26,13 @@ class Document(SQLModel, table=True):
     file_name: str = Field(sa_column=Column(VARCHAR(length=255)))
     file_url: str = Field(sa_column=Column(VARCHAR(length=500)))
  
-    # Foreign keys for relationships
+    # Parent claim or inbox item. Partitioned tables cannot be referenced by
+    # id alone, so these are plain columns; a delete trigger on each parent
+    # clears them as ON DELETE SET NULL did
     claim_id: Optional[str] = Field(
         default=None,
         sa_column=Column(
             VARCHAR(length=50),
-            ForeignKey("claims.id", ondelete="SET NULL"),
             nullable=True,
             index=True
         )
@@ -41,7 +42,6 @@ class Document(SQLModel, table=True):
         default=None,
         sa_column=Column(
             VARCHAR(length=50),
-            ForeignKey("inbox.id", ondelete="SET NULL"),
             nullable=True,
             index=True
         )
@@ -0,0 +1,27 @@
+from datetime import datetime
+from sqlmodel import Field, SQLModel, Column
+from sqlalchemy import VARCHAR, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from .base import TimestampModel
+
+class ExtractionResult(SQLModel, table=True):
+    """
+    Stored result of a Gemini document extraction
+
+    Rows are written by the extraction store (repositories.extraction) and
+    keyed by a hash of the document bytes, the schema and its version, the
+    model and the temperature, so the same document analysed the same way is
+    answered from here instead of calling Gemini again. last_used_at drives
+    least-recently-used eviction, created_at the time to live.
+    """
+    __tablename__ = "extraction_results"
+    __table_args__ = (
+        Index("ix_extraction_results_last_used_at", "last_used_at"),
+    )
+
+    key: str = Field(sa_column=Column(VARCHAR(length=64), nullable=False, primary_key=True))
+    schema_type: str = Field(sa_column=Column(VARCHAR(length=100), nullable=False))
+    model: str = Field(sa_column=Column(VARCHAR(length=100), nullable=False))
+    created_at: datetime = TimestampModel().set_datetime()
+    last_used_at: datetime = TimestampModel().set_datetime()
+    result: dict = Field(sa_column=Column(JSONB, nullable=False))
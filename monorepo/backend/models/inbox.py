@@ -1,8 +1,8 @@
 from typing import List, Optional, TYPE_CHECKING
 from datetime import date, datetime
 from sqlmodel import Field, SQLModel, Column, Relationship
-from sqlalchemy import VARCHAR, ARRAY, Text, Boolean, Float
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import VARCHAR, ARRAY, Text, Boolean, Float, Integer, Index, Computed, text
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 import uuid
 import enum
 from .base import TimestampModel
@@ -25,6 +25,16 @@ class InboxStatus(enum.StrEnum):
     REJECTED = "rejected"
     ARCHIVED = "archived"
 
+# Subject weighs most, then the damage description, then the email body
+INBOX_SEARCH_VECTOR = (
+    "setweight(to_tsvector('english'::regconfig, coalesce(email_subject, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(damage_description, '')), 'B') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(raw_email_content, '')), 'C')"
+)
+
+# Predicate of the partial indexes covering items still waiting for triage
+OPEN_INBOX_STATUSES = "inbox_status IN ('new', 'processing')"
+
 class Inbox(SQLModel, table=True):
     """
     Model for inbox items - represents claims before they are processed
@@ -33,6 +43,30 @@ class Inbox(SQLModel, table=True):
     before being converted to formal claims
     """
     __tablename__ = "inbox"
+    __table_args__ = (
+        # Keyset pagination order: created_at DESC, id DESC
+        Index("ix_inbox_created_at_id", "created_at", "id"),
+        # Trigram indexes for substring and fuzzy name search (needs pg_trgm)
+        Index("ix_inbox_first_name_trgm", "first_name", postgresql_using="gin", postgresql_ops={"first_name": "gin_trgm_ops"}),
+        Index("ix_inbox_last_name_trgm", "last_name", postgresql_using="gin", postgresql_ops={"last_name": "gin_trgm_ops"}),
+        Index("ix_inbox_search_vector", "search_vector", postgresql_using="gin"),
+        # Containment (@>) and jsonpath (@?) filters on claim_metadata
+        Index("ix_inbox_claim_metadata", "claim_metadata", postgresql_using="gin", postgresql_ops={"claim_metadata": "jsonb_path_ops"}),
+        # Triage list shapes, all ordered by created_at DESC, id DESC
+        Index("ix_inbox_status_created_at", "inbox_status", "created_at", "id"),
+        Index("ix_inbox_open_created_at", "created_at", "id", postgresql_where=text(OPEN_INBOX_STATUSES)),
+        Index("ix_inbox_open_priority_created_at", "priority", "created_at", "id", postgresql_where=text(OPEN_INBOX_STATUSES)),
+        Index("ix_inbox_assigned_to_status_created_at", "assigned_to", "inbox_status", "created_at", postgresql_where=text("assigned_to IS NOT NULL")),
+        # Small range indexes for date windows; rows arrive roughly in time order
+        Index("ix_inbox_created_at_brin", "created_at", postgresql_using="brin"),
+        Index("ix_inbox_event_date_brin", "event_date", postgresql_using="brin"),
+        # Monthly range partitions, managed by repositories.partitions
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+    # The table key is (id, created_at) as partitioning requires; id alone
+    # identifies a row, and id and claim_id are kept unique across partitions by a trigger
+    # (created by the partitioning migration, or by models.triggers under create_all)
+    __mapper_args__ = {"primary_key": ["id"]}
     
     id: str = Field(
         default_factory=generate_inbox_id,
@@ -42,7 +76,7 @@ class Inbox(SQLModel, table=True):
     # Basic claim information (same as claims)
     claim_id: Optional[str] = Field(
         default=None,
-        sa_column=Column(VARCHAR(length=50), nullable=True, unique=True, index=True)
+        sa_column=Column(VARCHAR(length=50), nullable=True, index=True)
     )
     first_name: str = Field(index=True)
     last_name: str = Field(index=True)
@@ -105,7 +139,19 @@ class Inbox(SQLModel, table=True):
     email_subject: Optional[str] = Field(default=None, sa_column=Column(VARCHAR(length=255)))
     email_sender: Optional[str] = Field(default=None, sa_column=Column(VARCHAR(length=255)))
     
-    # Timestamps
-    created_at: datetime = TimestampModel().set_datetime()
+    # Full-text search document, kept up to date by Postgres on every write
+    search_vector: Optional[str] = Field(
+        default=None,
+        sa_column=Column(TSVECTOR, Computed(INBOX_SEARCH_VECTOR, persisted=True)),
+    )
+    
+    # Number of linked documents, kept up to date by a trigger on documents
+    document_count: int = Field(
+        default=0,
+        sa_column=Column(Integer, server_default="0", nullable=False, info={"read_only": True}),
+    )
+    
+    # Timestamps; created_at is the partition key
+    created_at: datetime = TimestampModel().set_datetime(primary_key=True)
     updated_at: datetime = TimestampModel().set_datetime()
     processed_at: Optional[datetime] = Field(default=None)
\ No newline at end of file
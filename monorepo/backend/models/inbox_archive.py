@@ -0,0 +1,28 @@
+from typing import Optional
+from datetime import datetime
+from sqlmodel import Field, SQLModel, Column
+from sqlalchemy import VARCHAR, DateTime
+from sqlalchemy.dialects.postgresql import JSONB
+from .base import TimestampModel
+
+class InboxArchive(SQLModel, table=True):
+    """
+    Processed inbox items moved out of the inbox table
+
+    Rows are written by the inbox archival job (repositories.archive). Each
+    keeps the whole item as it was when archived in data, with the columns
+    it is looked up by alongside, so archived items stay readable by id or
+    claim_id while triage queries no longer scan them. Large data values
+    are compressed by Postgres (TOAST).
+    """
+    __tablename__ = "inbox_archive"
+
+    id: str = Field(sa_column=Column(VARCHAR(length=50), nullable=False, primary_key=True))
+    claim_id: Optional[str] = Field(
+        default=None,
+        sa_column=Column(VARCHAR(length=50), nullable=True, index=True)
+    )
+    inbox_status: str = Field(sa_column=Column(VARCHAR(length=20), nullable=False))
+    created_at: datetime = Field(sa_column=Column(DateTime(timezone=True), nullable=False))
+    archived_at: datetime = TimestampModel().set_datetime()
+    data: dict = Field(sa_column=Column(JSONB, nullable=False))
@@ -0,0 +1,31 @@
+from sqlmodel import Field, SQLModel, Column
+from sqlalchemy import VARCHAR, BigInteger, SmallInteger
+import enum
+
+# Rows each count is spread over; see models.triggers.inbox_counters_function
+INBOX_COUNTER_SLOTS = 16
+
+class CounterDimension(enum.StrEnum):
+    """Breakdowns kept in the inbox_counters table"""
+    STATUS = "status"
+    PRIORITY = "priority"
+    ASSIGNEE = "assignee"
+
+class InboxCounter(SQLModel, table=True):
+    """
+    Running count of inbox items per status, priority and assignee
+
+    Rows are maintained by a trigger on the inbox table (see the
+    inbox_counters migration and models.triggers), in the same transaction
+    as the write, so the dashboard reads a handful of rows instead of
+    counting the inbox. A NULL value (e.g. no assignee) is stored under the
+    empty key. Each count is the sum of up to INBOX_COUNTER_SLOTS rows, one
+    per slot, so concurrent writers do not all queue on the same row. There
+    is no total row; the total is the sum of the status rows.
+    """
+    __tablename__ = "inbox_counters"
+
+    dimension: str = Field(sa_column=Column(VARCHAR(length=20), primary_key=True))
+    key: str = Field(sa_column=Column(VARCHAR(length=100), primary_key=True))
+    slot: int = Field(default=0, sa_column=Column(SmallInteger, primary_key=True, server_default="0"))
+    count: int = Field(default=0, sa_column=Column(BigInteger, nullable=False, server_default="0"))
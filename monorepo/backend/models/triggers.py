@@ -0,0 +1,197 @@
+"""
+Database triggers the models rely on
+
+This module holds the one definition of each trigger. Migrations build
+their DDL from it, passing the options their revision had, and tables that
+SQLModel.metadata.create_all creates (see main.py) get the current version
+from the after_create events registered here, so both kinds of database
+behave alike.
+"""
+from typing import Optional, Tuple
+
+from sqlalchemy import DDL, Table, event
+
+from .claim import Claim
+from .inbox import Inbox
+from .inbox_counter import INBOX_COUNTER_SLOTS
+
+def create_with(table: Table, *statements: str) -> None:
+    """Run statements, in order, right after create_all creates table"""
+    for statement in statements:
+        # DDL formats the statement with %, which PL/pgSQL format() also uses
+        event.listen(table, "after_create", DDL(statement.replace("%", "%%")))
+
+def inbox_counters_function(with_total: bool = False, slots: Optional[int] = INBOX_COUNTER_SLOTS) -> str:
+    """
+    Function maintaining inbox_counters for GET /inbox/stats
+
+    Old and new values are netted into one upsert that locks counter rows in
+    (dimension, key) order. With slots, each count is spread over that many
+    rows and a transaction writes to the slot picked by its transaction id,
+    so concurrent writers mostly update different rows instead of queueing
+    on one lock per status, priority and assignee; readers sum the slots.
+    Transactions sharing a slot still lock its rows in the same order.
+
+    Args:
+        with_total: Also count a ('total', '') row (migrations before c5d8e2a7f913)
+        slots: Rows per count; None for the table without a slot column
+            (migrations before d7e3a1f5b208)
+
+    Returns:
+        CREATE OR REPLACE FUNCTION statement for inbox_counters_trigger()
+    """
+    total_delta = """
+        IF TG_OP = 'INSERT' THEN
+            total_delta := 1;
+        ELSIF TG_OP = 'DELETE' THEN
+            total_delta := -1;
+        END IF;
+""" if with_total else ""
+    total_row = "('total', '', total_delta),\n            " if with_total else ""
+    if slots is None:
+        columns, slot, conflict = "dimension, key, count", "", "dimension, key"
+    else:
+        columns, slot, conflict = "dimension, key, slot, count", f"(txid_current() % {slots})::smallint, ", "dimension, key, slot"
+    return f"""
+    CREATE OR REPLACE FUNCTION inbox_counters_trigger() RETURNS trigger AS $$
+    DECLARE
+        old_status text;
+        old_priority text;
+        old_assignee text;
+        new_status text;
+        new_priority text;
+        new_assignee text;
+        total_delta bigint := 0;
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN
+            old_status := coalesce(OLD.inbox_status, '');
+            old_priority := coalesce(OLD.priority, '');
+            old_assignee := coalesce(OLD.assigned_to, '');
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            new_status := coalesce(NEW.inbox_status, '');
+            new_priority := coalesce(NEW.priority, '');
+            new_assignee := coalesce(NEW.assigned_to, '');
+        END IF;{total_delta}
+        INSERT INTO inbox_counters ({columns})
+        SELECT dimension, key, {slot}sum(delta)
+        FROM (VALUES
+            {total_row}('status', old_status, -1),
+            ('priority', old_priority, -1),
+            ('assignee', old_assignee, -1),
+            ('status', new_status, 1),
+            ('priority', new_priority, 1),
+            ('assignee', new_assignee, 1)
+        ) AS changes (dimension, key, delta)
+        WHERE key IS NOT NULL
+        GROUP BY dimension, key
+        HAVING sum(delta) <> 0
+        ORDER BY dimension, key
+        ON CONFLICT ({conflict}) DO UPDATE SET count = inbox_counters.count + EXCLUDED.count;
+
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+INBOX_COUNTERS_TRIGGERS = (
+    """
+    CREATE TRIGGER inbox_counters_insert_delete
+    AFTER INSERT OR DELETE ON inbox
+    FOR EACH ROW EXECUTE FUNCTION inbox_counters_trigger()
+    """,
+    """
+    CREATE TRIGGER inbox_counters_update
+    AFTER UPDATE OF inbox_status, priority, assigned_to ON inbox
+    FOR EACH ROW
+    WHEN (
+        OLD.inbox_status IS DISTINCT FROM NEW.inbox_status
+        OR OLD.priority IS DISTINCT FROM NEW.priority
+        OR OLD.assigned_to IS DISTINCT FROM NEW.assigned_to
+    )
+    EXECUTE FUNCTION inbox_counters_trigger()
+    """,
+)
+
+create_with(Inbox.__table__, inbox_counters_function(), *INBOX_COUNTERS_TRIGGERS)
+
+# Partitioned inbox and claims (migration 6d2a8f4c1e97): id and claim_id are
+# kept unique across partitions by a BEFORE trigger, and deleting a parent
+# clears the documents' reference to it, as the foreign keys used to.
+# Writers of the same value take the same transaction lock, so a second
+# insert waits for the first to commit and then sees its row.
+PARTITIONED_UNIQUE_FUNCTION = """
+    CREATE OR REPLACE FUNCTION partitioned_unique_trigger() RETURNS trigger AS $$
+    DECLARE
+        column_name text;
+        value text;
+        taken boolean;
+    BEGIN
+        FOR i IN 1 .. TG_NARGS - 1 LOOP
+            column_name := TG_ARGV[i];
+            value := to_jsonb(NEW) ->> column_name;
+            CONTINUE WHEN value IS NULL;
+            CONTINUE WHEN TG_OP = 'UPDATE' AND value IS NOT DISTINCT FROM (to_jsonb(OLD) ->> column_name);
+
+            PERFORM pg_advisory_xact_lock(hashtextextended(TG_ARGV[0] || '.' || column_name || '=' || value, 0));
+            EXECUTE format('SELECT EXISTS (SELECT 1 FROM %I WHERE %I = $1)', TG_ARGV[0], column_name)
+                INTO taken USING value;
+            IF taken THEN
+                RAISE EXCEPTION 'duplicate key value violates unique constraint on %.%', TG_ARGV[0], column_name
+                    USING ERRCODE = 'unique_violation',
+                          DETAIL = format('Key (%s)=(%s) already exists.', column_name, value);
+            END IF;
+        END LOOP;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+def documents_parent_delete_function(skip_archiving: bool = True) -> str:
+    """
+    Function clearing the documents column named by its argument for a deleted parent
+
+    Args:
+        skip_archiving: Leave documents alone while the archival job moves
+            items (migrations from b83e5d17a4f2 on), so they keep pointing
+            at archived items
+
+    Returns:
+        CREATE OR REPLACE FUNCTION statement for documents_parent_delete_trigger()
+    """
+    skip = """
+        IF current_setting('inbox.archiving', true) = 'on' THEN
+            RETURN NULL;
+        END IF;""" if skip_archiving else ""
+    return f"""
+    CREATE OR REPLACE FUNCTION documents_parent_delete_trigger() RETURNS trigger AS $$
+    BEGIN{skip}
+        EXECUTE format('UPDATE documents SET %I = NULL WHERE %I = $1', TG_ARGV[0], TG_ARGV[0]) USING OLD.id;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+def partitioned_parent_triggers(table: str, document_column: str) -> Tuple[str, str]:
+    """Uniqueness and document clean-up triggers of a partitioned parent table"""
+    return (
+        f"""
+        CREATE TRIGGER {table}_unique_keys
+        BEFORE INSERT OR UPDATE OF id, claim_id ON {table}
+        FOR EACH ROW EXECUTE FUNCTION partitioned_unique_trigger('{table}', 'id', 'claim_id')
+        """,
+        f"""
+        CREATE TRIGGER {table}_documents_set_null
+        AFTER DELETE ON {table}
+        FOR EACH ROW EXECUTE FUNCTION documents_parent_delete_trigger('{document_column}')
+        """,
+    )
+
+# Functions are replaced idempotently, so whichever table is created first defines them
+for table, document_column in ((Inbox.__table__, "inbox_id"), (Claim.__table__, "claim_id")):
+    create_with(
+        table,
+        PARTITIONED_UNIQUE_FUNCTION,
+        documents_parent_delete_function(),
+        *partitioned_parent_triggers(table.name, document_column),
+    )
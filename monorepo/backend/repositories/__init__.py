@@ -2,12 +2,18 @@ from .policyholder import PolicyHolderRepository
 from .autoupload_email import AutouploadEmailRepository
 from .claim import ClaimRepository
 from .inbox import InboxRepository
+from .archive import InboxArchiveRepository
 from .document import DocumentRepository
+from .extraction import ExtractionResultRepository
+from .unit_of_work import UnitOfWork
 
 __all__ = [
     "PolicyHolderRepository",
     "AutouploadEmailRepository",
     "ClaimRepository",
     "InboxRepository",
+    "InboxArchiveRepository",
     "DocumentRepository",
+    "ExtractionResultRepository",
+    "UnitOfWork",
 ]
\ No newline at end of file
@@ -0,0 +1,190 @@
+from typing import Callable, List, Optional
+from datetime import datetime, timedelta, timezone
+import asyncio
+import logging
+import os
+
+from fastapi import Depends
+from sqlalchemy import delete, func, insert, or_, select, text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from database import get_async_session
+from models import Inbox, InboxArchive, InboxStatus
+from .base import BaseRepository, read_only, read_write
+from .inbox import identifier_cache
+
+logger = logging.getLogger(__name__)
+
+# Statuses of items that are done with triage
+ARCHIVABLE_STATUSES = (InboxStatus.CONVERTED, InboxStatus.REJECTED, InboxStatus.ARCHIVED)
+
+# Days since an item was last updated before it is archived
+INBOX_ARCHIVE_AFTER_DAYS = float(os.getenv("INBOX_ARCHIVE_AFTER_DAYS", "90"))
+# Items moved per transaction
+INBOX_ARCHIVE_BATCH_SIZE = int(os.getenv("INBOX_ARCHIVE_BATCH_SIZE", "500"))
+# Seconds between archival runs in each worker; 0 disables the job
+INBOX_ARCHIVE_INTERVAL = float(os.getenv("INBOX_ARCHIVE_INTERVAL", "600"))
+
+class InboxArchiveRepository(BaseRepository[InboxArchive]):
+    """Repository for archived inbox items"""
+
+    def __init__(self, session: AsyncSession = Depends(get_async_session)):
+        super().__init__(session, InboxArchive)
+
+    @read_write
+    async def archive_processed(
+        self,
+        older_than: datetime,
+        limit: int = INBOX_ARCHIVE_BATCH_SIZE,
+    ) -> List[str]:
+        """
+        Move one batch of processed inbox items into the archive
+
+        A single statement picks the batch with FOR UPDATE SKIP LOCKED,
+        deletes it from the inbox and inserts it into inbox_archive, so
+        concurrent runs take disjoint batches and never wait on each other
+        or on rows being edited.
+
+        Args:
+            older_than: Archive items last updated before this time
+            limit: Maximum number of items to move
+
+        Returns:
+            IDs of the archived items
+        """
+        batch = (
+            select(Inbox.id, Inbox.created_at)
+            .where(
+                Inbox.inbox_status.in_(ARCHIVABLE_STATUSES),
+                Inbox.updated_at < older_than,
+                # Implied by updated_at, but on the partition key, so only
+                # the months before the cutoff are scanned
+                Inbox.created_at < older_than,
+            )
+            .order_by(Inbox.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .cte("batch")
+        )
+        # Generated columns are rebuilt by the inbox, not archived
+        columns = [column for column in Inbox.__table__.columns if column.computed is None]
+        moved = (
+            delete(Inbox)
+            .where(Inbox.id == batch.c.id, Inbox.created_at == batch.c.created_at)
+            .returning(*columns)
+            .cte("moved")
+        )
+        statement = (
+            insert(InboxArchive)
+            .from_select(
+                ["id", "claim_id", "inbox_status", "created_at", "data"],
+                select(
+                    moved.c.id,
+                    moved.c.claim_id,
+                    moved.c.inbox_status,
+                    moved.c.created_at,
+                    func.to_jsonb(moved.table_valued()),
+                ),
+            )
+            .returning(InboxArchive.id, InboxArchive.claim_id)
+        )
+
+        try:
+            # Documents keep pointing at archived items (see the inbox_archive migration)
+            await self.session.execute(text("SELECT set_config('inbox.archiving', 'on', true)"))
+            result = await self.session.execute(statement)
+            rows = result.all()
+            await self._save()
+        except Exception:
+            await self._rollback()
+            raise
+
+        # Items are cached under their id and their claim_id
+        for inbox_id, claim_id in rows:
+            identifier_cache.invalidate(inbox_id)
+            if claim_id:
+                identifier_cache.invalidate(claim_id)
+        return [inbox_id for inbox_id, _ in rows]
+
+    @read_only
+    async def get_by_identifier(self, inbox_id: str) -> Optional[Inbox]:
+        """
+        Get an archived inbox item by either its id or its claim_id
+
+        Args:
+            inbox_id: The inbox item ID (could be id or claim_id)
+
+        Returns:
+            The item as it was when archived, not attached to the session,
+            or None if it was never archived
+        """
+        statement = select(InboxArchive.data).where(
+            or_(InboxArchive.id == inbox_id, InboxArchive.claim_id == inbox_id)
+        )
+        result = await self.session.execute(statement)
+        data = result.scalars().first()
+        return Inbox.model_validate(data) if data is not None else None
+
+class InboxArchiver:
+    """
+    Archives processed inbox items in batches, every interval seconds
+
+    Every worker runs one. Batches are claimed with SKIP LOCKED, so workers
+    share the backlog instead of contending for it; each batch commits on
+    its own, so an interrupted run loses nothing.
+    """
+
+    def __init__(
+        self,
+        interval: float = INBOX_ARCHIVE_INTERVAL,
+        after_days: float = INBOX_ARCHIVE_AFTER_DAYS,
+        batch_size: int = INBOX_ARCHIVE_BATCH_SIZE,
+    ):
+        self.interval = interval
+        self.after_days = after_days
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, session_factory: Callable[[], AsyncSession]) -> None:
+        if self._task is not None or self.interval <= 0:
+            return
+        self._task = asyncio.create_task(self._run(session_factory))
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def archive(self, session_factory: Callable[[], AsyncSession]) -> int:
+        """
+        Archive batches until none is left
+
+        Returns:
+            Number of items archived
+        """
+        older_than = datetime.now(timezone.utc) - timedelta(days=self.after_days)
+        total = 0
+        while True:
+            async with session_factory() as session:
+                archived = await InboxArchiveRepository(session).archive_processed(older_than, self.batch_size)
+            total += len(archived)
+            if len(archived) < self.batch_size:
+                break
+        if total:
+            logger.info(f"Archived {total} inbox items last updated before {older_than.isoformat()}")
+        return total
+
+    async def _run(self, session_factory: Callable[[], AsyncSession]) -> None:
+        while True:
+            try:
+                await self.archive(session_factory)
+            except Exception as e:
+                logger.error(f"Inbox archival failed: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+inbox_archiver = InboxArchiver()
@@ -1,12 +1,35 @@
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
+import os
 import re
-from sqlmodel import select, and_
+from sqlmodel import select, and_, func
+from sqlalchemy.orm import lazyload
 from sqlmodel.ext.asyncio.session import AsyncSession
 from fastapi import Depends
 
 from database import get_async_session
 from models import AutouploadEmail, PolicyHolder
 from .base import BaseRepository
+from .cache import TTLCache
+from .invalidation import invalidation_bus
+
+# Routing index: domain -> {"alias-policyholderid" local part: records}.
+# Loaded one domain at a time and dropped in every worker when a record
+# changes; the TTL only bounds staleness if an invalidation is missed.
+ALIAS_INDEX_TOPIC = "autoupload_emails"
+ALIAS_INDEX_TTL = float(os.getenv("ALIAS_INDEX_TTL", "300"))
+alias_index = TTLCache(maxsize=1024, ttl=ALIAS_INDEX_TTL)
+
+def routing_local_part(alias: str, policy_holder_id: str) -> str:
+    """The local part an alias routes from, alias-policyholderid"""
+    return f"{alias}-{policy_holder_id.lower()}"
+
+def _invalidate_alias_index(domain: Optional[str]) -> None:
+    if domain is None:
+        alias_index.clear()
+    else:
+        alias_index.invalidate(domain)
+
+invalidation_bus.subscribe(ALIAS_INDEX_TOPIC, _invalidate_alias_index)
 
 class AutouploadEmailRepository(BaseRepository[AutouploadEmail]):
     """Repository for managing AutouploadEmail entities"""
@@ -49,36 +72,51 @@ class AutouploadEmailRepository(BaseRepository[AutouploadEmail]):
         Returns:
             List of matching AutouploadEmail records
         """
-        email_records = []
-
         # Validate email format
         if "@" not in email:
-            return email_records
+            return []
             
         local_part, domain = email.split("@", 1)
         
-        # First, get all records matching the domain
-        stmt = select(AutouploadEmail).where(AutouploadEmail.domain == domain)
-        results = await self.session.exec(stmt)
-        domain_matches = results.all()
+        # Without the listener, changes made by other workers would go unseen
+        if not invalidation_bus.listening:
+            return await self._get_by_email_sql(local_part, domain)
         
-        # Then filter records where the local part starts with the alias
-        for email_record in domain_matches:
-            if local_part.startswith(email_record.alias):
-                # Load the related policy holder
-                policy_holder_stmt = select(PolicyHolder).where(
-                    PolicyHolder.id == email_record.policy_holder_id
-                )
-                policy_holder_result = await self.session.exec(policy_holder_stmt)
-                policy_holder = policy_holder_result.one_or_none()
-                
-                if policy_holder:
-                    # Check if the format matches alias-policyholderId@domain
-                    expected_local_part = f"{email_record.alias}-{policy_holder.id.lower()}"
-                    if local_part.lower() == expected_local_part:
-                        email_records.append(email_record)
+        routes = alias_index.get(domain)
+        if routes is None:
+            routes = await self._load_routes(domain)
+            alias_index.set(domain, routes)
+        return list(routes.get(local_part.lower(), []))
+    
+    async def _load_routes(self, domain: str) -> Dict[str, List[AutouploadEmail]]:
+        """Build the routing table for one domain from a single indexed query"""
+        statement = (
+            select(AutouploadEmail)
+            .where(AutouploadEmail.domain == domain)
+            .options(lazyload(AutouploadEmail.policy_holder))
+        )
+        results = await self.session.exec(statement)
         
-        return email_records
+        routes: Dict[str, List[AutouploadEmail]] = {}
+        for email_record in results.all():
+            # Detached copies, so cached records outlive the session
+            record = AutouploadEmail.model_validate(email_record.model_dump())
+            key = routing_local_part(record.alias, record.policy_holder_id)
+            routes.setdefault(key, []).append(record)
+        return routes
+    
+    async def _get_by_email_sql(self, local_part: str, domain: str) -> List[AutouploadEmail]:
+        """Match alias-policyholderid@domain with one join, using the domain index"""
+        statement = (
+            select(AutouploadEmail)
+            .join(PolicyHolder, PolicyHolder.id == AutouploadEmail.policy_holder_id)
+            .where(
+                AutouploadEmail.domain == domain,
+                AutouploadEmail.alias + "-" + func.lower(PolicyHolder.id) == local_part.lower(),
+            )
+        )
+        results = await self.session.exec(statement)
+        return results.all()
     
     async def upsert(self, email_record: AutouploadEmail) -> AutouploadEmail:
         """
@@ -92,29 +130,16 @@ class AutouploadEmailRepository(BaseRepository[AutouploadEmail]):
         Returns:
             The upserted AutouploadEmail record
         """
-        # Check if a record with the same policy_holder_id and alias already exists
-        statement = select(AutouploadEmail).where(
-            AutouploadEmail.policy_holder_id == email_record.policy_holder_id,
-            AutouploadEmail.alias == email_record.alias,
+        # The domain may change, so drop every domain's routes
+        await invalidation_bus.publish(self.session, ALIAS_INDEX_TOPIC)
+        
+        # Insert, or update the existing (alias, policy_holder_id) record, in one statement
+        upserted = await self.bulk_upsert(
+            [email_record],
+            index_elements=["alias", "policy_holder_id"],
+            update_columns=["domain", "updated_at"],
         )
-        result = await self.session.exec(statement)
-        existing_record = result.one_or_none()
-
-        # If it exists, update fields
-        if existing_record:
-            existing_record.domain = email_record.domain
-            existing_record.is_user_generated = email_record.is_user_generated
-
-            self.session.add(existing_record)
-            await self.session.commit()
-            await self.session.refresh(existing_record)
-            return existing_record
-
-        # Otherwise, create a new record
-        self.session.add(email_record)
-        await self.session.commit()
-        await self.session.refresh(email_record)
-        return email_record
+        return upserted[0]
     
     async def delete(
         self, policy_holder_id: str, alias: str
@@ -129,22 +154,11 @@ class AutouploadEmailRepository(BaseRepository[AutouploadEmail]):
         Returns:
             The deleted AutouploadEmail if found, otherwise None
         """
-        statement = select(AutouploadEmail).where(
-            and_(
-                AutouploadEmail.policy_holder_id == policy_holder_id,
-                AutouploadEmail.alias == alias,
-            )
+        # Sent with the delete, so other workers hear of it once it commits
+        await invalidation_bus.publish(self.session, ALIAS_INDEX_TOPIC)
+        
+        deleted = await self.delete_where(
+            AutouploadEmail.policy_holder_id == policy_holder_id,
+            AutouploadEmail.alias == alias,
         )
-        result = await self.session.exec(statement)
-        existing_record = result.one_or_none()
-
-        if not existing_record:
-            return None
-
-        # Save existing record to return
-        existing_record_copy = AutouploadEmail.model_validate(existing_record.model_dump())
-
-        await self.session.delete(existing_record)
-        await self.session.commit()
-
-        return existing_record_copy
\ No newline at end of file
+        return deleted[0] if deleted else None
@@ -1,19 +1,122 @@
-from typing import Generic, TypeVar, Type, List, Optional, Dict, Any, Union
+from typing import Generic, TypeVar, Type, List, Optional, Dict, Any, Union, Iterator, Sequence, Tuple
+import functools
+import json
+import logging
+import os
+from sqlalchemy import insert, delete, func, literal
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
 from sqlmodel import SQLModel, select, update
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from database import ROUTE_KEY
+from .cache import TTLCache
+from .pagination import TotalMode
+from .search import text_headline
+from .unit_of_work import UNIT_OF_WORK_KEY
+
+logger = logging.getLogger(__name__)
+
 T = TypeVar('T', bound=SQLModel)
 
+# Rows written per statement by the bulk methods. Postgres caps a statement
+# at 65535 bind parameters, so wide tables need smaller chunks.
+DEFAULT_BULK_CHUNK_SIZE = 500
+
+# Counts served by TotalMode.CACHED, keyed by the rendered COUNT statement
+COUNT_CACHE_TTL = float(os.getenv("COUNT_CACHE_TTL", "30"))
+count_cache = TTLCache(maxsize=1024, ttl=COUNT_CACHE_TTL)
+
+def _literal_sql(statement: Any) -> str:
+    """Render a statement as PostgreSQL SQL with its parameters inlined"""
+    return str(statement.compile(
+        dialect=postgresql.dialect(),
+        compile_kwargs={"literal_binds": True},
+    ))
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) of a statement, keeping its bound parameters"""
+    # A read, so replica routing does not pin the session to the primary
+    is_select = True
+    inherit_cache = False
+
+    def __init__(self, statement: Any):
+        self.statement = statement
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler: Any, **kw: Any) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+def _chunks(items: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    if size < 1:
+        raise ValueError(f"chunk_size must be positive, got {size}")
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def _route(target: str):
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            info = self.session.info
+            # The outermost repository call decides, so reads made from
+            # inside a write method stay on the primary
+            if ROUTE_KEY in info:
+                return await func(self, *args, **kwargs)
+            info[ROUTE_KEY] = target
+            try:
+                return await func(self, *args, **kwargs)
+            finally:
+                info.pop(ROUTE_KEY, None)
+        return wrapper
+    return decorator
+
+# Send the queries of a repository method to the read replica, if configured
+read_only = _route("replica")
+
+# Keep a repository method, and any reads it makes, on the primary
+read_write = _route("primary")
+
 class BaseRepository(Generic[T]):
+    # Text columns covered by the model's search_vector, used for highlights
+    text_search_fields: Tuple[str, ...] = ()
+
     def __init__(self, session: AsyncSession, model: Type[T]):
         self.session = session
         self.model = model
 
+    @property
+    def in_unit_of_work(self) -> bool:
+        return bool(self.session.info.get(UNIT_OF_WORK_KEY))
+
+    async def _save(self, *objs: SQLModel) -> None:
+        """
+        Persist pending changes
+
+        Commits and refreshes the given objects, or only flushes when running
+        inside a UnitOfWork, which commits once for all repositories.
+        """
+        if self.in_unit_of_work:
+            await self.session.flush()
+            return
+
+        await self.session.commit()
+        for obj in objs:
+            await self.session.refresh(obj)
+
+    async def _rollback(self) -> None:
+        """Roll back, unless a UnitOfWork owns the transaction"""
+        if not self.in_unit_of_work:
+            await self.session.rollback()
+
+    @read_only
     async def get_all(self, skip: int = 0, limit: int = 100) -> List[T]:
         statement = select(self.model).offset(skip).limit(limit)
         result = await self.session.exec(statement)
         return result.all()
 
+    @read_only
     async def get_by_id(self, id: Any) -> Optional[T]:
         statement = select(self.model).where(self.model.id == id)
         result = await self.session.exec(statement)
@@ -24,6 +127,7 @@ class BaseRepository(Generic[T]):
         result = await self.session.exec(statement)
         return result.first()
 
+    @read_only
     async def get_by_fields(self, filters: Dict[str, Any]) -> List[T]:
         statement = select(self.model)
         for field, value in filters.items():
@@ -31,43 +135,320 @@ class BaseRepository(Generic[T]):
         result = await self.session.exec(statement)
         return result.all()
 
-    async def create(self, data: Union[Dict[str, Any], SQLModel]) -> T:
-        if isinstance(data, dict):
-            db_obj = self.model(**data)
-        else:
-            db_obj = self.model(**data.model_dump())
+    async def count_where(
+        self,
+        *criteria: Any,
+        mode: TotalMode = TotalMode.EXACT,
+    ) -> Optional[int]:
+        """
+        Count the rows matching criteria
 
-        print(db_obj)
-            
-        self.session.add(db_obj)
-        await self.session.commit()
-        await self.session.refresh(db_obj)
-        return db_obj
+        Args:
+            criteria: Filter conditions
+            mode: exact COUNT, planner estimate, briefly cached exact count,
+                or none to skip counting
+
+        Returns:
+            The (possibly estimated) row count, or None in "none" mode
+        """
+        if mode == TotalMode.NONE:
+            return None
+
+        statement = select(func.count()).select_from(self.model).where(*criteria)
+
+        if mode == TotalMode.ESTIMATE:
+            try:
+                return await self._estimate_rows(select(self.model.id).where(*criteria))
+            except Exception as e:
+                logger.warning(f"Row estimate failed, falling back to exact count: {str(e)}")
+
+        if mode == TotalMode.CACHED:
+            key = _literal_sql(statement)
+            total = count_cache.get(key)
+            if total is None:
+                total = (await self.session.exec(statement)).one()
+                count_cache.set(key, total)
+            return total
+
+        result = await self.session.exec(statement)
+        return result.one()
+
+    async def _estimate_rows(self, statement: Any) -> int:
+        """Row estimate for statement from the planner, without running it"""
+        # Values stay bound parameters, never re-parsed as SQL text
+        result = await self.session.execute(Explain(statement))
+        plan = result.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    @read_only
+    async def get_highlights(self, ids: Sequence[Any], q: str) -> Dict[Any, Dict[str, str]]:
+        """
+        Build highlighted snippets for rows matched by a full-text query
+
+        Runs on the page of results only, as ts_headline re-parses the text.
 
+        Args:
+            ids: Ids of the rows to highlight
+            q: The full-text query the rows matched
+
+        Returns:
+            Mapping of id to {field: snippet} for fields containing a match
+        """
+        if not ids or not self.text_search_fields:
+            return {}
+
+        columns = [
+            text_headline(getattr(self.model, field), q).label(field)
+            for field in self.text_search_fields
+        ]
+        statement = select(self.model.id, *columns).where(self.model.id.in_(ids))
+        result = await self.session.execute(statement)
+
+        highlights: Dict[Any, Dict[str, str]] = {}
+        for row in result.mappings():
+            snippets = {
+                field: row[field] for field in self.text_search_fields
+                if row[field] and "<mark>" in row[field]
+            }
+            if snippets:
+                highlights[row["id"]] = snippets
+        return highlights
+
+    def _column_values(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Keep only the keys that map to writable table columns
+
+        Generated columns and columns marked info={"read_only": True}, which
+        the database maintains itself, are never written.
+        """
+        columns = self.model.__table__.columns
+        return {
+            key: value for key, value in data.items()
+            if key in columns
+            and columns[key].computed is None
+            and not columns[key].info.get("read_only")
+        }
+
+    def _jsonb_merge(self, column: Any, value: Dict[str, Any]) -> Any:
+        """SQL expression merging value into a JSONB column (top-level keys win)"""
+        return func.coalesce(column, func.jsonb_build_object()).op(
+            "||", return_type=JSONB
+        )(literal(value, JSONB))
+
+    async def create(self, data: Union[Dict[str, Any], SQLModel]) -> T:
+        # INSERT ... RETURNING gives back the stored row, no refresh needed
+        statement = (
+            insert(self.model)
+            .values(**self._insert_values(data))
+            .returning(self.model)
+        )
+        result = await self.session.execute(statement)
+        created = result.scalars().one()
+        await self._save()
+        return created
+
+    @read_write
     async def update(self, id: Any, data: Union[Dict[str, Any], SQLModel]) -> Optional[T]:
+        return await self.update_where([self.model.id == id], data)
+
+    async def update_where(
+        self, criteria: List[Any], data: Union[Dict[str, Any], SQLModel]
+    ) -> Optional[T]:
+        """
+        Update the row matching criteria with a single UPDATE ... RETURNING
+
+        Values may be plain Python values or SQL expressions over the row's
+        current columns. Returns the updated row, or None if nothing matched.
+        """
         if isinstance(data, SQLModel):
             update_data = data.model_dump(exclude_unset=True)
         else:
             update_data = data
 
-        db_obj = await self.get_by_id(id)
-        if not db_obj:
-            return None
+        values = self._column_values(update_data)
+        if not values:
+            result = await self.session.exec(select(self.model).where(*criteria))
+            return result.first()
 
-        for key, value in update_data.items():
-            if hasattr(db_obj, key):
-                setattr(db_obj, key, value)
-
-        self.session.add(db_obj)
-        await self.session.commit()
-        await self.session.refresh(db_obj)
+        statement = (
+            update(self.model)
+            .where(*criteria)
+            .values(**values)
+            .returning(self.model)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(
+            statement, execution_options={"populate_existing": True}
+        )
+        db_obj = result.scalars().first()
+        await self._save()
         return db_obj
 
+    async def update_all_where(self, criteria: List[Any], data: Dict[str, Any]) -> List[T]:
+        """
+        Update every row matching criteria with a single UPDATE ... RETURNING
+
+        Values may be SQL expressions over each row's current columns, e.g. a
+        CASE that sets a different value per row. Returns the updated rows.
+        """
+        statement = (
+            update(self.model)
+            .where(*criteria)
+            .values(**self._column_values(data))
+            .returning(self.model)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(
+            statement, execution_options={"populate_existing": True}
+        )
+        updated = result.scalars().all()
+        await self._save()
+        return updated
+
+    @read_write
     async def delete(self, id: Any) -> bool:
-        db_obj = await self.get_by_id(id)
-        if not db_obj:
-            return False
+        deleted = await self.delete_where(self.model.id == id)
+        return len(deleted) > 0
 
-        await self.session.delete(db_obj)
-        await self.session.commit()
-        return True
\ No newline at end of file
+    async def delete_where(self, *criteria: Any) -> List[T]:
+        """Delete matching rows with a single DELETE ... RETURNING and return them"""
+        statement = delete(self.model).where(*criteria).returning(self.model)
+        result = await self.session.execute(statement)
+        deleted = result.scalars().all()
+        await self._save()
+        self._after_delete(deleted)
+        return deleted
+
+    def _after_delete(self, deleted: List[T]) -> None:
+        """Hook for subclasses that keep per-row state, called with deleted rows"""
+
+    def _insert_values(self, data: Union[Dict[str, Any], SQLModel]) -> Dict[str, Any]:
+        """Build the column values for inserting data, applying model defaults"""
+        if isinstance(data, dict):
+            db_obj = self.model(**data)
+        else:
+            db_obj = self.model(**data.model_dump())
+        return self._column_values(db_obj.model_dump())
+
+    async def bulk_create(
+        self,
+        items: Sequence[Union[Dict[str, Any], SQLModel]],
+        chunk_size: int = DEFAULT_BULK_CHUNK_SIZE,
+    ) -> List[T]:
+        """
+        Insert many rows, executemany style, with RETURNING per chunk
+
+        SQLAlchemy batches each chunk into multi-row INSERTs and, with
+        sort_by_parameter_order, matches the returned rows back to their
+        parameters, since Postgres does not guarantee the order of RETURNING.
+        Returns the created rows in the order they were given.
+        """
+        rows = [self._insert_values(item) for item in items]
+        created: List[T] = []
+        statement = insert(self.model).returning(self.model, sort_by_parameter_order=True)
+        for chunk in _chunks(rows, chunk_size):
+            result = await self.session.execute(statement, list(chunk))
+            created.extend(result.scalars().all())
+        if rows:
+            await self._save()
+        return created
+
+    async def bulk_update(
+        self,
+        items: Sequence[Dict[str, Any]],
+        chunk_size: int = DEFAULT_BULK_CHUNK_SIZE,
+    ) -> int:
+        """
+        Update many rows by primary key, executemany style, one batch per chunk
+
+        Every item must contain the primary key plus the columns to set, and
+        all items should set the same columns so they share one statement.
+        Returns the number of rows submitted.
+        """
+        rows = [self._column_values(item) for item in items]
+        for chunk in _chunks(rows, chunk_size):
+            await self.session.execute(
+                update(self.model).execution_options(synchronize_session=False),
+                list(chunk),
+            )
+        if rows:
+            await self._save()
+        return len(rows)
+
+    async def bulk_upsert(
+        self,
+        items: Sequence[Union[Dict[str, Any], SQLModel]],
+        index_elements: Optional[List[str]] = None,
+        update_columns: Optional[List[str]] = None,
+        chunk_size: int = DEFAULT_BULK_CHUNK_SIZE,
+    ) -> List[T]:
+        """
+        Insert many rows, updating the ones that conflict, with one
+        INSERT ... ON CONFLICT DO UPDATE ... RETURNING per chunk
+
+        Args:
+            items: Rows to write
+            index_elements: Columns of the unique constraint to match on
+                (defaults to the primary key, except on partitioned tables)
+            update_columns: Columns overwritten on conflict (defaults to every
+                inserted column except the conflict columns and created_at)
+            chunk_size: Rows per statement
+
+        Returns:
+            The inserted or updated rows
+
+        Raises:
+            ValueError: If index_elements is not given for a partitioned table
+        """
+        table = self.model.__table__
+        if index_elements is None:
+            # A partitioned table's key includes the partition column, so an
+            # existing id with another created_at would not conflict, and no
+            # unique index covers id alone (the id trigger rejects it instead)
+            if table.dialect_options["postgresql"]["partition_by"]:
+                raise ValueError(
+                    f"bulk_upsert on partitioned table {table.name} needs explicit index_elements"
+                )
+            index_elements = [column.name for column in table.primary_key.columns]
+
+        rows = [self._insert_values(item) for item in items]
+        if not rows:
+            return []
+
+        if update_columns is None:
+            update_columns = [
+                key for key in rows[0]
+                if key not in index_elements and key != "created_at" and not table.columns[key].primary_key
+            ]
+
+        upserted: List[T] = []
+        for chunk in _chunks(rows, chunk_size):
+            statement = pg_insert(self.model).values(list(chunk))
+            statement = statement.on_conflict_do_update(
+                index_elements=index_elements,
+                set_={key: statement.excluded[key] for key in update_columns},
+            ).returning(self.model)
+            result = await self.session.execute(
+                statement, execution_options={"populate_existing": True}
+            )
+            upserted.extend(result.scalars().all())
+        await self._save()
+        return upserted
+
+    async def bulk_delete(
+        self,
+        ids: Sequence[Any],
+        chunk_size: int = DEFAULT_BULK_CHUNK_SIZE,
+    ) -> List[T]:
+        """Delete rows by id with one DELETE ... RETURNING per chunk"""
+        ids = list(ids)
+        deleted: List[T] = []
+        for chunk in _chunks(ids, chunk_size):
+            statement = delete(self.model).where(self.model.id.in_(chunk)).returning(self.model)
+            result = await self.session.execute(statement)
+            deleted.extend(result.scalars().all())
+        if ids:
+            await self._save()
+        self._after_delete(deleted)
+        return deleted
@@ -1,5 +1,6 @@
-from typing import List, Optional, Dict, Any, Tuple
-from sqlmodel import select, and_, or_, func
+from typing import List, Optional, Dict, Any, Sequence, Tuple, Union
+from sqlmodel import SQLModel, select, and_, or_, func
+from sqlalchemy.engine import Row
 from fastapi import Depends
 import logging
 import uuid
@@ -7,7 +8,11 @@ from datetime import date, datetime
 
 from database import get_async_session
 from models import Claim, PolicyHolder, EventType, ClaimStatus
-from .base import BaseRepository
+from .base import BaseRepository, read_only
+from .fieldsets import field_columns
+from .pagination import Cursor, TotalMode, keyset_condition, keyset_order
+from .partitions import created_conditions
+from .search import NameMatch, metadata_conditions, name_condition, name_rank, text_condition, text_rank
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 logger = logging.getLogger(__name__)
@@ -15,6 +20,8 @@ logger = logging.getLogger(__name__)
 class ClaimRepository(BaseRepository[Claim]):
     """Repository for managing insurance claims"""
     
+    text_search_fields = ("damage_description", "event_location")
+    
     def __init__(self, session: AsyncSession = Depends(get_async_session)):
         super().__init__(session, Claim)
     
@@ -32,6 +39,7 @@ class ClaimRepository(BaseRepository[Claim]):
         result = await self.session.exec(statement)
         return result.first()
     
+    @read_only
     async def search_claims(
         self,
         id: Optional[str] = None,
@@ -39,11 +47,20 @@ class ClaimRepository(BaseRepository[Claim]):
         status: Optional[str] = None,
         event_type: Optional[str] = None,
         name_search: Optional[str] = None,
+        name_match: NameMatch = NameMatch.CONTAINS,
         date_from: Optional[date] = None,
         date_to: Optional[date] = None,
+        created_from: Optional[date] = None,
+        created_to: Optional[date] = None,
+        q: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        metadata_keys: Sequence[str] = (),
         skip: int = 0,
         limit: int = 100,
-    ) -> Tuple[List[Claim], int]:
+        after: Optional[Cursor] = None,
+        include_total: TotalMode = TotalMode.EXACT,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[Union[Claim, Row]], Optional[int]]:
         """
         Search for claims with various filters
         
@@ -53,13 +70,24 @@ class ClaimRepository(BaseRepository[Claim]):
             status: Filter by claim status
             event_type: Filter by event type
             name_search: Search in first or last name
+            name_match: contains, or fuzzy to tolerate typos and rank by similarity
             date_from: Filter events from this date
             date_to: Filter events until this date
-            skip: Number of records to skip
+            created_from: Filter items received from this date (UTC)
+            created_to: Filter items received until this date (UTC)
+            q: Full-text query over damage description and event location;
+                results are ordered by relevance
+            metadata: JSON object claim_metadata must contain (@>)
+            metadata_keys: Top-level keys claim_metadata must have
+            skip: Number of records to skip (ignored with after)
             limit: Maximum number of records to return
+            after: Decoded cursor; return the rows after it (keyset pagination)
+            include_total: How to compute the total (exact, estimate, cached, none)
+            fields: Select only these columns and return Row tuples instead
+                of Claim instances; full instances when omitted
             
         Returns:
-            Tuple of (list of claims, total count)
+            Tuple of (list of claims, total count or None)
         """
         filters = []
         
@@ -77,12 +105,7 @@ class ClaimRepository(BaseRepository[Claim]):
             filters.append(Claim.event_type == event_type)
             
         if name_search:
-            filters.append(
-                or_(
-                    Claim.first_name.ilike(f"%{name_search}%"),
-                    Claim.last_name.ilike(f"%{name_search}%")
-                )
-            )
+            filters.append(name_condition(Claim, name_search, name_match))
             
         if date_from:
             filters.append(Claim.event_date >= date_from)
@@ -90,21 +113,41 @@ class ClaimRepository(BaseRepository[Claim]):
         if date_to:
             filters.append(Claim.event_date <= date_to)
         
+        if created_from or created_to:
+            filters.extend(created_conditions(Claim, created_from, created_to))
+        
+        if q:
+            filters.append(text_condition(Claim, q))
+        
+        if metadata or metadata_keys:
+            filters.extend(metadata_conditions(Claim.claim_metadata, metadata, metadata_keys))
+        
         # Build query
         statement = select(Claim)
         if filters:
             statement = statement.where(and_(*filters))
             
-        # Get total count
-        count_statement = select(func.count()).select_from(statement.subquery())
-        total = await self.session.exec(count_statement)
-        total_count = total.one()
+        # Get total count, straight off the table rather than a subquery
+        total_count = await self.count_where(*filters, mode=include_total)
         
-        # Apply pagination
-        statement = statement.offset(skip).limit(limit)
+        # Apply pagination, most relevant first when ranking
+        order = keyset_order(Claim)
+        if name_search and name_match == NameMatch.FUZZY:
+            order = [name_rank(Claim, name_search).desc(), *order]
+        if q:
+            order = [text_rank(Claim, q).desc(), *order]
+        statement = statement.order_by(*order).limit(limit)
+        if after:
+            statement = statement.where(keyset_condition(Claim, after))
+        else:
+            statement = statement.offset(skip)
         
         # Execute query
-        result = await self.session.exec(statement)
+        if fields:
+            statement = statement.with_only_columns(*field_columns(Claim, fields))
+            result = await self.session.execute(statement)
+        else:
+            result = await self.session.exec(statement)
         claims = result.all()
         
         return claims, total_count
@@ -123,15 +166,25 @@ class ClaimRepository(BaseRepository[Claim]):
         if not claim_data.get("claim_id"):
             claim_data["claim_id"] = f"CLM{uuid.uuid4().hex[:6].upper()}"
         
-        # Create new claim
-        claim = Claim(**claim_data)
-        
-        # Add to DB and commit
-        self.session.add(claim)
-        await self.session.commit()
-        await self.session.refresh(claim)
+        # Insert the claim and get the stored row back in one statement
+        return await self.create(claim_data)
+    
+    async def update_by_claim_id(
+        self,
+        claim_id: str,
+        data: Union[Dict[str, Any], SQLModel],
+    ) -> Optional[Claim]:
+        """
+        Update a claim in a single statement
         
-        return claim
+        Args:
+            claim_id: The claim ID
+            data: Fields to update
+            
+        Returns:
+            The updated claim or None if not found
+        """
+        return await self.update_where([Claim.claim_id == claim_id], data)
     
     async def update_claim_status(
         self, 
@@ -150,25 +203,14 @@ class ClaimRepository(BaseRepository[Claim]):
         Returns:
             The updated claim or None if not found
         """
-        claim = await self.get_by_claim_id(claim_id)
-        if not claim:
-            return None
-        
         # Update status
-        claim.claim_status = status
+        values: Dict[str, Any] = {"claim_status": status}
         
-        # Update metadata if provided
+        # Merge metadata into the stored value if provided
         if metadata:
-            if not claim.claim_metadata:
-                claim.claim_metadata = {}
-            claim.claim_metadata.update(metadata)
-        
-        # Save changes
-        self.session.add(claim)
-        await self.session.commit()
-        await self.session.refresh(claim)
+            values["claim_metadata"] = self._jsonb_merge(Claim.claim_metadata, metadata)
         
-        return claim
+        return await self.update_where([Claim.claim_id == claim_id], values)
     
     async def associate_with_policyholder(
         self,
@@ -189,23 +231,14 @@ class ClaimRepository(BaseRepository[Claim]):
         Returns:
             The updated claim or None if not found
         """
-        claim = await self.get_by_claim_id(claim_id)
-        if not claim:
-            return None
-        
         # Update policyholder association
-        claim.policyholder_id = policyholder_id
+        values: Dict[str, Any] = {"policyholder_id": policyholder_id}
         if policy_id:
-            claim.policy_id = policy_id
+            values["policy_id"] = policy_id
         if matched_by:
-            claim.matched_by = matched_by
+            values["matched_by"] = matched_by
         
-        # Save changes
-        self.session.add(claim)
-        await self.session.commit()
-        await self.session.refresh(claim)
-        
-        return claim
+        return await self.update_where([Claim.claim_id == claim_id], values)
     
     async def delete_claim(self, claim_id: str) -> bool:
         """
@@ -218,19 +251,15 @@ class ClaimRepository(BaseRepository[Claim]):
             True if deleted successfully, False if not found
         """
         try:
-            claim = await self.get_by_claim_id(claim_id)
-            if not claim:
+            deleted = await self.delete_where(Claim.claim_id == claim_id)
+            if not deleted:
                 logger.warning(f"Claim with ID {claim_id} not found for deletion")
                 return False
             
-            # Delete the claim
-            await self.session.delete(claim)
-            await self.session.commit()
-            
             logger.info(f"Deleted claim {claim_id}")
             return True
             
         except Exception as e:
             logger.error(f"Error deleting claim {claim_id}: {str(e)}")
-            await self.session.rollback()
+            await self._rollback()
             return False
\ No newline at end of file
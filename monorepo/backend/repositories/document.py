@@ -1,20 +1,22 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
-from sqlmodel import select, and_, or_
+from sqlmodel import select, and_, or_, func, case
 from fastapi import Depends
 from logging import getLogger
 
 from database import get_async_session
 from models.document import Document
 from schemas.documents.schemas import DocumentCreate, DocumentUpdate
+from .base import BaseRepository, read_only, read_write
+from .pagination import keyset_order
 
 logger = getLogger(__name__)
 
-class DocumentRepository:
+class DocumentRepository(BaseRepository[Document]):
     """Repository for document operations"""
     
     def __init__(self, session=Depends(get_async_session)):
-        self.session = session
+        super().__init__(session, Document)
     
     async def create_document(self, document_data: DocumentCreate) -> Document:
         """
@@ -26,11 +28,24 @@ class DocumentRepository:
         Returns:
             Created document
         """
-        document = Document(**document_data.dict())
-        self.session.add(document)
-        await self.session.commit()
-        await self.session.refresh(document)
-        return document
+        return await self.create(document_data.dict())
+    
+    async def create_documents(self, documents_data: List[DocumentCreate]) -> List[Document]:
+        """
+        Create several documents with batched multi-row inserts
+        
+        Args:
+            documents_data: Documents to create
+            
+        Returns:
+            Created documents, in the same order
+        """
+        try:
+            return await self.bulk_create([document_data.dict() for document_data in documents_data])
+        except Exception:
+            # A failed batch would leave the session unusable for the caller's next write
+            await self._rollback()
+            raise
     
     async def get_by_id(self, document_id: str) -> Optional[Document]:
         """
@@ -46,6 +61,7 @@ class DocumentRepository:
         result = await self.session.execute(statement)
         return result.scalar_one_or_none()
     
+    @read_only
     async def get_by_claim_id(self, claim_id: str) -> List[Document]:
         """
         Get documents by claim ID
@@ -60,6 +76,7 @@ class DocumentRepository:
         result = await self.session.execute(statement)
         return result.scalars().all()
     
+    @read_only
     async def get_by_inbox_id(self, inbox_id: str) -> List[Document]:
         """
         Get documents by inbox ID
@@ -85,19 +102,14 @@ class DocumentRepository:
         Returns:
             Updated document or None if not found
         """
-        document = await self.get_by_id(document_id)
-        if not document:
-            logger.warning(f"Document not found: {document_id}")
-            return None
-        
         # Update only non-None fields
         update_data = document_data.dict(exclude_unset=True, exclude_none=True)
-        for key, value in update_data.items():
-            setattr(document, key, value)
+        update_data["updated_at"] = datetime.utcnow()
         
-        document.updated_at = datetime.utcnow()
-        await self.session.commit()
-        await self.session.refresh(document)
+        document = await self.update_where([Document.id == document_id], update_data)
+        if not document:
+            logger.warning(f"Document not found: {document_id}")
+            return None
         return document
     
     async def delete_document(self, document_id: str) -> bool:
@@ -110,15 +122,22 @@ class DocumentRepository:
         Returns:
             True if document was deleted, False otherwise
         """
-        document = await self.get_by_id(document_id)
-        if not document:
+        deleted = await self.delete_where(Document.id == document_id)
+        if not deleted:
             logger.warning(f"Document not found: {document_id}")
             return False
-        
-        await self.session.delete(document)
-        await self.session.commit()
         return True
     
+    def _filters(self, claim_id: Optional[str], inbox_id: Optional[str]) -> List[Any]:
+        """Criteria for documents of either the given claim or inbox item"""
+        filters = []
+        if claim_id:
+            filters.append(Document.claim_id == claim_id)
+        if inbox_id:
+            filters.append(Document.inbox_id == inbox_id)
+        return [or_(*filters)] if filters else []
+    
+    @read_only
     async def list_documents(
         self,
         skip: int = 0,
@@ -138,22 +157,12 @@ class DocumentRepository:
         Returns:
             List of documents
         """
-        statement = select(Document)
-        
-        # Apply filters
-        filters = []
-        if claim_id:
-            filters.append(Document.claim_id == claim_id)
-        if inbox_id:
-            filters.append(Document.inbox_id == inbox_id)
-        
-        if filters:
-            statement = statement.where(or_(*filters))
-        
+        statement = select(Document).where(*self._filters(claim_id, inbox_id))
         statement = statement.offset(skip).limit(limit)
         result = await self.session.execute(statement)
         return result.scalars().all()
     
+    @read_only
     async def count_documents(
         self,
         claim_id: Optional[str] = None,
@@ -169,21 +178,49 @@ class DocumentRepository:
         Returns:
             Number of documents
         """
-        statement = select(Document)
-        
-        # Apply filters
-        filters = []
-        if claim_id:
-            filters.append(Document.claim_id == claim_id)
-        if inbox_id:
-            filters.append(Document.inbox_id == inbox_id)
+        return await self.count_where(*self._filters(claim_id, inbox_id))
+    
+    @read_only
+    async def list_documents_with_total(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        claim_id: Optional[str] = None,
+        inbox_id: Optional[str] = None,
+    ) -> Tuple[List[Document], int]:
+        """
+        List a page of documents together with the total matching count
         
-        if filters:
-            statement = statement.where(or_(*filters))
+        The total comes from count(*) OVER () on the same statement, so the
+        page and the total are read in one query.
         
+        Args:
+            skip: Number of records to skip
+            limit: Maximum number of records to return
+            claim_id: Filter by claim ID
+            inbox_id: Filter by inbox ID
+            
+        Returns:
+            Tuple of (documents, total)
+        """
+        filters = self._filters(claim_id, inbox_id)
+        statement = (
+            select(Document, func.count().over().label("total"))
+            .where(*filters)
+            .order_by(*keyset_order(Document))
+            .offset(skip)
+            .limit(limit)
+        )
         result = await self.session.execute(statement)
-        return len(result.scalars().all())
+        rows = result.all()
+        if rows:
+            return [row[0] for row in rows], rows[0][1]
+        
+        # Past the last page there is no row to carry the total
+        total = await self.count_where(*filters) if skip else 0
+        return [], total
     
+    @read_write
     async def transfer_documents_to_claim(
         self,
         inbox_id: str,
@@ -199,23 +236,32 @@ class DocumentRepository:
         Returns:
             List of transferred documents
         """
-        # Get all documents associated with the inbox
-        inbox_documents = await self.get_by_inbox_id(inbox_id)
-        
-        # Update each document to associate with claim instead of inbox
-        transferred_documents = []
-        for document in inbox_documents:
-            document.claim_id = claim_id
-            document.inbox_id = None
-            document.updated_at = datetime.utcnow()
-            transferred_documents.append(document)
+        transferred_documents = await self.transfer_documents_to_claims({inbox_id: claim_id})
+        logger.info(f"Transferred {len(transferred_documents)} documents from inbox {inbox_id} to claim {claim_id}")
+        return transferred_documents
+    
+    @read_write
+    async def transfer_documents_to_claims(self, claim_ids: Dict[str, str]) -> List[Document]:
+        """
+        Transfer the documents of many inbox items to their claims at once
         
-        # Commit all changes
-        await self.session.commit()
+        One UPDATE ... RETURNING moves every document, picking each row's
+        claim with a CASE on its inbox_id, however many attachments there are.
         
-        # Refresh all documents
-        for document in transferred_documents:
-            await self.session.refresh(document)
+        Args:
+            claim_ids: Target claim ID keyed by source inbox ID
+            
+        Returns:
+            List of transferred documents
+        """
+        if not claim_ids:
+            return []
         
-        logger.info(f"Transferred {len(transferred_documents)} documents from inbox {inbox_id} to claim {claim_id}")
-        return transferred_documents
+        return await self.update_all_where(
+            [Document.inbox_id.in_(list(claim_ids))],
+            {
+                "claim_id": case(claim_ids, value=Document.inbox_id),
+                "inbox_id": None,
+                "updated_at": datetime.utcnow(),
+            },
+        )
@@ -0,0 +1,322 @@
+from typing import Any, Awaitable, Callable, Dict, Optional
+from datetime import datetime, timedelta, timezone
+import asyncio
+import hashlib
+import logging
+import os
+
+from fastapi import Depends
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from database import get_async_session
+from models import ExtractionResult
+from .base import BaseRepository, read_write
+
+logger = logging.getLogger(__name__)
+
+# Serve repeated document extractions from extraction_results
+EXTRACTION_CACHE_ENABLED = os.getenv("EXTRACTION_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+# Days a stored result is served before Gemini is asked again
+EXTRACTION_CACHE_TTL_DAYS = float(os.getenv("EXTRACTION_CACHE_TTL_DAYS", "30"))
+# Results kept; the least recently used beyond this are evicted
+EXTRACTION_CACHE_MAX_ENTRIES = int(os.getenv("EXTRACTION_CACHE_MAX_ENTRIES", "100000"))
+# Seconds between eviction runs in each worker; 0 disables the job
+EXTRACTION_CACHE_EVICTION_INTERVAL = float(os.getenv("EXTRACTION_CACHE_EVICTION_INTERVAL", "3600"))
+
+Result = Dict[str, Any]
+
+def extraction_key(
+    content_hash: str,
+    mime_type: str,
+    schema_type: str,
+    model: str,
+    temperature: float,
+    max_output_tokens: int,
+    schema_version: str,
+) -> str:
+    """
+    Key of an extraction: the same document, sent as the same type, with the
+    same schema version, model and generation settings always maps to the
+    same key
+
+    Args:
+        content_hash: sha256 hex digest of the document bytes
+        mime_type: MIME type the document is sent to Gemini as
+        schema_type: Schema the result is structured by
+        model: Gemini model
+        temperature: Sampling temperature
+        max_output_tokens: Output limit, which can truncate the result
+        schema_version: Hash of the schema's content
+
+    Returns:
+        sha256 hex digest of the parts
+    """
+    parts = (
+        content_hash,
+        mime_type,
+        schema_type,
+        model,
+        repr(float(temperature)),
+        str(int(max_output_tokens)),
+        schema_version,
+    )
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+class ExtractionResultRepository(BaseRepository[ExtractionResult]):
+    """Repository for stored document extraction results"""
+
+    def __init__(self, session: AsyncSession = Depends(get_async_session)):
+        super().__init__(session, ExtractionResult)
+
+    @read_write
+    async def get_result(self, key: str, ttl_days: float = EXTRACTION_CACHE_TTL_DAYS) -> Optional[Result]:
+        """
+        Get a stored result that has not expired, marking it as used
+
+        Args:
+            key: Extraction key
+            ttl_days: Age after which a result is no longer served
+
+        Returns:
+            The result, or None if there is none
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(days=ttl_days)
+        statement = (
+            update(ExtractionResult)
+            .where(ExtractionResult.key == key, ExtractionResult.created_at > cutoff)
+            .values(last_used_at=func.now())
+            .returning(ExtractionResult.result)
+        )
+        try:
+            result = await self.session.execute(statement)
+            stored = result.scalars().first()
+            await self._save()
+        except Exception:
+            await self._rollback()
+            raise
+        return stored
+
+    @read_write
+    async def put_result(self, key: str, schema_type: str, model: str, result: Result) -> None:
+        """
+        Store a result, replacing any earlier one under the same key
+
+        Args:
+            key: Extraction key
+            schema_type: Schema the result is structured by
+            model: Gemini model that produced it
+            result: The extraction result
+        """
+        statement = pg_insert(ExtractionResult).values(
+            key=key,
+            schema_type=schema_type,
+            model=model,
+            result=result,
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[ExtractionResult.key],
+            set_={
+                "result": statement.excluded.result,
+                "created_at": func.now(),
+                "last_used_at": func.now(),
+            },
+        )
+        try:
+            await self.session.execute(statement)
+            await self._save()
+        except Exception:
+            await self._rollback()
+            raise
+
+    @read_write
+    async def evict(
+        self,
+        ttl_days: float = EXTRACTION_CACHE_TTL_DAYS,
+        max_entries: int = EXTRACTION_CACHE_MAX_ENTRIES,
+    ) -> int:
+        """
+        Delete expired results and the least recently used beyond max_entries
+
+        Args:
+            ttl_days: Age after which a result is deleted
+            max_entries: Results to keep
+
+        Returns:
+            Number of results deleted
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(days=ttl_days)
+        surplus = (
+            select(ExtractionResult.key)
+            .order_by(ExtractionResult.last_used_at.desc())
+            .offset(max_entries)
+            .scalar_subquery()
+        )
+        try:
+            expired = await self.session.execute(
+                delete(ExtractionResult).where(ExtractionResult.created_at <= cutoff)
+            )
+            unused = await self.session.execute(
+                delete(ExtractionResult).where(ExtractionResult.key.in_(surplus))
+            )
+            await self._save()
+        except Exception:
+            await self._rollback()
+            raise
+        return expired.rowcount + unused.rowcount
+
+class ExtractionStore:
+    """
+    Content-addressed store of Gemini extraction results
+
+    Results live in extraction_results, so every worker and restart shares
+    them. Concurrent requests for the same key in a worker share one lookup
+    and Gemini call instead of each making their own. Storage errors are
+    logged and the extraction runs uncached, so the store never fails a
+    request. Every worker evicts expired and least recently used results
+    every interval seconds.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = EXTRACTION_CACHE_ENABLED,
+        ttl_days: float = EXTRACTION_CACHE_TTL_DAYS,
+        max_entries: int = EXTRACTION_CACHE_MAX_ENTRIES,
+        interval: float = EXTRACTION_CACHE_EVICTION_INTERVAL,
+    ):
+        self.enabled = enabled
+        self.ttl_days = ttl_days
+        self.max_entries = max_entries
+        self.interval = interval
+        self.hits = 0
+        self.misses = 0
+        self._session_factory: Optional[Callable[[], AsyncSession]] = None
+        self._inflight: Dict[str, "asyncio.Future[Result]"] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def active(self) -> bool:
+        return self.enabled and self._session_factory is not None
+
+    async def start(self, session_factory: Callable[[], AsyncSession]) -> None:
+        if not self.enabled:
+            return
+        self._session_factory = session_factory
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._session_factory = None
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def get_or_compute(
+        self,
+        key: str,
+        schema_type: str,
+        model: str,
+        compute: Callable[[], Awaitable[Result]],
+        bypass: bool = False,
+        cacheable: Callable[[Result], bool] = lambda result: True,
+    ) -> Result:
+        """
+        Get the stored result for key, or compute and store it
+
+        Args:
+            key: Extraction key (see extraction_key)
+            schema_type: Schema the result is structured by
+            model: Gemini model
+            compute: Produces the result on a miss
+            bypass: Skip the lookup and compute afresh, replacing the stored result
+            cacheable: Whether a computed result may be stored
+
+        Returns:
+            The stored or computed result
+        """
+        if not self.active:
+            return await compute()
+        if bypass:
+            result = await compute()
+            if cacheable(result):
+                await self._put(key, schema_type, model, result)
+            return result
+
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._load(key, schema_type, model, compute, cacheable))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # A cancelled request must not cancel the call others are waiting on
+        return await asyncio.shield(future)
+
+    async def evict(self) -> int:
+        """
+        Evict expired and least recently used results
+
+        Returns:
+            Number of results deleted
+        """
+        async with self._session_factory() as session:
+            deleted = await ExtractionResultRepository(session).evict(self.ttl_days, self.max_entries)
+        if deleted:
+            logger.info(f"Evicted {deleted} stored extraction results")
+        return deleted
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters of this worker"""
+        lookups = self.hits + self.misses
+        return {
+            "active": self.active,
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    async def _load(
+        self,
+        key: str,
+        schema_type: str,
+        model: str,
+        compute: Callable[[], Awaitable[Result]],
+        cacheable: Callable[[Result], bool],
+    ) -> Result:
+        try:
+            async with self._session_factory() as session:
+                stored = await ExtractionResultRepository(session).get_result(key, self.ttl_days)
+        except Exception as e:
+            logger.warning(f"Extraction store lookup failed: {str(e)}")
+            stored = None
+        if stored is not None:
+            self.hits += 1
+            return stored
+
+        self.misses += 1
+        result = await compute()
+        if cacheable(result):
+            await self._put(key, schema_type, model, result)
+        return result
+
+    async def _put(self, key: str, schema_type: str, model: str, result: Result) -> None:
+        try:
+            async with self._session_factory() as session:
+                await ExtractionResultRepository(session).put_result(key, schema_type, model, result)
+        except Exception as e:
+            logger.warning(f"Failed to store extraction result: {str(e)}")
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.evict()
+            except Exception as e:
+                logger.error(f"Extraction result eviction failed: {str(e)}")
+
+extraction_store = ExtractionStore()
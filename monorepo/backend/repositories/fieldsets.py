@@ -0,0 +1,44 @@
+from typing import Any, Collection, Dict, List, Optional, Sequence
+
+from sqlalchemy.engine import Row
+
+# Always loaded: identify the row and carry the keyset pagination cursor
+REQUIRED_FIELDS = ("id", "created_at")
+
+def parse_fields(
+    fields: Optional[str],
+    allowed: Collection[str],
+    defaults: Sequence[str],
+) -> List[str]:
+    """
+    Field names selected by a comma-separated fields= value
+
+    Args:
+        fields: Raw query value, e.g. "first_name,last_name"; empty for defaults
+        allowed: Names that may be selected
+        defaults: Names used when fields is empty
+
+    Returns:
+        The selected names plus the required ones, in a stable order
+
+    Raises:
+        ValueError: If a name is not allowed
+    """
+    names = [name.strip() for name in fields.split(",") if name.strip()] if fields else list(defaults)
+    unknown = sorted(set(names) - set(allowed))
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return list(dict.fromkeys([*REQUIRED_FIELDS, *names]))
+
+def field_columns(model: Any, fields: Sequence[str]) -> List[Any]:
+    """
+    The columns of model for fields, in order
+
+    Selecting these instead of the model returns plain Row tuples: no ORM
+    instances, identity map or change tracking, only the selected columns.
+    """
+    return [getattr(model, name) for name in fields]
+
+def row_dicts(rows: Sequence[Row], fields: Sequence[str]) -> List[Dict[str, Any]]:
+    """Rows selected with field_columns as dicts, ready to serialize"""
+    return [dict(zip(fields, row)) for row in rows]
@@ -1,20 +1,45 @@
-from typing import List, Optional, Dict, Any, Tuple
-from sqlmodel import select, and_, or_, func
+from typing import List, Optional, Dict, Any, Sequence, Tuple, Union
+from sqlmodel import SQLModel, select, and_, or_, func, case
+from sqlalchemy import BigInteger, cast, tuple_
+from sqlalchemy.engine import Row
 from fastapi import Depends
+import enum
 import logging
+import os
 import uuid
 from datetime import date, datetime
 
 from database import get_async_session
-from models import Inbox, PolicyHolder, EventType, ClaimStatus, InboxStatus
-from .base import BaseRepository
+from models import Inbox, InboxCounter, CounterDimension, PolicyHolder, EventType, ClaimStatus, InboxStatus
+from .base import BaseRepository, read_only, read_write
+from .cache import TTLCache
+from .fieldsets import field_columns
+from .pagination import Cursor, TotalMode, keyset_condition, keyset_order
+from .partitions import created_conditions
+from .search import NameMatch, metadata_conditions, name_condition, name_rank, text_condition, text_rank
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 logger = logging.getLogger(__name__)
 
+# Key for items without an assignee in the stats breakdown
+UNASSIGNED = "unassigned"
+
+class StatsMode(enum.StrEnum):
+    """Where inbox statistics are read from"""
+    COUNTERS = "counters"  # Trigger-maintained counter table, constant time
+    LIVE = "live"          # One GROUP BY over the inbox, exact at read time
+
+# Maps an inbox id or claim_id to (id, claim_id). Entries only go stale if
+# claim_id is changed or the row is deleted through another worker, in which
+# case a primary key lookup finds nothing for at most the TTL.
+INBOX_ID_CACHE_TTL = float(os.getenv("INBOX_ID_CACHE_TTL", "300"))
+identifier_cache = TTLCache(maxsize=10000, ttl=INBOX_ID_CACHE_TTL)
+
 class InboxRepository(BaseRepository[Inbox]):
     """Repository for managing inbox items"""
     
+    text_search_fields = ("email_subject", "damage_description", "raw_email_content")
+    
     def __init__(self, session: AsyncSession = Depends(get_async_session)):
         super().__init__(session, Inbox)
 
@@ -54,6 +79,7 @@ class InboxRepository(BaseRepository[Inbox]):
             logger.error(f"Error getting inbox item by claim_id {claim_id}: {str(e)}")
             return None
 
+    @read_only
     async def search_inbox_items(
         self,
         policyholder_id: Optional[str] = None,
@@ -62,13 +88,22 @@ class InboxRepository(BaseRepository[Inbox]):
         claim_status: Optional[str] = None,
         event_type: Optional[str] = None,
         name_search: Optional[str] = None,
+        name_match: NameMatch = NameMatch.CONTAINS,
         date_from: Optional[date] = None,
         date_to: Optional[date] = None,
+        created_from: Optional[date] = None,
+        created_to: Optional[date] = None,
         assigned_to: Optional[str] = None,
         priority: Optional[str] = None,
+        q: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        metadata_keys: Sequence[str] = (),
         skip: int = 0,
-        limit: int = 100
-    ) -> Tuple[List[Inbox], int]:
+        limit: int = 100,
+        after: Optional[Cursor] = None,
+        include_total: TotalMode = TotalMode.EXACT,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[Union[Inbox, Row]], Optional[int]]:
         """
         Search inbox items with various filters
         
@@ -79,15 +114,26 @@ class InboxRepository(BaseRepository[Inbox]):
             claim_status: Filter by claim status
             event_type: Filter by event type
             name_search: Search in first or last name
+            name_match: contains, or fuzzy to tolerate typos and rank by similarity
             date_from: Filter events from this date
             date_to: Filter events until this date
+            created_from: Filter items received from this date (UTC)
+            created_to: Filter items received until this date (UTC)
             assigned_to: Filter by assigned user
             priority: Filter by priority
-            skip: Number of records to skip (pagination)
+            q: Full-text query over subject, damage description and email body;
+                results are ordered by relevance
+            metadata: JSON object claim_metadata must contain (@>)
+            metadata_keys: Top-level keys claim_metadata must have
+            skip: Number of records to skip (pagination, ignored with after)
             limit: Maximum number of records to return
+            after: Decoded cursor; return the rows after it (keyset pagination)
+            include_total: How to compute the total (exact, estimate, cached, none)
+            fields: Select only these columns and return Row tuples instead
+                of Inbox instances; full instances when omitted
             
         Returns:
-            Tuple of (list of inbox items, total count)
+            Tuple of (list of inbox items, total count or None)
         """
         try:
             # Build base query
@@ -110,17 +156,16 @@ class InboxRepository(BaseRepository[Inbox]):
                 query_conditions.append(Inbox.event_type == event_type)
             
             if name_search:
-                name_condition = or_(
-                    Inbox.first_name.ilike(f"%{name_search}%"),
-                    Inbox.last_name.ilike(f"%{name_search}%")
-                )
-                query_conditions.append(name_condition)
+                query_conditions.append(name_condition(Inbox, name_search, name_match))
             
             if date_from:
                 query_conditions.append(Inbox.event_date >= date_from)
                 
             if date_to:
                 query_conditions.append(Inbox.event_date <= date_to)
+            
+            if created_from or created_to:
+                query_conditions.extend(created_conditions(Inbox, created_from, created_to))
                 
             if assigned_to:
                 query_conditions.append(Inbox.assigned_to == assigned_to)
@@ -128,24 +173,40 @@ class InboxRepository(BaseRepository[Inbox]):
             if priority:
                 query_conditions.append(Inbox.priority == priority)
             
+            if q:
+                query_conditions.append(text_condition(Inbox, q))
+            
+            if metadata or metadata_keys:
+                query_conditions.extend(metadata_conditions(Inbox.claim_metadata, metadata, metadata_keys))
+            
             # Combine all conditions
             where_clause = and_(*query_conditions) if query_conditions else True
             
             # Count query
-            count_statement = select(func.count(Inbox.id)).where(where_clause)
-            count_result = await self.session.exec(count_statement)
-            total = count_result.one()
+            total = await self.count_where(where_clause, mode=include_total)
+            
+            # Data query with pagination, most relevant first when ranking
+            order = keyset_order(Inbox)
+            if name_search and name_match == NameMatch.FUZZY:
+                order = [name_rank(Inbox, name_search).desc(), *order]
+            if q:
+                order = [text_rank(Inbox, q).desc(), *order]
             
-            # Data query with pagination
             statement = (
                 select(Inbox)
                 .where(where_clause)
-                .order_by(Inbox.created_at.desc())
-                .offset(skip)
+                .order_by(*order)
                 .limit(limit)
             )
-            
-            result = await self.session.exec(statement)
+            if after:
+                statement = statement.where(keyset_condition(Inbox, after))
+            else:
+                statement = statement.offset(skip)
+            if fields:
+                statement = statement.with_only_columns(*field_columns(Inbox, fields))
+                result = await self.session.execute(statement)
+            else:
+                result = await self.session.exec(statement)
             inbox_items = result.all()
             
             logger.info(f"Found {len(inbox_items)} inbox items (total: {total})")
@@ -169,16 +230,91 @@ class InboxRepository(BaseRepository[Inbox]):
         if not inbox_data.get("claim_id"):
             inbox_data["claim_id"] = f"INB{uuid.uuid4().hex[:6].upper()}"
         
-        # Create new inbox item
-        inbox_item = Inbox(**inbox_data)
-        
-        # Add to DB and commit
-        self.session.add(inbox_item)
-        await self.session.commit()
-        await self.session.refresh(inbox_item)
+        # Insert the inbox item and get the stored row back in one statement
+        return await self.create(inbox_data)
+
+    def _identifier_clause(self, inbox_id: str):
+        """Match an inbox item by either its claim_id or its id"""
+        return or_(Inbox.claim_id == inbox_id, Inbox.id == inbox_id)
+
+    def _lookup_clause(self, inbox_id: str):
+        """
+        Match an inbox item by id or claim_id, by primary key once resolved
         
+        A miss matches on both unique columns in one statement, so resolving
+        never costs an extra query; the row it returns seeds the cache.
+        """
+        entry = identifier_cache.get(inbox_id)
+        if entry:
+            return Inbox.id == entry[0]
+        return self._identifier_clause(inbox_id)
+
+    def _remember(self, inbox_item: Optional[Inbox]) -> Optional[Inbox]:
+        """Cache the identifiers of inbox_item and return it"""
+        if inbox_item is not None:
+            entry = (inbox_item.id, inbox_item.claim_id)
+            identifier_cache.set(inbox_item.id, entry)
+            if inbox_item.claim_id:
+                identifier_cache.set(inbox_item.claim_id, entry)
         return inbox_item
 
+    def _forget(self, inbox_id: str) -> None:
+        """Drop the cached identifiers of an inbox item"""
+        entry = identifier_cache.get(inbox_id)
+        identifier_cache.invalidate(inbox_id)
+        if entry:
+            for identifier in entry:
+                if identifier:
+                    identifier_cache.invalidate(identifier)
+
+    def _after_delete(self, deleted: List[Inbox]) -> None:
+        for inbox_item in deleted:
+            self._forget(inbox_item.id)
+
+    @read_only
+    async def get_by_identifier(self, inbox_id: str) -> Optional[Inbox]:
+        """
+        Get an inbox item by either its id or its claim_id in one query
+        
+        Args:
+            inbox_id: The inbox item ID (could be id or claim_id)
+            
+        Returns:
+            The inbox item if found, None otherwise
+        """
+        statement = select(Inbox).where(self._lookup_clause(inbox_id))
+        result = await self.session.exec(statement)
+        return self._remember(result.first())
+
+    async def _update_by_identifier(
+        self,
+        inbox_id: str,
+        data: Union[Dict[str, Any], SQLModel],
+    ) -> Optional[Inbox]:
+        """Update the inbox item matching id or claim_id in one statement"""
+        return self._remember(await self.update_where([self._lookup_clause(inbox_id)], data))
+
+    async def update_inbox_item(
+        self,
+        inbox_id: str,
+        data: Union[Dict[str, Any], SQLModel],
+    ) -> Optional[Inbox]:
+        """
+        Update an inbox item in a single statement
+        
+        Args:
+            inbox_id: The inbox item ID (could be id or claim_id)
+            data: Fields to update
+            
+        Returns:
+            Updated inbox item or None if not found
+        """
+        # A new claim_id would leave the old one cached
+        if isinstance(data, dict) and "claim_id" in data:
+            self._forget(inbox_id)
+        return await self._update_by_identifier(inbox_id, data)
+
+    @read_write
     async def update_inbox_status(
         self,
         inbox_id: str,
@@ -197,41 +333,34 @@ class InboxRepository(BaseRepository[Inbox]):
             Updated inbox item or None if not found
         """
         try:
-            # Try to find by claim_id first, then by id
-            inbox_item = await self.get_by_claim_id(inbox_id)
-            if not inbox_item:
-                inbox_item = await self.get_by_id(inbox_id)
-            
-            if not inbox_item:
-                logger.warning(f"Inbox item not found: {inbox_id}")
-                return None
-            
             # Update status
-            inbox_item.inbox_status = status
-            inbox_item.updated_at = datetime.utcnow()
+            values = {
+                "inbox_status": status,
+                "updated_at": datetime.utcnow(),
+            }
             
-            # Update metadata if provided
+            # Merge metadata into the stored value if provided
             if metadata:
-                if inbox_item.claim_metadata:
-                    inbox_item.claim_metadata.update(metadata)
-                else:
-                    inbox_item.claim_metadata = metadata
+                values["claim_metadata"] = self._jsonb_merge(Inbox.claim_metadata, metadata)
             
             # Mark as processed if status is converted or rejected
             if status in [InboxStatus.CONVERTED, InboxStatus.REJECTED]:
-                inbox_item.processed_at = datetime.utcnow()
+                values["processed_at"] = datetime.utcnow()
             
-            await self.session.commit()
-            await self.session.refresh(inbox_item)
+            inbox_item = await self._update_by_identifier(inbox_id, values)
+            if not inbox_item:
+                logger.warning(f"Inbox item not found: {inbox_id}")
+                return None
             
             logger.info(f"Updated inbox item {inbox_id} status to {status}")
             return inbox_item
             
         except Exception as e:
             logger.error(f"Error updating inbox item status: {str(e)}")
-            await self.session.rollback()
+            await self._rollback()
             return None
 
+    @read_write
     async def convert_to_claim(
         self,
         inbox_id: str,
@@ -248,32 +377,30 @@ class InboxRepository(BaseRepository[Inbox]):
             Updated inbox item or None if not found
         """
         try:
-            # Try to find by claim_id first, then by id
-            inbox_item = await self.get_by_claim_id(inbox_id)
-            if not inbox_item:
-                inbox_item = await self.get_by_id(inbox_id)
-            
+            # Update status and link to converted claim
+            now = datetime.utcnow()
+            inbox_item = await self._update_by_identifier(
+                inbox_id,
+                {
+                    "inbox_status": InboxStatus.CONVERTED,
+                    "converted_claim_id": converted_claim_id,
+                    "processed_at": now,
+                    "updated_at": now,
+                },
+            )
             if not inbox_item:
                 logger.warning(f"Inbox item not found: {inbox_id}")
                 return None
             
-            # Update status and link to converted claim
-            inbox_item.inbox_status = InboxStatus.CONVERTED
-            inbox_item.converted_claim_id = converted_claim_id
-            inbox_item.processed_at = datetime.utcnow()
-            inbox_item.updated_at = datetime.utcnow()
-            
-            await self.session.commit()
-            await self.session.refresh(inbox_item)
-            
             logger.info(f"Converted inbox item {inbox_id} to claim {converted_claim_id}")
             return inbox_item
             
         except Exception as e:
             logger.error(f"Error converting inbox item to claim: {str(e)}")
-            await self.session.rollback()
+            await self._rollback()
             return None
 
+    @read_write
     async def assign_to_user(
         self,
         inbox_id: str,
@@ -290,34 +417,31 @@ class InboxRepository(BaseRepository[Inbox]):
             Updated inbox item or None if not found
         """
         try:
-            # Try to find by claim_id first, then by id
-            inbox_item = await self.get_by_claim_id(inbox_id)
-            if not inbox_item:
-                inbox_item = await self.get_by_id(inbox_id)
-            
+            # Update assignment, moving new items to processing
+            inbox_item = await self._update_by_identifier(
+                inbox_id,
+                {
+                    "assigned_to": assigned_to,
+                    "updated_at": datetime.utcnow(),
+                    "inbox_status": case(
+                        (Inbox.inbox_status == InboxStatus.NEW, InboxStatus.PROCESSING),
+                        else_=Inbox.inbox_status,
+                    ),
+                },
+            )
             if not inbox_item:
                 logger.warning(f"Inbox item not found: {inbox_id}")
                 return None
             
-            # Update assignment
-            inbox_item.assigned_to = assigned_to
-            inbox_item.updated_at = datetime.utcnow()
-            
-            # Update status to processing if it's new
-            if inbox_item.inbox_status == InboxStatus.NEW:
-                inbox_item.inbox_status = InboxStatus.PROCESSING
-            
-            await self.session.commit()
-            await self.session.refresh(inbox_item)
-            
             logger.info(f"Assigned inbox item {inbox_id} to {assigned_to}")
             return inbox_item
             
         except Exception as e:
             logger.error(f"Error assigning inbox item: {str(e)}")
-            await self.session.rollback()
+            await self._rollback()
             return None
 
+    @read_write
     async def set_priority(
         self,
         inbox_id: str,
@@ -334,57 +458,105 @@ class InboxRepository(BaseRepository[Inbox]):
             Updated inbox item or None if not found
         """
         try:
-            # Try to find by claim_id first, then by id
-            inbox_item = await self.get_by_claim_id(inbox_id)
-            if not inbox_item:
-                inbox_item = await self.get_by_id(inbox_id)
-            
+            # Update priority
+            inbox_item = await self._update_by_identifier(
+                inbox_id,
+                {"priority": priority, "updated_at": datetime.utcnow()},
+            )
             if not inbox_item:
                 logger.warning(f"Inbox item not found: {inbox_id}")
                 return None
             
-            # Update priority
-            inbox_item.priority = priority
-            inbox_item.updated_at = datetime.utcnow()
-            
-            await self.session.commit()
-            await self.session.refresh(inbox_item)
-            
             logger.info(f"Set inbox item {inbox_id} priority to {priority}")
             return inbox_item
             
         except Exception as e:
             logger.error(f"Error setting inbox item priority: {str(e)}")
-            await self.session.rollback()
+            await self._rollback()
             return None
 
-    async def get_inbox_stats(self) -> Dict[str, int]:
+    @read_only
+    async def get_inbox_stats(self, mode: StatsMode = StatsMode.COUNTERS) -> Dict[str, Any]:
         """
         Get statistics about inbox items
         
+        Args:
+            mode: counters reads the trigger-maintained inbox_counters table;
+                live counts the inbox with a single GROUP BY
+        
         Returns:
-            Dictionary with counts by status
+            Dictionary with the total and counts by status, priority and assignee
         """
         try:
-            stats = {}
-            
-            # Count by inbox status
-            for status in InboxStatus:
-                count_statement = select(func.count(Inbox.id)).where(Inbox.inbox_status == status)
-                result = await self.session.exec(count_statement)
-                stats[status] = result.one()
-            
-            # Total count
-            total_statement = select(func.count(Inbox.id))
-            result = await self.session.exec(total_statement)
-            stats["total"] = result.one()
+            if mode == StatsMode.LIVE:
+                rows = await self._live_counts()
+            else:
+                # Each count is spread over slot rows
+                result = await self.session.exec(
+                    select(
+                        InboxCounter.dimension,
+                        InboxCounter.key,
+                        cast(func.sum(InboxCounter.count), BigInteger),
+                    ).group_by(InboxCounter.dimension, InboxCounter.key)
+                )
+                rows = result.all()
             
-            return stats
+            return self._build_stats(rows)
             
         except Exception as e:
             logger.error(f"Error getting inbox stats: {str(e)}")
             return {}
+    
+    async def _live_counts(self) -> List[Tuple[str, str, int]]:
+        """Count every breakdown in one pass over the inbox using GROUPING SETS"""
+        grouping = func.grouping(Inbox.inbox_status, Inbox.priority, Inbox.assigned_to)
+        statement = select(
+            Inbox.inbox_status,
+            Inbox.priority,
+            Inbox.assigned_to,
+            grouping,
+            func.count(),
+        ).group_by(
+            func.grouping_sets(
+                tuple_(Inbox.inbox_status),
+                tuple_(Inbox.priority),
+                tuple_(Inbox.assigned_to),
+            )
+        )
+        result = await self.session.exec(statement)
+        
+        # grouping() sets a bit for each column rolled up: status=4, priority=2, assignee=1
+        rows = []
+        for inbox_status, priority, assigned_to, bits, count in result.all():
+            if bits == 0b011:
+                rows.append((CounterDimension.STATUS, inbox_status or "", count))
+            elif bits == 0b101:
+                rows.append((CounterDimension.PRIORITY, priority or "", count))
+            else:
+                rows.append((CounterDimension.ASSIGNEE, assigned_to or "", count))
+        return rows
+    
+    def _build_stats(self, rows: List[Tuple[str, str, int]]) -> Dict[str, Any]:
+        """Shape (dimension, key, count) rows into the stats response"""
+        stats: Dict[str, Any] = {
+            "total": 0,
+            "status": {status: 0 for status in InboxStatus},
+            "priority": {},
+            "assignee": {},
+        }
+        for dimension, key, count in rows:
+            if dimension == CounterDimension.ASSIGNEE:
+                if count:
+                    stats["assignee"][key or UNASSIGNED] = count
+            elif dimension in (CounterDimension.STATUS, CounterDimension.PRIORITY):
+                if count or key in stats[dimension]:
+                    stats[dimension][key] = count
+            if dimension == CounterDimension.STATUS:
+                # Every item has exactly one status, so the statuses add up to the total
+                stats["total"] += count
+        return stats
 
+    @read_only
     async def get_unprocessed_count(self) -> int:
         """
         Get count of unprocessed inbox items (new or processing)
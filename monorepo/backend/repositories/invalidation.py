@@ -0,0 +1,169 @@
+from typing import Any, Callable, Dict, List, Optional
+import asyncio
+import json
+import logging
+import os
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# Postgres channel every worker listens on
+INVALIDATION_CHANNEL = "cache_invalidation"
+
+# Seconds before retrying LISTEN after the connection is lost or refused,
+# doubling after every failed attempt up to the maximum
+INVALIDATION_RECONNECT_MIN = float(os.getenv("INVALIDATION_RECONNECT_MIN", "1"))
+INVALIDATION_RECONNECT_MAX = float(os.getenv("INVALIDATION_RECONNECT_MAX", "60"))
+
+# Called with the changed key, or None when everything under the topic is stale
+Handler = Callable[[Optional[str]], None]
+
+class InvalidationBus:
+    """
+    Cross-worker cache invalidation over Postgres LISTEN/NOTIFY
+
+    In-process caches subscribe a handler per topic. Writers publish on the
+    session that makes the change, so the NOTIFY is delivered to every worker
+    only if and when that transaction commits; the publishing worker also
+    runs its handlers straight away.
+
+    LISTEN needs a session-level connection, so it does not work through
+    pgbouncer in transaction mode. Callers check listening and fall back to
+    uncached reads when the bus is down. A lost or refused connection is
+    retried in the background with exponential backoff; every topic is
+    invalidated when it drops and again once listening resumes, since
+    changes made in between were not heard.
+    """
+
+    def __init__(
+        self,
+        channel: str = INVALIDATION_CHANNEL,
+        reconnect_min: float = INVALIDATION_RECONNECT_MIN,
+        reconnect_max: float = INVALIDATION_RECONNECT_MAX,
+    ):
+        self.channel = channel
+        self.reconnect_min = reconnect_min
+        self.reconnect_max = reconnect_max
+        self._handlers: Dict[str, List[Handler]] = {}
+        self._engine: Optional[AsyncEngine] = None
+        self._connection: Optional[AsyncConnection] = None
+        self._driver_connection: Any = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+
+    @property
+    def listening(self) -> bool:
+        return self._driver_connection is not None and not self._driver_connection.is_closed()
+
+    def subscribe(self, topic: str, handler: Handler) -> None:
+        """Run handler whenever topic is published, in this or any other worker"""
+        self._handlers.setdefault(topic, []).append(handler)
+
+    async def start(self, engine: AsyncEngine) -> None:
+        """Hold a dedicated connection from engine and LISTEN on the channel"""
+        if self.listening or self._reconnect_task is not None:
+            return
+        self._engine = engine
+        if not await self._listen():
+            self._schedule_reconnect()
+
+    async def stop(self) -> None:
+        # No reconnecting once stopped, including from the close below
+        self._engine = None
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            try:
+                await self._reconnect_task
+            except asyncio.CancelledError:
+                pass
+            self._reconnect_task = None
+        await self._close()
+
+    async def publish(self, session: AsyncSession, topic: str, key: Optional[str] = None) -> None:
+        """
+        Invalidate key under topic here now and in every worker on commit
+
+        Args:
+            session: Session of the transaction making the change
+            topic: Cache topic
+            key: Changed key, or None to invalidate the whole topic
+        """
+        self._dispatch(topic, key)
+        payload = json.dumps({"topic": topic, "key": key})
+        await session.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": self.channel, "payload": payload},
+        )
+
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+            self._dispatch(message["topic"], message.get("key"))
+        except (ValueError, KeyError) as e:
+            logger.warning(f"Ignoring malformed invalidation {payload!r}: {str(e)}")
+
+    async def _listen(self) -> bool:
+        """Open the listening connection, returning whether it succeeded"""
+        try:
+            self._connection = await self._engine.connect()
+            raw_connection = await self._connection.get_raw_connection()
+            self._driver_connection = raw_connection.driver_connection
+            await self._driver_connection.add_listener(self.channel, self._on_notify)
+            self._driver_connection.add_termination_listener(self._on_terminate)
+            logger.info(f"Listening for cache invalidations on {self.channel}")
+            return True
+        except Exception as e:
+            logger.warning(f"Cache invalidation listener unavailable: {str(e)}")
+            await self._close()
+            return False
+
+    async def _close(self) -> None:
+        if self._connection is not None:
+            try:
+                await self._connection.close()
+            except Exception as e:
+                logger.warning(f"Error closing invalidation listener: {str(e)}")
+        self._connection = None
+        self._driver_connection = None
+
+    def _schedule_reconnect(self) -> None:
+        if self._engine is None or self._reconnect_task is not None:
+            return
+        self._reconnect_task = asyncio.get_running_loop().create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        delay = self.reconnect_min
+        try:
+            while True:
+                await asyncio.sleep(delay)
+                # Release the dead connection before opening a new one
+                await self._close()
+                if await self._listen():
+                    # Changes made while disconnected were not heard
+                    self._invalidate_all()
+                    return
+                delay = min(delay * 2, self.reconnect_max)
+        finally:
+            self._reconnect_task = None
+
+    def _on_terminate(self, connection: Any) -> None:
+        # Invalidations may have been missed, so drop everything
+        logger.warning("Cache invalidation listener disconnected")
+        self._driver_connection = None
+        self._invalidate_all()
+        self._schedule_reconnect()
+
+    def _invalidate_all(self) -> None:
+        for topic in self._handlers:
+            self._dispatch(topic, None)
+
+    def _dispatch(self, topic: str, key: Optional[str]) -> None:
+        for handler in self._handlers.get(topic, []):
+            try:
+                handler(key)
+            except Exception as e:
+                logger.error(f"Invalidation handler for {topic} failed: {str(e)}")
+
+invalidation_bus = InvalidationBus()
@@ -0,0 +1,65 @@
+from typing import Any, List, Optional, Tuple
+import base64
+import enum
+import json
+from datetime import datetime
+
+from sqlalchemy import and_, tuple_
+
+# Decoded cursor: the (created_at, id) of the last row on the previous page
+Cursor = Tuple[datetime, str]
+
+class TotalMode(enum.StrEnum):
+    """How list endpoints compute the total number of matching rows"""
+    EXACT = "exact"        # COUNT(*) over the filtered set
+    ESTIMATE = "estimate"  # Row estimate from the query planner
+    CACHED = "cached"      # Exact count, cached briefly per filter set
+    NONE = "none"          # Skip the count, total is null
+
+def encode_cursor(created_at: datetime, id: str) -> str:
+    """
+    Build an opaque cursor pointing just after the given row
+
+    Args:
+        created_at: created_at of the last row on the page
+        id: id of the last row on the page
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps([created_at.isoformat(), id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Cursor:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), str(id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+def next_cursor(items: List[Any], limit: int) -> Optional[str]:
+    """Cursor for the page after items, or None when this was the last page"""
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(last.created_at, last.id)
+
+def keyset_order(model: Any) -> List[Any]:
+    """Newest first, with id as a tie breaker so the order is total"""
+    return [model.created_at.desc(), model.id.desc()]
+
+def keyset_condition(model: Any, after: Cursor) -> Any:
+    """Rows that sort after the cursor in keyset_order"""
+    # The plain created_at bound is redundant, but unlike the row comparison
+    # it lets Postgres skip the partitions newer than the cursor
+    return and_(
+        tuple_(model.created_at, model.id) < tuple_(*after),
+        model.created_at <= after[0],
+    )
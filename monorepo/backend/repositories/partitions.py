@@ -0,0 +1,280 @@
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import date, datetime, time, timedelta, timezone
+import asyncio
+import logging
+import os
+import re
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# Tables partitioned by month of created_at
+PARTITIONED_TABLES = ("inbox", "claims")
+
+# Months of partitions kept ready ahead of the current one
+PARTITION_PREMAKE_MONTHS = int(os.getenv("PARTITION_PREMAKE_MONTHS", "3"))
+# Months of partitions kept attached before the current one; 0 keeps them all
+PARTITION_RETENTION_MONTHS = int(os.getenv("PARTITION_RETENTION_MONTHS", "0"))
+# Seconds between maintenance runs in each worker
+PARTITION_MAINTENANCE_INTERVAL = float(os.getenv("PARTITION_MAINTENANCE_INTERVAL", "3600"))
+
+# Advisory lock held while maintaining, so one worker runs at a time
+PARTITION_LOCK_KEY = 7304117
+
+# Documents column pointing at each partitioned table
+DOCUMENT_COLUMNS = {"inbox": "inbox_id", "claims": "claim_id"}
+
+PARTITION_NAME = re.compile(r"_y(\d{4})m(\d{2})$")
+
+def month_start(value: date) -> date:
+    """First day of the month of value"""
+    return date(value.year, value.month, 1)
+
+def add_months(month: date, months: int) -> date:
+    """First day of the month months after month (before, when negative)"""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def partition_name(table: str, month: date) -> str:
+    """Name of the partition of table holding month, e.g. inbox_y2025m10"""
+    return f"{table}_y{month.year:04d}m{month.month:02d}"
+
+def partition_month(name: str) -> Optional[date]:
+    """Month of a partition named by partition_name, None for other names"""
+    match = PARTITION_NAME.search(name)
+    if not match:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+def create_partition_sql(table: str, month: date) -> str:
+    """DDL creating the partition of table for month, bounded in UTC"""
+    upper = add_months(month, 1)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, month)} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') TO ('{upper.isoformat()} 00:00:00+00')"
+    )
+
+def created_conditions(
+    model: Any,
+    created_from: Optional[date] = None,
+    created_to: Optional[date] = None,
+) -> List[Any]:
+    """
+    Filter rows created between two dates (inclusive, UTC)
+
+    Bounds on created_at itself let Postgres prune the monthly partitions
+    outside the range, so only the matching months are scanned.
+    """
+    conditions = []
+    if created_from:
+        conditions.append(model.created_at >= datetime.combine(created_from, time.min, tzinfo=timezone.utc))
+    if created_to:
+        upper = created_to + timedelta(days=1)
+        conditions.append(model.created_at < datetime.combine(upper, time.min, tzinfo=timezone.utc))
+    return conditions
+
+def plan_partitions(
+    attached: List[str],
+    today: date,
+    premake: int = PARTITION_PREMAKE_MONTHS,
+    retention: int = PARTITION_RETENTION_MONTHS,
+) -> Tuple[List[date], List[str]]:
+    """
+    Work out which monthly partitions to create and which to detach
+
+    Args:
+        attached: Names of the partitions currently attached
+        today: Current date (UTC)
+        premake: Months to have ready after the current one
+        retention: Months to keep before the current one; 0 keeps all
+
+    Returns:
+        Tuple of (months to create, partition names to detach), oldest first
+    """
+    current = month_start(today)
+    months = {partition_month(name): name for name in attached}
+    missing = [
+        month
+        for month in (add_months(current, offset) for offset in range(premake + 1))
+        if month not in months
+    ]
+    expired = []
+    if retention > 0:
+        cutoff = add_months(current, -retention)
+        expired = [months[month] for month in sorted(m for m in months if m and m < cutoff)]
+    return missing, expired
+
+async def _attached_partitions(connection: AsyncConnection, table: str) -> Tuple[List[str], List[str]]:
+    """Names of the partitions of table, and of those left pending detach"""
+    result = await connection.execute(
+        text(
+            "SELECT c.relname, i.inhdetachpending FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:table AS regclass) ORDER BY c.relname"
+        ),
+        {"table": table},
+    )
+    rows = result.all()
+    return [name for name, _ in rows], [name for name, pending in rows if pending]
+
+async def _holds_rows(connection: AsyncConnection, name: str) -> bool:
+    """Whether the partition name still holds any row"""
+    return (await connection.execute(text(f"SELECT EXISTS (SELECT 1 FROM {name})"))).scalar_one()
+
+async def _release_documents(connection: AsyncConnection, table: str, name: str) -> None:
+    """
+    Clear documents' references to the rows of a detached partition
+
+    Detaching fires no row triggers, so this does what the parent's delete
+    trigger would have done for each row.
+    """
+    column = DOCUMENT_COLUMNS[table]
+    await connection.execute(text(
+        f"UPDATE documents SET {column} = NULL FROM {name} "
+        f"WHERE documents.{column} = {name}.id"
+    ))
+
+async def maintain_partitions(
+    engine: AsyncEngine,
+    today: Optional[date] = None,
+    detach: bool = True,
+) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Create upcoming monthly partitions and detach expired ones
+
+    Detaching runs outside a transaction, since DETACH PARTITION CONCURRENTLY
+    needs that, under a session advisory lock so concurrent workers skip the
+    run. The lock lives on the server connection, so engine must connect to
+    Postgres directly: behind pgbouncer in transaction mode it would be taken
+    and released on different server connections and leak. Without such an
+    engine pass detach=False, which only creates partitions, in a transaction
+    under a transaction advisory lock.
+
+    Detached partitions stay as standalone tables for archiving or dropping.
+    Detaching fires no row triggers: inbox partitions are only detached once
+    the archive has emptied them, so the inbox counters stay exact, and
+    documents of detached claims are unlinked as a delete would have done.
+
+    Args:
+        engine: Engine of the primary database
+        today: Date the schedule is computed from; today in UTC by default
+        detach: Detach expired partitions; needs a direct connection
+
+    Returns:
+        Created and detached partition names per table; empty if another
+        worker held the lock
+    """
+    today = today or datetime.now(timezone.utc).date()
+    if not detach:
+        async with engine.begin() as connection:
+            locked = (await connection.execute(
+                text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": PARTITION_LOCK_KEY}
+            )).scalar_one()
+            if not locked:
+                logger.info("Partition maintenance is running in another worker")
+                return {}
+            return await _maintain(connection, today, detach=False)
+
+    async with engine.connect() as connection:
+        connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+        locked = (await connection.execute(
+            text("SELECT pg_try_advisory_lock(:key)"), {"key": PARTITION_LOCK_KEY}
+        )).scalar_one()
+        if not locked:
+            logger.info("Partition maintenance is running in another worker")
+            return {}
+        try:
+            return await _maintain(connection, today, detach=True)
+        finally:
+            await connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": PARTITION_LOCK_KEY})
+
+async def _maintain(
+    connection: AsyncConnection,
+    today: date,
+    detach: bool,
+) -> Dict[str, Dict[str, List[str]]]:
+    changes: Dict[str, Dict[str, List[str]]] = {}
+    for table in PARTITIONED_TABLES:
+        attached, pending = await _attached_partitions(connection, table)
+        missing, expired = plan_partitions([n for n in attached if n not in pending], today)
+        for month in missing:
+            await connection.execute(text(create_partition_sql(table, month)))
+        if not detach:
+            if expired or pending:
+                logger.warning(f"Not detaching partitions of {table} without a direct connection: {[*pending, *expired]}")
+            pending, expired = [], []
+        # An interrupted concurrent detach has to be finished first
+        for name in pending:
+            await connection.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name} FINALIZE"))
+            await _release_documents(connection, table, name)
+        if table == "inbox":
+            # Inbox items leave through the archive, which keeps the
+            # counters and documents right; a month is detached only
+            # once it is empty
+            kept = [name for name in expired if await _holds_rows(connection, name)]
+            if kept:
+                logger.warning(f"Not detaching inbox partitions that still hold items: {kept}")
+            expired = [name for name in expired if name not in kept]
+        for name in expired:
+            await connection.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name} CONCURRENTLY"))
+            await _release_documents(connection, table, name)
+        changes[table] = {
+            "created": [partition_name(table, month) for month in missing],
+            "detached": [*pending, *expired],
+        }
+        if missing or expired or pending:
+            logger.info(f"Partitions of {table}: created {changes[table]['created']}, detached {changes[table]['detached']}")
+    return changes
+
+class PartitionMaintainer:
+    """
+    Runs maintain_partitions at startup and then every interval seconds
+
+    Every worker runs one; the advisory lock keeps them from overlapping and
+    each run is idempotent, so any worker can pick up the schedule.
+    """
+
+    def __init__(self, interval: float = PARTITION_MAINTENANCE_INTERVAL):
+        self.interval = interval
+        self.detach = True
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, engine: AsyncEngine, detach: bool = True) -> None:
+        """
+        Maintain once now, so partitions exist before serving, then periodically
+
+        Args:
+            engine: Engine of the primary database
+            detach: Detach expired partitions; only with a direct connection
+                (see maintain_partitions)
+        """
+        if self._task is not None:
+            return
+        self.detach = detach
+        await self._run_once(engine)
+        self._task = asyncio.create_task(self._run(engine))
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self, engine: AsyncEngine) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self._run_once(engine)
+
+    async def _run_once(self, engine: AsyncEngine) -> None:
+        try:
+            await maintain_partitions(engine, detach=self.detach)
+        except Exception as e:
+            logger.error(f"Partition maintenance failed: {str(e)}")
+
+partition_maintainer = PartitionMaintainer()
@@ -1,13 +1,35 @@
-from typing import List, Optional, Dict, Any
+from typing import Awaitable, Callable, Hashable, List, Optional, Dict, Any
+import os
 import uuid
 from fastapi import Depends
+from sqlalchemy import delete
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from database import get_async_session
-from models import PolicyHolder
+from models import AutouploadEmail, PolicyHolder
 from schemas import PolicyHolderCreate, PolicyHolderUpdate
+from .autoupload_email import ALIAS_INDEX_TOPIC
 from .base import BaseRepository
+from .cache import TTLCache
+from .invalidation import invalidation_bus
+
+# Read-through cache for get_by_id and get_by_email, keyed ("id", id) and
+# ("email", email). Changes are broadcast to every worker; the TTL only
+# bounds staleness if an invalidation is missed.
+POLICYHOLDER_CACHE_TOPIC = "policyholders"
+POLICYHOLDER_CACHE_SIZE = int(os.getenv("POLICYHOLDER_CACHE_SIZE", "2048"))
+POLICYHOLDER_CACHE_TTL = float(os.getenv("POLICYHOLDER_CACHE_TTL", "300"))
+policyholder_cache = TTLCache(maxsize=POLICYHOLDER_CACHE_SIZE, ttl=POLICYHOLDER_CACHE_TTL)
+
+def _invalidate_policyholder(id: Optional[str]) -> None:
+    if id is None:
+        policyholder_cache.clear()
+    else:
+        # Covers the email entry too, whatever the email was
+        policyholder_cache.invalidate_matching(lambda policyholder: policyholder.id == id)
+
+invalidation_bus.subscribe(POLICYHOLDER_CACHE_TOPIC, _invalidate_policyholder)
 
 class PolicyHolderRepository(BaseRepository[PolicyHolder]):
     def __init__(self, session: AsyncSession = Depends(get_async_session)):
@@ -15,11 +37,30 @@ class PolicyHolderRepository(BaseRepository[PolicyHolder]):
     
     async def get_by_id(self, id: str) -> Optional[PolicyHolder]:
         """Get policyholder by their unique id"""
-        return await self.get_by_field("id", id)
+        return await self._read_through(("id", id), lambda: self.get_by_field("id", id))
     
     async def get_by_email(self, email: str) -> Optional[PolicyHolder]:
         """Get policyholder by email address"""
-        return await self.get_by_field("email", email)
+        return await self._read_through(("email", email), lambda: self.get_by_field("email", email))
+    
+    async def _read_through(
+        self,
+        key: Hashable,
+        load: Callable[[], Awaitable[Optional[PolicyHolder]]],
+    ) -> Optional[PolicyHolder]:
+        """Return the cached policyholder for key, loading and caching it on a miss"""
+        # Without the listener, changes made by other workers would go unseen
+        if not invalidation_bus.listening:
+            return await load()
+        policyholder = policyholder_cache.get(key)
+        if policyholder is None:
+            policyholder = await load()
+            # Misses are not cached, so a new policyholder is found straight away
+            if policyholder is not None:
+                # Detached copy, so cached policyholders outlive the session
+                policyholder = PolicyHolder.model_validate(policyholder.model_dump())
+                policyholder_cache.set(key, policyholder)
+        return policyholder
     
     async def create_policyholder(self, policyholder: PolicyHolderCreate) -> PolicyHolder:
         """Create a new policyholder with auto-generated id"""
@@ -35,31 +76,27 @@ class PolicyHolderRepository(BaseRepository[PolicyHolder]):
     
     async def update_policyholder(self, id: str, policyholder: PolicyHolderUpdate) -> Optional[PolicyHolder]:
         """Update a policyholder by id"""
-        # First, get the policyholder by id
-        db_policyholder = await self.get_by_id(id)
-        if db_policyholder is None:
-            return None
-        
-        # Update with the provided data
-        update_data = policyholder.model_dump(exclude_unset=True)
-        
-        for key, value in update_data.items():
-            setattr(db_policyholder, key, value)
-        
-        self.session.add(db_policyholder)
-        await self.session.commit()
-        await self.session.refresh(db_policyholder)
-        return db_policyholder
+        await invalidation_bus.publish(self.session, POLICYHOLDER_CACHE_TOPIC, id)
+        # Only the provided fields are updated, in a single statement
+        return await self.update(id, policyholder.model_dump(exclude_unset=True))
     
     async def delete_policyholder(self, id: str) -> bool:
-        """Delete a policyholder by id"""
-        db_policyholder = await self.get_by_id(id)
-        if db_policyholder is None:
-            return False
-        
-        await self.session.delete(db_policyholder)
-        await self.session.commit()
-        return True
+        """Delete a policyholder by id, with their autoupload emails"""
+        await invalidation_bus.publish(self.session, POLICYHOLDER_CACHE_TOPIC, id)
+        # The Core delete below skips the ORM cascade and the foreign key has
+        # no ON DELETE, so the emails go first, in the same transaction
+        try:
+            result = await self.session.execute(
+                delete(AutouploadEmail)
+                .where(AutouploadEmail.policy_holder_id == id)
+                .returning(AutouploadEmail.domain)
+            )
+            for domain in sorted(set(result.scalars().all())):
+                await invalidation_bus.publish(self.session, ALIAS_INDEX_TOPIC, domain)
+            return await self.delete(id)
+        except Exception:
+            await self._rollback()
+            raise
     
     async def list_policyholders(self, skip: int = 0, limit: int = 100) -> List[PolicyHolder]:
         """List all policyholders with pagination"""
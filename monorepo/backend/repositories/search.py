@@ -0,0 +1,98 @@
+from typing import Any, Dict, List, Optional, Sequence
+import enum
+import json
+
+from sqlalchemy import cast, func, literal, literal_column, or_
+from sqlalchemy.dialects.postgresql import JSONB, JSONPATH
+
+class NameMatch(enum.StrEnum):
+    """How name_search matches first and last names"""
+    CONTAINS = "contains"  # Case-insensitive substring match
+    FUZZY = "fuzzy"        # Substring or trigram similarity, ranked, tolerates typos
+
+def name_condition(model: Any, term: str, mode: NameMatch = NameMatch.CONTAINS) -> Any:
+    """
+    Filter rows whose first or last name matches term
+
+    Both modes are served by the GIN trigram indexes on first_name and
+    last_name. Fuzzy mode also accepts names whose trigram similarity to term
+    is above pg_trgm.similarity_threshold (0.3 by default), so "jonh" finds "John".
+    """
+    condition = or_(
+        model.first_name.ilike(f"%{term}%"),
+        model.last_name.ilike(f"%{term}%"),
+    )
+    if mode == NameMatch.FUZZY:
+        condition = or_(
+            condition,
+            model.first_name.op("%")(term),
+            model.last_name.op("%")(term),
+        )
+    return condition
+
+def name_rank(model: Any, term: str) -> Any:
+    """Similarity of the closer of first and last name to term, for ordering"""
+    return func.greatest(
+        func.similarity(model.first_name, term),
+        func.similarity(model.last_name, term),
+    )
+
+# Text search configuration; must match the search_vector column definitions
+TEXT_SEARCH_CONFIG = "english"
+
+def text_query(q: str) -> Any:
+    """Parse q with web search syntax: words, "quoted phrases", OR and -negation"""
+    return func.websearch_to_tsquery(literal_column(f"'{TEXT_SEARCH_CONFIG}'::regconfig"), q)
+
+def text_condition(model: Any, q: str) -> Any:
+    """Rows whose search_vector matches q, served by the GIN index"""
+    return model.search_vector.op("@@")(text_query(q))
+
+def text_rank(model: Any, q: str) -> Any:
+    """Cover density rank of a row for q, for ordering"""
+    return func.ts_rank_cd(model.search_vector, text_query(q))
+
+def text_headline(column: Any, q: str) -> Any:
+    """Snippet of column around the words matching q, with matches in <mark>"""
+    return func.ts_headline(
+        literal_column(f"'{TEXT_SEARCH_CONFIG}'::regconfig"),
+        func.coalesce(column, ""),
+        text_query(q),
+        "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=25, MinWords=10",
+    )
+
+def parse_metadata(value: str) -> Dict[str, Any]:
+    """
+    Decode a metadata filter given as a JSON object
+
+    Raises:
+        ValueError: If value is not a JSON object
+    """
+    try:
+        decoded = json.loads(value)
+    except ValueError:
+        raise ValueError("metadata must be a JSON object")
+    if not isinstance(decoded, dict):
+        raise ValueError("metadata must be a JSON object")
+    return decoded
+
+def metadata_conditions(
+    column: Any,
+    contains: Optional[Dict[str, Any]] = None,
+    keys: Sequence[str] = (),
+) -> List[Any]:
+    """
+    Filter rows whose JSONB column contains a document and has top-level keys
+
+    Containment uses @> and key existence uses the @? jsonpath operator
+    rather than ?, so both are served by a jsonb_path_ops GIN index.
+    """
+    conditions = []
+    if contains:
+        # A cast text literal, so TotalMode.CACHED can render the count statement
+        document = cast(literal(json.dumps(contains, sort_keys=True)), JSONB)
+        conditions.append(column.op("@>")(document))
+    for key in keys:
+        path = '$."' + key.replace("\\", "\\\\").replace('"', '\\"') + '"'
+        conditions.append(column.op("@?")(cast(literal(path), JSONPATH)))
+    return conditions
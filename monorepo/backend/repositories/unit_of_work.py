@@ -0,0 +1,60 @@
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator
+from fastapi import Depends
+import logging
+
+from database import get_async_session, PIN_PRIMARY_KEY
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# Session.info key set while a unit of work is open
+UNIT_OF_WORK_KEY = "unit_of_work"
+
+class UnitOfWork:
+    """
+    Runs several repository operations in a single database transaction
+
+    Repositories resolved for the same request share one session, so any
+    repository call made inside ``transaction()`` only flushes its changes.
+    Everything is committed once when the block exits, or rolled back if it
+    raises.
+
+    Example:
+        async with uow.transaction():
+            claim = await claim_repo.create_claim(claim_data)
+            await inbox_repo.convert_to_claim(inbox_id, claim.id)
+    """
+
+    def __init__(self, session: AsyncSession = Depends(get_async_session)):
+        self.session = session
+
+    @property
+    def active(self) -> bool:
+        """Whether a unit of work is currently open on the session"""
+        return bool(self.session.info.get(UNIT_OF_WORK_KEY))
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncGenerator["UnitOfWork", None]:
+        """
+        Open a transaction spanning every repository call made inside the block
+
+        Nested calls join the outer transaction instead of committing early.
+        """
+        if self.active:
+            yield self
+            return
+
+        info = self.session.info
+        info[UNIT_OF_WORK_KEY] = True
+        # Reads inside the transaction must see its own writes
+        info[PIN_PRIMARY_KEY] = True
+        try:
+            yield self
+            await self.session.commit()
+        except BaseException:
+            logger.warning("Rolling back unit of work")
+            await self.session.rollback()
+            raise
+        finally:
+            info.pop(UNIT_OF_WORK_KEY, None)
@@ -3,7 +3,7 @@ from typing import Dict, List, Any, Optional
 import logging
 import json
 
-from services.gemini import GeminiService, SchemaType
+from services.gemini import GeminiService, SchemaType, get_gemini_service
 from schemas.ai import (
     DocumentAnalysisRequest,
     DocumentAnalysisResponse,
@@ -26,7 +26,8 @@ async def analyze_document(
     file: UploadFile = File(...),
     temperature: float = Form(0.2),
     model: str = Form("gemini-2.5-pro-preview-03-25"),
-    gemini_service: GeminiService = Depends(lambda: GeminiService()),
+    bypass_cache: bool = Form(False),
+    gemini_service: GeminiService = Depends(get_gemini_service),
 ):
     """
     Analyze a document (PDF, image, etc.) using Gemini AI with structured output.
@@ -36,6 +37,7 @@ async def analyze_document(
         file: The document file to analyze
         temperature: Controls randomness (0.0-1.0)
         model: Gemini model to use
+        bypass_cache: Analyze again even if this document was analyzed the same way before
         
     Returns:
         Structured analysis of the document based on the schema
@@ -52,6 +54,7 @@ async def analyze_document(
             schema_type=schema_type,
             model=model,
             temperature=temperature,
+            bypass_cache=bypass_cache,
         )
         
         return DocumentAnalysisResponse(
@@ -79,13 +82,15 @@ async def analyze_document(
 )
 async def extract_policyholder_info(
     file: UploadFile = File(...),
-    gemini_service: GeminiService = Depends(lambda: GeminiService()),
+    bypass_cache: bool = Form(False),
+    gemini_service: GeminiService = Depends(get_gemini_service),
 ):
     """
     Extract policyholder information from a document using Gemini AI.
     
     Args:
         file: The document file containing policyholder information
+        bypass_cache: Analyze again even if this document was analyzed before
         
     Returns:
         Structured policyholder information
@@ -97,7 +102,7 @@ async def extract_policyholder_info(
         await file.seek(0)
         
         # Process the document
-        result = await gemini_service.extract_policyholder_info(file)
+        result = await gemini_service.extract_policyholder_info(file, bypass_cache=bypass_cache)
         
         return DocumentAnalysisResponse(
             success=True,
@@ -123,13 +128,15 @@ async def extract_policyholder_info(
 )
 async def analyze_claim(
     file: UploadFile = File(...),
-    gemini_service: GeminiService = Depends(lambda: GeminiService()),
+    bypass_cache: bool = Form(False),
+    gemini_service: GeminiService = Depends(get_gemini_service),
 ):
     """
     Analyze an insurance claim document using Gemini AI.
     
     Args:
         file: The claim document to analyze
+        bypass_cache: Analyze again even if this document was analyzed before
         
     Returns:
         Structured analysis of the claim
@@ -141,7 +148,7 @@ async def analyze_claim(
         await file.seek(0)
         
         # Process the document
-        result = await gemini_service.analyze_claim(file)
+        result = await gemini_service.analyze_claim(file, bypass_cache=bypass_cache)
         
         return DocumentAnalysisResponse(
             success=True,
@@ -167,13 +174,15 @@ async def analyze_claim(
 )
 async def extract_claim_info(
     file: UploadFile = File(...),
-    gemini_service: GeminiService = Depends(lambda: GeminiService()),
+    bypass_cache: bool = Form(False),
+    gemini_service: GeminiService = Depends(get_gemini_service),
 ):
     """
     Extract information from a claim document using Gemini AI.
     
     Args:
         file: The claim document to analyze
+        bypass_cache: Analyze again even if this document was analyzed before
         
     Returns:
         Structured claim information
@@ -185,7 +194,7 @@ async def extract_claim_info(
         await file.seek(0)
         
         # Process the document
-        result = await gemini_service.extract_claim_info(file)
+        result = await gemini_service.extract_claim_info(file, bypass_cache=bypass_cache)
         
         return DocumentAnalysisResponse(
             success=True,
@@ -211,7 +220,7 @@ async def extract_claim_info(
 )
 async def generate_text(
     request: TextGenerationRequest,
-    gemini_service: GeminiService = Depends(lambda: GeminiService()),
+    gemini_service: GeminiService = Depends(get_gemini_service),
 ):
     """
     Generate text using Gemini AI.
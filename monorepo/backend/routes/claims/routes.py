@@ -1,16 +1,23 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status, Body
+from fastapi import status as http_status
 from typing import List, Optional
 from datetime import date
 import logging
 
 from repositories import ClaimRepository, PolicyHolderRepository
+from repositories.fieldsets import parse_fields, row_dicts
+from repositories.pagination import TotalMode, decode_cursor, next_cursor
+from repositories.search import NameMatch, parse_metadata
 from models import ClaimStatus, EventType
+from routes.responses import json_response
 from schemas.claims import (
     ClaimCreate,
     ClaimRead,
     ClaimUpdate,
     ClaimResponse,
     ClaimListResponse,
+    ClaimListItem,
+    CLAIM_LIST_FIELDS,
     ClaimDetailResponse,
 )
 
@@ -79,29 +86,72 @@ async def list_claims(
     status: Optional[str] = None,
     event_type: Optional[str] = None,
     name_search: Optional[str] = None,
+    name_match: NameMatch = Query(NameMatch.CONTAINS, description="contains, or fuzzy for typo-tolerant ranked matching"),
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
+    created_from: Optional[date] = Query(None, description="Received on or after this date (UTC); scans only the matching months"),
+    created_to: Optional[date] = Query(None, description="Received on or before this date (UTC)"),
+    q: Optional[str] = Query(None, description="Full-text search over damage description and event location"),
+    metadata: Optional[str] = Query(None, description='JSON object claim_metadata must contain, e.g. {"source": "mailgun_webhook"}'),
+    metadata_key: Optional[List[str]] = Query(None, description="Top-level key claim_metadata must have; repeat for several"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Cursor from next_cursor of the previous page"),
+    include_total: TotalMode = Query(TotalMode.EXACT, description="exact, estimate, cached or none"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return per item; defaults to the list view"),
     claim_repo: ClaimRepository = Depends(),
 ):
     """
     List and search claims with various filters.
     
+    Pass the next_cursor of a response as cursor to fetch the following page;
+    skip is ignored in cursor mode and remains for offset-based clients.
+    Clients that do not need an exact total can set include_total to
+    estimate, cached or none; with none, total and pages are null.
+    With q, results are ordered by relevance and highlights holds snippets
+    of the matching text per item id.
+    Items carry the list view fields unless fields names others; only the
+    selected columns are read, as plain rows serialized straight to JSON.
+    
     Args:
         id: Filter by policyholder ID
         policy_id: Filter by policy ID
         status: Filter by claim status
         event_type: Filter by event type
         name_search: Search in first or last name
+        name_match: How name_search matches (contains or fuzzy)
         date_from: Filter events from this date
         date_to: Filter events until this date
+        created_from: Filter items received from this date
+        created_to: Filter items received until this date
+        q: Full-text search query
+        metadata: JSON object claim_metadata must contain
+        metadata_key: Keys claim_metadata must have
         skip: Number of records to skip
         limit: Maximum number of records to return
+        cursor: Opaque cursor for keyset pagination
+        include_total: How to compute the total
+        fields: Comma-separated field names to return
         
     Returns:
         List of matching claims
     """
+    # The status query parameter shadows the status module in this handler
+    try:
+        after = decode_cursor(cursor) if cursor else None
+        selected = parse_fields(fields, ClaimListItem.model_fields, CLAIM_LIST_FIELDS)
+        contains = parse_metadata(metadata) if metadata else None
+    except ValueError as e:
+        raise HTTPException(status_code=http_status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    # Ranked results are ordered by relevance, which a created_at cursor cannot resume
+    ranked = bool(q) or (bool(name_search) and name_match == NameMatch.FUZZY)
+    if after and ranked:
+        raise HTTPException(
+            status_code=http_status.HTTP_400_BAD_REQUEST,
+            detail="cursor pagination is not supported with q or name_match=fuzzy, use skip"
+        )
+    
     try:
         
         # Search claims
@@ -111,29 +161,46 @@ async def list_claims(
             status=status,
             event_type=event_type,
             name_search=name_search,
+            name_match=name_match,
             date_from=date_from,
             date_to=date_to,
+            created_from=created_from,
+            created_to=created_to,
+            q=q,
+            metadata=contains,
+            metadata_keys=metadata_key or (),
             skip=skip,
-            limit=limit
+            limit=limit,
+            after=after,
+            include_total=include_total,
+            fields=selected,
         )
         
+        # Highlight the matching text on this page only
+        highlights = None
+        if q:
+            highlights = await claim_repo.get_highlights([item.id for item in claims], q)
+        
         # Calculate pagination
-        pages = (total + limit - 1) // limit if limit > 0 else 1
+        pages = (total + limit - 1) // limit if total is not None else None
         page = (skip // limit) + 1 if limit > 0 else 1
         
-        return ClaimListResponse(
+        # Plain rows go straight to JSON, without a second validation pass
+        return json_response(dict(
             success=True,
             message=f"Found {len(claims)} claims",
-            data=claims,
+            data=row_dicts(claims, selected),
             count=len(claims),
             total=total,
             page=page,
-            pages=pages
-        )
+            pages=pages,
+            next_cursor=None if ranked else next_cursor(claims, limit),
+            highlights=highlights,
+        ))
     except Exception as e:
         logger.error(f"Error searching claims: {str(e)}")
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error searching claims: {str(e)}"
         )
 
@@ -200,21 +267,12 @@ async def update_claim(
         The updated claim
     """
     try:
-        
-        # Get existing claim
-        existing_claim = await claim_repo.get_by_claim_id(claim_id)
-        if not existing_claim:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Claim with ID {claim_id} not found"
-            )
-        
-        # Update claim
-        updated_claim = await claim_repo.update(existing_claim.id, claim)
+        # Update claim in a single statement
+        updated_claim = await claim_repo.update_by_claim_id(claim_id, claim)
         if not updated_claim:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Failed to update claim with ID {claim_id}"
+                detail=f"Claim with ID {claim_id} not found"
             )
         
         return ClaimDetailResponse(
@@ -324,7 +382,7 @@ async def associate_claim(
         # Associate claim
         updated_claim = await claim_repo.associate_with_policyholder(
             claim_id=claim_id,
-            id=id,
+            policyholder_id=id,
             policy_id=policy_id,
             matched_by=matched_by
         )
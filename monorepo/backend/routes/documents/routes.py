@@ -139,18 +139,13 @@ async def list_documents(
         List of documents
     """
     try:
-        documents = await document_repo.list_documents(
+        documents, total = await document_repo.list_documents_with_total(
             skip=skip,
             limit=limit,
             claim_id=claim_id,
             inbox_id=inbox_id
         )
         
-        total = await document_repo.count_documents(
-            claim_id=claim_id,
-            inbox_id=inbox_id
-        )
-        
         page = (skip // limit) + 1 if limit > 0 else 1
         
         return DocumentListResponse(
@@ -1,6 +1,14 @@
 from fastapi import APIRouter
 import logging
 
+from database import db_manager
+from repositories.autoupload_email import alias_index
+from repositories.base import count_cache
+from repositories.extraction import extraction_store
+from repositories.inbox import identifier_cache
+from repositories.invalidation import invalidation_bus
+from repositories.policyholder import policyholder_cache
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/health", tags=["health"])
@@ -18,4 +26,26 @@ def hello():
     Simple hello endpoint that logs a message.
     """
     logger.info("hello")
-    return {"message": "Hello from FastAPI!"}
\ No newline at end of file
+    return {"message": "Hello from FastAPI!"}
+
+@router.get("/db-pool")
+def db_pool_stats():
+    """
+    Live connection pool statistics for the worker that serves the request.
+    """
+    return db_manager.pool_stats()
+
+
+@router.get("/caches")
+def cache_stats():
+    """
+    Hit/miss statistics for the in-process caches of the worker that serves the request.
+    """
+    return {
+        "invalidation_listening": invalidation_bus.listening,
+        "policyholders": policyholder_cache.stats(),
+        "alias_index": alias_index.stats(),
+        "inbox_identifiers": identifier_cache.stats(),
+        "list_totals": count_cache.stats(),
+        "extractions": extraction_store.stats(),
+    }
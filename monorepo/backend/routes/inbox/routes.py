@@ -3,14 +3,21 @@ from typing import List, Optional
 from datetime import date
 import logging
 
-from repositories import InboxRepository, ClaimRepository, DocumentRepository
+from repositories import InboxRepository, InboxArchiveRepository, ClaimRepository, DocumentRepository, UnitOfWork
+from repositories.inbox import StatsMode
+from repositories.fieldsets import parse_fields, row_dicts
+from repositories.pagination import TotalMode, decode_cursor, next_cursor
+from repositories.search import NameMatch, parse_metadata
 from models import InboxStatus
+from routes.responses import json_response
 from schemas.inbox import (
     InboxCreate,
     InboxRead,
     InboxUpdate,
     InboxResponse,
     InboxListResponse,
+    InboxListItem,
+    INBOX_LIST_FIELDS,
     InboxDetailResponse,
     InboxStatsResponse,
 )
@@ -69,17 +76,35 @@ async def list_inbox_items(
     claim_status: Optional[str] = None,
     event_type: Optional[str] = None,
     name_search: Optional[str] = None,
+    name_match: NameMatch = Query(NameMatch.CONTAINS, description="contains, or fuzzy for typo-tolerant ranked matching"),
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
+    created_from: Optional[date] = Query(None, description="Received on or after this date (UTC); scans only the matching months"),
+    created_to: Optional[date] = Query(None, description="Received on or before this date (UTC)"),
     assigned_to: Optional[str] = None,
     priority: Optional[str] = None,
+    q: Optional[str] = Query(None, description="Full-text search over subject, damage description and email body"),
+    metadata: Optional[str] = Query(None, description='JSON object claim_metadata must contain, e.g. {"source": "mailgun_webhook"}'),
+    metadata_key: Optional[List[str]] = Query(None, description="Top-level key claim_metadata must have; repeat for several"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Cursor from next_cursor of the previous page"),
+    include_total: TotalMode = Query(TotalMode.EXACT, description="exact, estimate, cached or none"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return per item; defaults to the list view"),
     inbox_repo: InboxRepository = Depends(),
 ):
     """
     List and search inbox items with various filters.
     
+    Pass the next_cursor of a response as cursor to fetch the following page;
+    skip is ignored in cursor mode and remains for offset-based clients.
+    Clients that do not need an exact total can set include_total to
+    estimate, cached or none; with none, total and pages are null.
+    With q, results are ordered by relevance and highlights holds snippets
+    of the matching text per item id.
+    Items carry the list view fields unless fields names others; only the
+    selected columns are read, as plain rows serialized straight to JSON.
+    
     Args:
         policyholder_id: Filter by policyholder ID
         policy_id: Filter by policy ID
@@ -87,16 +112,40 @@ async def list_inbox_items(
         claim_status: Filter by claim status
         event_type: Filter by event type
         name_search: Search in first or last name
+        name_match: How name_search matches (contains or fuzzy)
         date_from: Filter events from this date
         date_to: Filter events until this date
+        created_from: Filter items received from this date
+        created_to: Filter items received until this date
         assigned_to: Filter by assigned user
         priority: Filter by priority
+        q: Full-text search query
+        metadata: JSON object claim_metadata must contain
+        metadata_key: Keys claim_metadata must have
         skip: Number of records to skip
         limit: Maximum number of records to return
+        cursor: Opaque cursor for keyset pagination
+        include_total: How to compute the total
+        fields: Comma-separated field names to return
         
     Returns:
         List of matching inbox items
     """
+    try:
+        after = decode_cursor(cursor) if cursor else None
+        selected = parse_fields(fields, InboxListItem.model_fields, INBOX_LIST_FIELDS)
+        contains = parse_metadata(metadata) if metadata else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    # Ranked results are ordered by relevance, which a created_at cursor cannot resume
+    ranked = bool(q) or (bool(name_search) and name_match == NameMatch.FUZZY)
+    if after and ranked:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="cursor pagination is not supported with q or name_match=fuzzy, use skip"
+        )
+    
     try:
         # Search inbox items
         inbox_items, total = await inbox_repo.search_inbox_items(
@@ -106,27 +155,44 @@ async def list_inbox_items(
             claim_status=claim_status,
             event_type=event_type,
             name_search=name_search,
+            name_match=name_match,
             date_from=date_from,
             date_to=date_to,
+            created_from=created_from,
+            created_to=created_to,
             assigned_to=assigned_to,
             priority=priority,
+            q=q,
+            metadata=contains,
+            metadata_keys=metadata_key or (),
             skip=skip,
-            limit=limit
+            limit=limit,
+            after=after,
+            include_total=include_total,
+            fields=selected,
         )
         
+        # Highlight the matching text on this page only
+        highlights = None
+        if q:
+            highlights = await inbox_repo.get_highlights([item.id for item in inbox_items], q)
+        
         # Calculate pagination
-        pages = (total + limit - 1) // limit if limit > 0 else 1
+        pages = (total + limit - 1) // limit if total is not None else None
         page = (skip // limit) + 1 if limit > 0 else 1
         
-        return InboxListResponse(
+        # Plain rows go straight to JSON, without a second validation pass
+        return json_response(dict(
             success=True,
             message=f"Found {len(inbox_items)} inbox items",
-            data=inbox_items,
+            data=row_dicts(inbox_items, selected),
             count=len(inbox_items),
             total=total,
             page=page,
-            pages=pages
-        )
+            pages=pages,
+            next_cursor=None if ranked else next_cursor(inbox_items, limit),
+            highlights=highlights,
+        ))
     except Exception as e:
         logger.error(f"Error searching inbox items: {str(e)}")
         raise HTTPException(
@@ -140,21 +206,30 @@ async def list_inbox_items(
     summary="Get inbox statistics"
 )
 async def get_inbox_stats(
+    mode: StatsMode = Query(StatsMode.COUNTERS, description="counters (precomputed) or live (GROUP BY)"),
     inbox_repo: InboxRepository = Depends(),
 ):
     """
     Get statistics about inbox items.
     
+    Args:
+        mode: Read the maintained counters, or count the inbox live
+    
     Returns:
-        Statistics about inbox items by status
+        Statistics about inbox items by status, with breakdowns by priority
+        and assignee
     """
     try:
-        stats = await inbox_repo.get_inbox_stats()
+        stats = await inbox_repo.get_inbox_stats(mode)
+        if not stats:
+            raise Exception("Failed to compute inbox statistics")
         
         return InboxStatsResponse(
             success=True,
             message="Inbox statistics retrieved successfully",
-            data=stats
+            data={**stats["status"], "total": stats["total"]},
+            by_priority=stats["priority"],
+            by_assignee=stats["assignee"],
         )
     except Exception as e:
         logger.error(f"Error getting inbox stats: {str(e)}")
@@ -171,10 +246,13 @@ async def get_inbox_stats(
 async def get_inbox_item(
     inbox_id: str,
     inbox_repo: InboxRepository = Depends(),
+    archive_repo: InboxArchiveRepository = Depends(),
 ):
     """
     Get details for a specific inbox item.
     
+    Items moved to the archive are returned as they were when archived.
+    
     Args:
         inbox_id: The inbox item ID
         
@@ -182,11 +260,9 @@ async def get_inbox_item(
         The inbox item details
     """
     try:
-        # Try to get by claim_id first, then by id
-        inbox_item = await inbox_repo.get_by_claim_id(inbox_id)
+        inbox_item = await inbox_repo.get_by_identifier(inbox_id)
         if not inbox_item:
-            inbox_item = await inbox_repo.get_by_id(inbox_id)
-        
+            inbox_item = await archive_repo.get_by_identifier(inbox_id)
         if not inbox_item:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -228,23 +304,12 @@ async def update_inbox_item(
         The updated inbox item
     """
     try:
-        # Get existing inbox item
-        existing_item = await inbox_repo.get_by_claim_id(inbox_id)
-        if not existing_item:
-            existing_item = await inbox_repo.get_by_id(inbox_id)
-        
-        if not existing_item:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Inbox item with ID {inbox_id} not found"
-            )
-        
-        # Update inbox item
-        updated_item = await inbox_repo.update(existing_item.id, inbox_item)
+        # Update inbox item in a single statement
+        updated_item = await inbox_repo.update_inbox_item(inbox_id, inbox_item)
         if not updated_item:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Failed to update inbox item with ID {inbox_id}"
+                detail=f"Inbox item with ID {inbox_id} not found"
             )
         
         return InboxDetailResponse(
@@ -462,6 +527,7 @@ async def convert_inbox_to_claim(
     inbox_repo: InboxRepository = Depends(),
     claim_repo: ClaimRepository = Depends(),
     document_repo: DocumentRepository = Depends(),
+    uow: UnitOfWork = Depends(),
 ):
     """
     Convert an inbox item to a claim and transfer all associated documents.
@@ -472,6 +538,9 @@ async def convert_inbox_to_claim(
     4. Mark the inbox item as converted
     5. Delete the inbox item (as requested)
     
+    Steps 2-5 run in a single transaction, so a failure part way through
+    leaves the inbox item and its documents untouched.
+    
     Args:
         inbox_id: The inbox item ID to convert
         
@@ -480,7 +549,7 @@ async def convert_inbox_to_claim(
     """
     try:
         # Get the inbox item
-        inbox_item = await inbox_repo.get_by_inbox_id(inbox_id)
+        inbox_item = await inbox_repo.get_by_identifier(inbox_id)
         if not inbox_item:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -513,23 +582,29 @@ async def convert_inbox_to_claim(
             "photos": []
         }
         
-        # Create the new claim
-        new_claim = await claim_repo.create_claim(claim_data)
-        
-        # Transfer documents from inbox to claim
-        transferred_documents = await document_repo.transfer_documents_to_claim(
-            inbox_item.id,  # Use claim_id as the inbox identifier
-            new_claim.id
-        )
-        
-        # Mark inbox as converted
-        updated_inbox = await inbox_repo.convert_to_claim(
-            inbox_item.id,
-            new_claim.id
-        )
-        
-        # Delete the inbox item as requested
-        await inbox_repo.delete(inbox_item.id)
+        async with uow.transaction():
+            # Create the new claim
+            new_claim = await claim_repo.create_claim(claim_data)
+            
+            # Transfer documents from inbox to claim
+            transferred_documents = await document_repo.transfer_documents_to_claim(
+                inbox_item.id,  # Use claim_id as the inbox identifier
+                new_claim.id
+            )
+            
+            # Mark inbox as converted
+            updated_inbox = await inbox_repo.convert_to_claim(
+                inbox_item.id,
+                new_claim.id
+            )
+            if not updated_inbox:
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Failed to mark inbox item {inbox_id} as converted"
+                )
+            
+            # Delete the inbox item as requested
+            await inbox_repo.delete(inbox_item.id)
         
         logger.info(f"Successfully converted inbox item {inbox_id} to claim {new_claim.id} with {len(transferred_documents)} documents")
         
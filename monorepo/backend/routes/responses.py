@@ -0,0 +1,14 @@
+from typing import Any
+
+from fastapi import Response
+from pydantic_core import to_json
+
+def json_response(content: Any, status_code: int = 200) -> Response:
+    """
+    Serialize plain dicts and lists straight to a JSON response
+
+    Returning a Response skips response_model validation, so routes use this
+    only for content built from rows that already match the response model;
+    the model still documents the shape in OpenAPI.
+    """
+    return Response(content=to_json(content), status_code=status_code, media_type="application/json")
@@ -8,7 +8,7 @@ from datetime import date, datetime
 from schemas.webhooks import MailgunWebhook, WebhookResponse
 from schemas.inbox.schemas import InboxCreate
 from schemas.documents.schemas import DocumentCreate
-from services import GeminiService
+from services import GeminiService, get_gemini_service
 from services.supabase import SupabaseService
 from repositories.inbox import InboxRepository
 from repositories.document import DocumentRepository
@@ -27,7 +27,7 @@ router = APIRouter(prefix="/webhooks", tags=["webhooks"])
 async def mailgun_webhook(
     request: Request,
     auth_token: str = Query(..., description="Authentication token for Mailgun webhooks"),
-    gemini_service: GeminiService = Depends(lambda: GeminiService()),
+    gemini_service: GeminiService = Depends(get_gemini_service),
     supabase_service: SupabaseService = Depends(lambda: SupabaseService()),
     inbox_repo: InboxRepository = Depends(),
     document_repo: DocumentRepository = Depends(),
@@ -66,6 +66,7 @@ async def mailgun_webhook(
         attachment_urls = []
         attachment_analysis = []
         supabase_urls = []
+        documents_data = []
         
         # Create inbox item with dummy data
         inbox_data = InboxCreate(
@@ -123,16 +124,13 @@ async def mailgun_webhook(
                         supabase_urls.append(supabase_url)
                         logger.info(f"Uploaded to Supabase: {supabase_url}")
                         
-                        # Create document entry
-                        document_data = DocumentCreate(
+                        # Queue document entry, created with the others below
+                        documents_data.append(DocumentCreate(
                             file_name=attachment_name,
                             file_type=attachment.content_type,
                             file_url=supabase_url,
                             inbox_id=inbox_item.id
-                        )
-                        
-                        document = await document_repo.create_document(document_data)
-                        logger.info(f"Created document entry with ID: {document.id}")
+                        ))
                 except Exception as e:
                     logger.error(f"Error uploading file to Supabase: {str(e)}")
 
@@ -152,6 +150,14 @@ async def mailgun_webhook(
                 except Exception as e:
                     logger.error(f"Error analyzing attachment {attachment_name}: {str(e)}")
             
+            # Create all document entries in a single insert
+            if documents_data:
+                try:
+                    documents = await document_repo.create_documents(documents_data)
+                    logger.info(f"Created {len(documents)} document entries: {', '.join(document.id for document in documents)}")
+                except Exception as e:
+                    logger.error(f"Error creating document entries: {str(e)}")
+            
             # Update inbox item with photo URLs if any were uploaded
             if supabase_urls:
                 await inbox_repo.update(inbox_item.id, {"photos": supabase_urls})
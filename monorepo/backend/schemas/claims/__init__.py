@@ -2,6 +2,8 @@ from .schemas import (
     ClaimBase,
     ClaimCreate,
     ClaimRead,
+    ClaimListItem,
+    CLAIM_LIST_FIELDS,
     ClaimUpdate,
     ClaimResponse,
     ClaimListResponse,
@@ -12,6 +14,8 @@ __all__ = [
     "ClaimBase",
     "ClaimCreate",
     "ClaimRead",
+    "ClaimListItem",
+    "CLAIM_LIST_FIELDS",
     "ClaimUpdate",
     "ClaimResponse",
     "ClaimListResponse",
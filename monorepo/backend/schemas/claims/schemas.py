@@ -56,6 +56,9 @@ class ClaimRead(ClaimBase):
     eligibility_validated: Optional[bool] = None
     matched_by: Optional[str] = None
     
+    # Number of linked documents
+    document_count: int = 0
+    
     # Metadata
     claim_metadata: Optional[Dict[str, Any]] = None
     
@@ -96,6 +99,60 @@ class ClaimUpdate(SQLModel):
     # Metadata
     claim_metadata: Optional[Dict[str, Any]] = None
 
+# Fields returned by list endpoints unless fields= asks for others. Free text,
+# JSON metadata and enrichment details are left to the detail endpoint.
+CLAIM_LIST_FIELDS = (
+    "id", "claim_id", "first_name", "last_name", "event_type", "event_date",
+    "event_location", "contact_email", "policyholder_id", "policy_id",
+    "claim_status", "document_count", "created_at", "updated_at",
+)
+
+class ClaimListItem(SQLModel):
+    """
+    Schema for a claim in list responses
+    
+    Any ClaimRead field may be selected; only the selected ones are returned.
+    """
+    id: str
+    claim_id: Optional[str] = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    date_of_birth: Optional[date] = None
+    event_type: Optional[str] = None
+    event_date: Optional[date] = None
+    event_location: Optional[str] = None
+    damage_description: Optional[str] = None
+    contact_email: Optional[str] = None
+    photos: Optional[List[str]] = None
+    vehicle_vin: Optional[str] = None
+    estimated_damage_amount: Optional[float] = None
+    ingest_method: Optional[str] = None
+    
+    # Relationships
+    policyholder_id: Optional[str] = None
+    policy_id: Optional[str] = None
+    
+    # Enriched or derived fields
+    coverage_type: Optional[str] = None
+    policy_effective_date: Optional[date] = None
+    policy_expiry_date: Optional[date] = None
+    deductible: Optional[float] = None
+    coverage_limit: Optional[float] = None
+    claim_status: Optional[str] = None
+    initial_payout_estimate: Optional[float] = None
+    eligibility_validated: Optional[bool] = None
+    matched_by: Optional[str] = None
+    
+    # Number of linked documents
+    document_count: Optional[int] = None
+    
+    # Metadata
+    claim_metadata: Optional[Dict[str, Any]] = None
+    
+    # Timestamps
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
 class ClaimResponse(SQLModel):
     """Base response schema for claim operations"""
     success: bool
@@ -103,11 +160,13 @@ class ClaimResponse(SQLModel):
 
 class ClaimListResponse(ClaimResponse):
     """Response schema for listing claims"""
-    data: List[ClaimRead]
+    data: List[ClaimListItem]
     count: int
-    total: int
+    total: Optional[int] = None
     page: int = 1
-    pages: int = 1
+    pages: Optional[int] = 1
+    next_cursor: Optional[str] = None
+    highlights: Optional[Dict[str, Dict[str, str]]] = None
 
 class ClaimDetailResponse(ClaimResponse):
     """Response schema for claim details"""
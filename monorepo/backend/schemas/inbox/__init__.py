@@ -2,6 +2,8 @@ from .schemas import (
     InboxBase,
     InboxCreate,
     InboxRead,
+    InboxListItem,
+    INBOX_LIST_FIELDS,
     InboxUpdate,
     InboxResponse,
     InboxListResponse,
@@ -13,6 +15,8 @@ __all__ = [
     "InboxBase",
     "InboxCreate",
     "InboxRead",
+    "InboxListItem",
+    "INBOX_LIST_FIELDS",
     "InboxUpdate",
     "InboxResponse",
     "InboxListResponse",
@@ -77,6 +77,9 @@ class InboxRead(InboxBase):
     email_subject: Optional[str] = None
     email_sender: Optional[str] = None
     
+    # Number of linked documents
+    document_count: int = 0
+    
     # Metadata
     claim_metadata: Optional[Dict[str, Any]] = None
     
@@ -130,6 +133,75 @@ class InboxUpdate(SQLModel):
     # Metadata
     claim_metadata: Optional[Dict[str, Any]] = None
 
+# Fields returned by list endpoints unless fields= asks for others. Free text,
+# JSON metadata and enrichment details are left to the detail endpoint.
+INBOX_LIST_FIELDS = (
+    "id", "claim_id", "first_name", "last_name", "event_type", "event_date",
+    "event_location", "contact_email", "policyholder_id", "policy_id",
+    "claim_status", "inbox_status", "converted_claim_id", "assigned_to",
+    "priority", "email_subject", "email_sender", "document_count",
+    "created_at", "updated_at", "processed_at",
+)
+
+class InboxListItem(SQLModel):
+    """
+    Schema for an inbox item in list responses
+    
+    Any InboxRead field may be selected; only the selected ones are returned.
+    """
+    id: str
+    claim_id: Optional[str] = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    date_of_birth: Optional[date] = None
+    event_type: Optional[str] = None
+    event_date: Optional[date] = None
+    event_location: Optional[str] = None
+    damage_description: Optional[str] = None
+    contact_email: Optional[str] = None
+    photos: Optional[List[str]] = None
+    vehicle_vin: Optional[str] = None
+    estimated_damage_amount: Optional[float] = None
+    ingest_method: Optional[str] = None
+    
+    # Relationships
+    policyholder_id: Optional[str] = None
+    policy_id: Optional[str] = None
+    
+    # Enriched or derived fields
+    coverage_type: Optional[str] = None
+    policy_effective_date: Optional[date] = None
+    policy_expiry_date: Optional[date] = None
+    deductible: Optional[float] = None
+    coverage_limit: Optional[float] = None
+    claim_status: Optional[str] = None
+    initial_payout_estimate: Optional[float] = None
+    eligibility_validated: Optional[bool] = None
+    matched_by: Optional[str] = None
+    
+    # Inbox-specific fields
+    inbox_status: Optional[str] = None
+    converted_claim_id: Optional[str] = None
+    rejection_reason: Optional[str] = None
+    assigned_to: Optional[str] = None
+    priority: Optional[str] = None
+    
+    # Email-specific fields
+    raw_email_content: Optional[str] = None
+    email_subject: Optional[str] = None
+    email_sender: Optional[str] = None
+    
+    # Number of linked documents
+    document_count: Optional[int] = None
+    
+    # Metadata
+    claim_metadata: Optional[Dict[str, Any]] = None
+    
+    # Timestamps
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    processed_at: Optional[datetime] = None
+
 class InboxResponse(SQLModel):
     """Base response schema for inbox operations"""
     success: bool
@@ -137,11 +209,13 @@ class InboxResponse(SQLModel):
 
 class InboxListResponse(InboxResponse):
     """Response schema for listing inbox items"""
-    data: List[InboxRead]
+    data: List[InboxListItem]
     count: int
-    total: int
+    total: Optional[int] = None
     page: int = 1
-    pages: int = 1
+    pages: Optional[int] = 1
+    next_cursor: Optional[str] = None
+    highlights: Optional[Dict[str, Dict[str, str]]] = None
 
 class InboxDetailResponse(InboxResponse):
     """Response schema for inbox item details"""
@@ -149,4 +223,6 @@ class InboxDetailResponse(InboxResponse):
 
 class InboxStatsResponse(InboxResponse):
     """Response schema for inbox statistics"""
-    data: Dict[str, int]
\ No newline at end of file
+    data: Dict[str, int]
+    by_priority: Dict[str, int] = {}
+    by_assignee: Dict[str, int] = {}
\ No newline at end of file
@@ -1,3 +1,3 @@
-from .gemini import GeminiService
+from .gemini import GeminiService, get_gemini_service
 
-__all__ = ["GeminiService"]
\ No newline at end of file
+__all__ = ["GeminiService", "get_gemini_service"]
\ No newline at end of file
@@ -1,9 +1,9 @@
 import os
 import json
 import base64
+import hashlib
 import logging
 from typing import List, Dict, Any, Optional, Union, Literal, TypeVar, Callable
-from enum import Enum
 from pathlib import Path
 import asyncio
 
@@ -17,40 +17,36 @@ from google.auth import credentials
 from google.oauth2 import service_account
 from pydantic import BaseModel
 
+from .schema_registry import (
+    DEFAULT_MAX_OUTPUT_TOKENS,
+    DEFAULT_TEMPERATURE,
+    SchemaType,
+    schema_registry,
+)
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
 
-# Schema directory
-SCHEMA_DIR = Path("/Users/vikramkhandelwal/corgi-hack/monorepo/backend/schemas/gemini_models")
-
 # Type definitions
 T = TypeVar('T')
 FileType = Union[str, bytes, UploadFile, Path]
 GenAiModel = Literal["gemini-1.5-pro", "gemini-1.5-flash", "gemini-2.5-pro-preview-03-25"]
 
-# Schema enum for model schemas
-class SchemaType(str, Enum):
-    # Policyholder schemas
-    POLICYHOLDER_EXTRACT = "policyholders/extract_info"
-    POLICYHOLDER_CLAIM = "policyholders/claim_analysis"
-    
-    # Claim schemas
-    CLAIM_EXTRACT = "claims/extract_info"
-    
-    @classmethod
-    def get_schema_path(cls, schema_type: "SchemaType") -> Path:
-        """Get the full path to a schema file"""
-        return SCHEMA_DIR / f"{schema_type.value}.json"
+# Gemini calls a worker makes at once; further calls wait for a free slot
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "8"))
 
 class GeminiService:
     """Service for interacting with Google's Gemini generative AI model via Vertex AI"""
     
-    def __init__(self):
+    def __init__(self, max_concurrency: int = GEMINI_MAX_CONCURRENCY):
         """Initialize the Gemini service with API key and Vertex AI configuration"""
         self.api_key = os.getenv("GEMINI_API_KEY")
+        self.max_concurrency = max_concurrency
+        # Created on first call, inside the event loop that uses it
+        self._slots: Optional[asyncio.Semaphore] = None
         
         # Default model settings
         self.default_model = "gemini-2.5-pro-preview-03-25"
@@ -89,15 +85,57 @@ class GeminiService:
             
             # Otherwise use API key
             else:
-                # Configure the Gemini API with API key
-                genai.configure(api_key=self.api_key)
-                self.client = genai.Client()
+                self.client = genai.Client(api_key=self.api_key)
                 logger.info("Initialized Gemini with API key")
                 
         except Exception as e:
             logger.error(f"Failed to initialize Gemini client: {str(e)}")
             raise
     
+    async def close(self) -> None:
+        """Release the client's pooled HTTP connections"""
+        # Calls go through client.aio, whose connections only aclose releases;
+        # older SDK clients have nothing to close
+        aclose = getattr(self.client.aio, "aclose", None)
+        if aclose is not None:
+            await aclose()
+        close = getattr(self.client, "close", None)
+        if close is not None:
+            close()
+    
+    async def _generate_content(
+        self,
+        model: str,
+        contents: List[types.Content],
+        config: types.GenerateContentConfig,
+    ) -> types.GenerateContentResponse:
+        """
+        Call Gemini through the async client, waiting for a free slot first
+        
+        The async client keeps the event loop serving other requests while
+        a call is in flight, and the semaphore caps how many calls this
+        worker has open, so a slow model queues extraction work instead of
+        piling up connections and memory.
+        
+        Args:
+            model: Which Gemini model to use
+            contents: The request contents
+            config: The generation config
+            
+        Returns:
+            The Gemini response
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        if self._slots.locked():
+            logger.info(f"Waiting for one of {self.max_concurrency} Gemini slots")
+        async with self._slots:
+            return await self.client.aio.models.generate_content(
+                model=model,
+                contents=contents,
+                config=config,
+            )
+    
     async def _process_file(self, file: FileType) -> tuple[bytes, str]:
         """
         Process a file into base64 encoded bytes and determine MIME type
@@ -118,8 +156,7 @@ class GeminiService:
                 if not file_path.exists():
                     raise ValueError(f"File not found: {file}")
                 
-                with open(file_path, "rb") as f:
-                    file_bytes = f.read()
+                file_bytes = await asyncio.to_thread(file_path.read_bytes)
                 
                 # Guess MIME type from extension
                 if file_path.suffix.lower() == '.pdf':
@@ -138,8 +175,7 @@ class GeminiService:
                 if not file.exists():
                     raise ValueError(f"File not found: {file}")
                 
-                with open(file, "rb") as f:
-                    file_bytes = f.read()
+                file_bytes = await asyncio.to_thread(file.read_bytes)
                 
                 # Guess MIME type from extension
                 if file.suffix.lower() == '.pdf':
@@ -161,107 +197,137 @@ class GeminiService:
             logger.error(f"Error processing file: {str(e)}")
             raise
     
-    def _load_schema(self, schema_type: SchemaType) -> Dict[str, Any]:
-        """
-        Load a schema from the schemas directory
-        
-        Args:
-            schema_type: The schema type to load
-            
-        Returns:
-            Dict containing the schema
-        """
-        schema_path = SchemaType.get_schema_path(schema_type)
-        
-        try:
-            with open(schema_path, 'r') as f:
-                schema = json.load(f)
-            return schema
-        except Exception as e:
-            logger.error(f"Error loading schema {schema_type}: {str(e)}")
-            raise ValueError(f"Failed to load schema {schema_type}: {str(e)}")
-    
     async def process_document(
         self, 
         file: FileType,
         schema_type: SchemaType,
         model: GenAiModel = "gemini-2.5-pro-preview-03-25",
-        temperature: float = 0.2,
-        max_output_tokens: int = 65535,
+        temperature: float = DEFAULT_TEMPERATURE,
+        max_output_tokens: int = DEFAULT_MAX_OUTPUT_TOKENS,
+        bypass_cache: bool = False,
     ) -> Dict[str, Any]:
         """
         Process a document with Gemini using a specific schema
         
+        Results are stored by document content, schema version, model and
+        temperature (see repositories.extraction), so a document analysed
+        the same way again is answered without calling Gemini.
+        
         Args:
             file: The file to process
             schema_type: The schema to use for structuring the response
             model: Which Gemini model to use
             temperature: Controls randomness of output (0.0-1.0)
             max_output_tokens: Maximum number of tokens in the response
+            bypass_cache: Call Gemini even if a result is stored, and store the new one
             
         Returns:
             Dictionary containing the structured response
         """
+        # Imported here since repositories import the API schemas, which import this module
+        from repositories.extraction import extraction_key, extraction_store
+        
         try:
             # Process file to base64
             base64_bytes, mime_type = await self._process_file(file)
-            
-            # Load the schema
-            schema = self._load_schema(schema_type)
-            
-            # Create file part
-            file_part = types.Part.from_bytes(
-                data=base64.b64decode(base64_bytes),
-                mime_type=mime_type,
-            )
-            
-            # Create instruction part based on schema type
-            instructions = f"Extract information from this document according to the provided schema."
-            instruction_part = types.Part.from_text(text=instructions)
-            
-            # Create content
-            contents = [
-                types.Content(
-                    role="user",
-                    parts=[file_part, instruction_part]
-                )
-            ]
-            
-            # Configure generation
-            generate_content_config = types.GenerateContentConfig(
-                temperature=temperature,
-                top_p=0.95,
-                max_output_tokens=max_output_tokens,
-                response_mime_type="application/json",
-                response_schema=schema,
+            file_bytes = base64.b64decode(base64_bytes)
+            
+            # Preloaded schema and its shared generation config
+            schema = schema_registry.get(schema_type)
+            config = schema_registry.config(schema_type, temperature, max_output_tokens)
+            
+            async def extract() -> Dict[str, Any]:
+                return await self._extract_document(file_bytes, mime_type, schema_type, model, config)
+            
+            if not extraction_store.active:
+                return await extract()
+            
+            content_hash = await asyncio.to_thread(lambda: hashlib.sha256(file_bytes).hexdigest())
+            key = extraction_key(
+                content_hash,
+                mime_type,
+                schema_type.value,
+                model,
+                temperature,
+                max_output_tokens,
+                schema.version,
             )
-            
-            # Process with Gemini
-            logger.info(f"Processing document with schema: {schema_type}")
-            response = self.client.models.generate_content(
-                model=model,
-                contents=contents,
-                config=generate_content_config,
+            return await extraction_store.get_or_compute(
+                key,
+                schema_type.value,
+                model,
+                extract,
+                bypass=bypass_cache,
+                # Unparsed responses are not worth keeping
+                cacheable=lambda result: "raw_response" not in result,
             )
-            
-            # Parse response
-            try:
-                result = json.loads(response.text)
-                return result
-            except json.JSONDecodeError:
-                logger.error(f"Failed to parse JSON response: {response.text[:500]}...")
-                return {"raw_response": response.text}
                 
         except Exception as e:
             logger.error(f"Error processing document: {str(e)}")
             raise
     
-    async def extract_policyholder_info(self, file: FileType) -> Dict[str, Any]:
+    async def _extract_document(
+        self,
+        file_bytes: bytes,
+        mime_type: str,
+        schema_type: SchemaType,
+        model: GenAiModel,
+        config: types.GenerateContentConfig,
+    ) -> Dict[str, Any]:
+        """
+        Ask Gemini to extract a document according to a schema
+        
+        Args:
+            file_bytes: The document's content
+            mime_type: The document's MIME type
+            schema_type: The schema to use for structuring the response
+            model: Which Gemini model to use
+            config: The schema's generation config
+            
+        Returns:
+            Dictionary containing the structured response
+        """
+        # Create file part
+        file_part = types.Part.from_bytes(
+            data=file_bytes,
+            mime_type=mime_type,
+        )
+        
+        # Create instruction part based on schema type
+        instructions = f"Extract information from this document according to the provided schema."
+        instruction_part = types.Part.from_text(text=instructions)
+        
+        # Create content
+        contents = [
+            types.Content(
+                role="user",
+                parts=[file_part, instruction_part]
+            )
+        ]
+        
+        # Process with Gemini
+        logger.info(f"Processing document with schema: {schema_type}")
+        response = await self._generate_content(
+            model=model,
+            contents=contents,
+            config=config,
+        )
+        
+        # Parse response
+        try:
+            result = json.loads(response.text)
+            return result
+        except json.JSONDecodeError:
+            logger.error(f"Failed to parse JSON response: {response.text[:500]}...")
+            return {"raw_response": response.text}
+    
+    async def extract_policyholder_info(self, file: FileType, bypass_cache: bool = False) -> Dict[str, Any]:
         """
         Extract policyholder information from a document
         
         Args:
             file: The document containing policyholder information
+            bypass_cache: Call Gemini even if a result is stored
             
         Returns:
             Extracted policyholder information in structured format
@@ -270,14 +336,16 @@ class GeminiService:
             file=file,
             schema_type=SchemaType.POLICYHOLDER_EXTRACT,
             temperature=0.2,
+            bypass_cache=bypass_cache,
         )
     
-    async def analyze_claim(self, file: FileType) -> Dict[str, Any]:
+    async def analyze_claim(self, file: FileType, bypass_cache: bool = False) -> Dict[str, Any]:
         """
         Analyze an insurance claim document
         
         Args:
             file: The claim document to analyze
+            bypass_cache: Call Gemini even if a result is stored
             
         Returns:
             Structured analysis of the claim
@@ -286,14 +354,16 @@ class GeminiService:
             file=file,
             schema_type=SchemaType.POLICYHOLDER_CLAIM,
             temperature=0.2,
+            bypass_cache=bypass_cache,
         )
     
-    async def extract_claim_info(self, file: FileType) -> Dict[str, Any]:
+    async def extract_claim_info(self, file: FileType, bypass_cache: bool = False) -> Dict[str, Any]:
         """
         Extract claim information from a document
         
         Args:
             file: The document containing claim information
+            bypass_cache: Call Gemini even if a result is stored
             
         Returns:
             Extracted claim information in structured format
@@ -302,6 +372,7 @@ class GeminiService:
             file=file,
             schema_type=SchemaType.CLAIM_EXTRACT,
             temperature=0.2,
+            bypass_cache=bypass_cache,
         )
     
     async def generate_text(
@@ -342,7 +413,7 @@ class GeminiService:
             )
             
             # Process with Gemini
-            response = self.client.models.generate_content(
+            response = await self._generate_content(
                 model=model,
                 contents=contents,
                 config=generate_content_config,
@@ -478,4 +549,52 @@ class GeminiService:
                 "claim_type": "unknown",
                 "urgency": "medium",
                 "notes": "Failed to analyze email content"
-            }
\ No newline at end of file
+            }
+
+# One GeminiService per worker, created at startup (see main.py), so every
+# request shares its client: credentials are parsed once, access tokens are
+# refreshed once for all callers and HTTP connections are kept alive
+_gemini_service: Optional[GeminiService] = None
+
+def start_gemini_service() -> Optional[GeminiService]:
+    """
+    Create the worker's shared GeminiService if it does not exist yet
+
+    Returns:
+        The service, or None if it could not be configured (logged)
+    """
+    global _gemini_service
+    if _gemini_service is None:
+        try:
+            _gemini_service = GeminiService()
+        except Exception as e:
+            logger.error(f"Gemini service unavailable: {str(e)}")
+    return _gemini_service
+
+async def stop_gemini_service() -> None:
+    """Close the shared GeminiService"""
+    global _gemini_service
+    if _gemini_service is not None:
+        try:
+            await _gemini_service.close()
+        except Exception as e:
+            logger.warning(f"Error closing Gemini client: {str(e)}")
+    _gemini_service = None
+
+def get_gemini_service() -> GeminiService:
+    """
+    FastAPI dependency returning the worker's shared GeminiService
+
+    Created on first use if startup did not create it. Tests replace it
+    with app.dependency_overrides[get_gemini_service].
+
+    Raises:
+        HTTPException: 503 if the service cannot be configured
+    """
+    service = start_gemini_service()
+    if service is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Gemini service is not configured",
+        )
+    return service
@@ -0,0 +1,163 @@
+import json
+import hashlib
+import logging
+from typing import Dict, Optional, Tuple
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+
+from google.genai import types
+from pydantic import ConfigDict
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Schema directory, resolved relative to the package
+SCHEMA_DIR = Path(__file__).resolve().parent.parent / "schemas" / "gemini_models"
+
+# Settings of document extraction calls, whose configs are built at load
+DEFAULT_TEMPERATURE = 0.2
+DEFAULT_MAX_OUTPUT_TOKENS = 65535
+
+# Generation configs kept; further combinations are built per call
+MAX_CONFIGS = 256
+
+# Schema enum for model schemas
+class SchemaType(str, Enum):
+    # Policyholder schemas
+    POLICYHOLDER_EXTRACT = "policyholders/extract_info"
+    POLICYHOLDER_CLAIM = "policyholders/claim_analysis"
+
+    # Claim schemas
+    CLAIM_EXTRACT = "claims/extract_info"
+
+    @classmethod
+    def get_schema_path(cls, schema_type: "SchemaType") -> Path:
+        """Get the full path to a schema file"""
+        return SCHEMA_DIR / f"{schema_type.value}.json"
+
+class SharedGenerateContentConfig(types.GenerateContentConfig):
+    """
+    GenerateContentConfig that refuses attribute assignment
+
+    Shared by concurrent calls, so a caller changing a setting in place
+    would change it for every other call. Use model_copy(update=...) for a
+    variant. The nested response_schema is shared as well and is not
+    frozen; it is never written after loading.
+    """
+    model_config = ConfigDict(frozen=True)
+
+@dataclass(frozen=True)
+class LoadedSchema:
+    """A validated response schema and the hash of its content"""
+    name: str
+    schema: types.Schema
+    version: str
+
+class SchemaRegistry:
+    """
+    Gemini response schemas, loaded and validated once per worker
+
+    Every schemas/gemini_models/**.json file is parsed into a types.Schema
+    at startup (see main.py), so a malformed schema stops the worker instead
+    of failing requests. Generation configs are built once per schema,
+    temperature and output limit and shared by every call, frozen so they
+    cannot be changed in place. Each schema's version is the sha256 of its canonical JSON,
+    which changes the extraction cache key when the schema is edited.
+    """
+
+    def __init__(self, directory: Path = SCHEMA_DIR):
+        self.directory = directory
+        self._schemas: Optional[Dict[str, LoadedSchema]] = None
+        self._configs: Dict[Tuple[str, float, int], SharedGenerateContentConfig] = {}
+
+    @property
+    def loaded(self) -> bool:
+        return self._schemas is not None
+
+    def load(self) -> Dict[str, LoadedSchema]:
+        """
+        Load every schema file under the directory
+
+        Returns:
+            Loaded schemas by name (path relative to the directory, without .json)
+
+        Raises:
+            ValueError: If a file is not a valid schema or a SchemaType has no file
+        """
+        schemas: Dict[str, LoadedSchema] = {}
+        errors = []
+        for path in sorted(self.directory.rglob("*.json")):
+            name = path.relative_to(self.directory).with_suffix("").as_posix()
+            try:
+                content = json.loads(path.read_text())
+                canonical = json.dumps(content, sort_keys=True, separators=(",", ":"))
+                schemas[name] = LoadedSchema(
+                    name=name,
+                    schema=types.Schema.model_validate(content),
+                    version=hashlib.sha256(canonical.encode()).hexdigest(),
+                )
+            except Exception as e:
+                errors.append(f"{name}: {str(e)}")
+        errors.extend(
+            f"{schema_type.value}: no schema file" for schema_type in SchemaType if schema_type.value not in schemas
+        )
+        if errors:
+            raise ValueError(f"Invalid Gemini schemas in {self.directory}: {'; '.join(errors)}")
+
+        self._schemas = schemas
+        self._configs.clear()
+        for schema_type in SchemaType:
+            self.config(schema_type, DEFAULT_TEMPERATURE, DEFAULT_MAX_OUTPUT_TOKENS)
+        logger.info(f"Loaded {len(schemas)} Gemini schemas from {self.directory}")
+        return schemas
+
+    def get(self, schema_type: SchemaType) -> LoadedSchema:
+        """
+        Get a loaded schema, loading the directory on first use
+
+        Args:
+            schema_type: The schema type to get
+
+        Returns:
+            The schema and its version
+        """
+        if self._schemas is None:
+            self.load()
+        return self._schemas[SchemaType(schema_type).value]
+
+    def config(
+        self,
+        schema_type: SchemaType,
+        temperature: float,
+        max_output_tokens: int,
+    ) -> SharedGenerateContentConfig:
+        """
+        Get the shared generation config for a schema
+
+        The model is passed to Gemini separately, so one config serves
+        every model.
+
+        Args:
+            schema_type: The schema to use for structuring the response
+            temperature: Controls randomness of output (0.0-1.0)
+            max_output_tokens: Maximum number of tokens in the response
+
+        Returns:
+            The frozen config, shared by concurrent calls
+        """
+        key = (SchemaType(schema_type).value, float(temperature), max_output_tokens)
+        config = self._configs.get(key)
+        if config is None:
+            config = SharedGenerateContentConfig(
+                temperature=temperature,
+                top_p=0.95,
+                max_output_tokens=max_output_tokens,
+                response_mime_type="application/json",
+                response_schema=self.get(schema_type).schema,
+            )
+            if len(self._configs) < MAX_CONFIGS:
+                self._configs[key] = config
+        return config
+
+schema_registry = SchemaRegistry()
@@ -0,0 +1,86 @@
+import importlib.util
+from pathlib import Path
+
+from sqlalchemy import create_mock_engine
+from sqlmodel import SQLModel
+
+import models  # noqa: F401  registers the tables and their triggers
+from models.inbox_counter import INBOX_COUNTER_SLOTS
+from models.triggers import inbox_counters_function
+
+
+def create_all_sql():
+    """Collect the statements create_all would run through asyncpg."""
+    statements = []
+    engine = create_mock_engine(
+        "postgresql+asyncpg://", lambda sql, *args, **kwargs: statements.append(" ".join(str(sql.compile(dialect=engine.dialect)).split()))
+    )
+    SQLModel.metadata.create_all(engine, checkfirst=False)
+    return statements
+
+
+def test_create_all_adds_inbox_counter_triggers():
+    """Test that an inbox built by create_all gets the counter triggers after it exists."""
+    statements = create_all_sql()
+    inbox = next(i for i, sql in enumerate(statements) if sql.startswith("CREATE TABLE inbox ("))
+    function = next(i for i, sql in enumerate(statements) if "FUNCTION inbox_counters_trigger()" in sql)
+    triggers = [i for i, sql in enumerate(statements) if "EXECUTE FUNCTION inbox_counters_trigger()" in sql]
+
+    assert inbox < function < min(triggers)
+    assert len(triggers) == 2
+    assert "'total'" not in statements[function]
+
+
+def test_create_all_adds_partitioned_parent_triggers():
+    """Test that partitioned inbox and claims get their uniqueness and document triggers."""
+    statements = create_all_sql()
+
+    for table, document_column in (("inbox", "inbox_id"), ("claims", "claim_id")):
+        created = next(i for i, sql in enumerate(statements) if sql.startswith(f"CREATE TABLE {table} ("))
+        assert "PARTITION BY RANGE (created_at)" in statements[created]
+        unique = next(i for i, sql in enumerate(statements) if f"TRIGGER {table}_unique_keys" in sql)
+        documents = next(i for i, sql in enumerate(statements) if f"TRIGGER {table}_documents_set_null" in sql)
+        assert created < unique and created < documents
+        assert f"partitioned_unique_trigger('{table}', 'id', 'claim_id')" in statements[unique]
+        assert f"documents_parent_delete_trigger('{document_column}')" in statements[documents]
+
+    # PL/pgSQL format() placeholders survive DDL's own % formatting
+    function = next(sql for sql in statements if "FUNCTION partitioned_unique_trigger()" in sql)
+    assert "format('SELECT EXISTS (SELECT 1 FROM %I WHERE %I = $1)'" in function
+
+
+def load_migration(revision):
+    """Import the migration module of revision."""
+    path = next((Path(__file__).parents[3] / "migrations" / "versions").glob(f"*-{revision}_*.py"))
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_counters_spread_writers_over_slots():
+    """Test that each transaction writes its counts to one slot, picked by transaction id."""
+    function = inbox_counters_function()
+
+    assert f"(txid_current() % {INBOX_COUNTER_SLOTS})::smallint" in function
+    assert "ON CONFLICT (dimension, key, slot)" in function
+    assert "'total'" not in function
+
+
+def test_earlier_counter_functions_match_their_tables():
+    """Test that migrations before the slot column get the function their table had."""
+    with_total = inbox_counters_function(with_total=True, slots=None)
+
+    assert "('total', '', total_delta)" in with_total
+    assert "ON CONFLICT (dimension, key) DO UPDATE" in with_total
+    assert "slot" not in with_total
+
+
+def test_latest_migration_matches_create_all():
+    """Test that databases built by migrations and by create_all get the same counter function."""
+    migration = load_migration("d7e3a1f5b208")
+
+    assert migration.SLOTS == INBOX_COUNTER_SLOTS
+    assert any(
+        " ".join(inbox_counters_function().split()) in sql for sql in create_all_sql()
+    )
@@ -0,0 +1,117 @@
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy.dialects import postgresql
+
+from models import Inbox
+from repositories import InboxArchiveRepository
+from repositories.archive import InboxArchiver
+from repositories.inbox import identifier_cache
+
+
+@pytest.fixture
+def mock_session():
+    """Create a mock database session."""
+    session = AsyncMock()
+    session.info = {}
+    session.execute.return_value = MagicMock()
+    return session
+
+
+@pytest.fixture
+def archive_repository(mock_session):
+    """Create an InboxArchiveRepository with a mock session."""
+    return InboxArchiveRepository(session=mock_session)
+
+
+def compile_sql(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_archive_moves_batch_in_one_statement(archive_repository, mock_session):
+    """Test that a batch is claimed with SKIP LOCKED and moved by one statement."""
+    mock_session.execute.return_value.all.return_value = [("INB1", "CLM1"), ("INB2", None)]
+    identifier_cache.set("INB1", ("INB1", "CLM1"))
+    identifier_cache.set("CLM1", ("INB1", "CLM1"))
+
+    archived = await archive_repository.archive_processed(datetime(2025, 7, 1, tzinfo=timezone.utc), limit=2)
+
+    setting, move = [call.args[0] for call in mock_session.execute.call_args_list]
+    assert "set_config('inbox.archiving', 'on', true)" in str(setting)
+    sql = compile_sql(move)
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert "DELETE FROM inbox USING batch" in sql
+    assert "INSERT INTO inbox_archive" in sql
+    assert "to_jsonb(moved)" in sql
+    assert "search_vector" not in sql
+    mock_session.commit.assert_awaited_once()
+    assert archived == ["INB1", "INB2"]
+    assert identifier_cache.get("INB1") is None
+    assert identifier_cache.get("CLM1") is None
+    assert "RETURNING inbox_archive.id, inbox_archive.claim_id" in sql
+
+
+@pytest.mark.asyncio
+async def test_archive_rolls_back_on_error(archive_repository, mock_session):
+    """Test that a failed batch is rolled back and not reported as archived."""
+    mock_session.execute.side_effect = [MagicMock(), Exception("deadlock")]
+
+    with pytest.raises(Exception, match="deadlock"):
+        await archive_repository.archive_processed(datetime(2025, 7, 1, tzinfo=timezone.utc))
+
+    mock_session.rollback.assert_awaited_once()
+    mock_session.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_archived_item_by_claim_id(archive_repository, mock_session):
+    """Test that an archived item is rebuilt from its stored JSON."""
+    mock_session.execute.return_value.scalars.return_value.first.return_value = {
+        "id": "INB1",
+        "claim_id": "CLM1",
+        "first_name": "John",
+        "last_name": "Doe",
+        "date_of_birth": "1990-01-01",
+        "event_type": "collision",
+        "event_date": "2025-01-15",
+        "event_location": "Main St",
+        "damage_description": "Dented door",
+        "photos": [],
+        "contact_email": "john@example.com",
+        "inbox_status": "converted",
+        "created_at": "2025-01-16T09:30:00+00:00",
+    }
+
+    inbox_item = await archive_repository.get_by_identifier("CLM1")
+
+    assert isinstance(inbox_item, Inbox)
+    assert inbox_item.id == "INB1"
+    assert inbox_item.date_of_birth.year == 1990
+    sql = compile_sql(mock_session.execute.call_args.args[0])
+    assert "inbox_archive.id = " in sql and "inbox_archive.claim_id = " in sql
+
+
+@pytest.mark.asyncio
+async def test_get_missing_archived_item(archive_repository, mock_session):
+    """Test that an id that was never archived returns None."""
+    mock_session.execute.return_value.scalars.return_value.first.return_value = None
+
+    assert await archive_repository.get_by_identifier("INB404") is None
+
+
+@pytest.mark.asyncio
+async def test_archiver_runs_batches_until_short_batch():
+    """Test that the job keeps moving full batches and stops after a partial one."""
+    archiver = InboxArchiver(interval=60, after_days=90, batch_size=2)
+    session_factory = MagicMock(return_value=AsyncMock())
+    batches = AsyncMock(side_effect=[["INB1", "INB2"], ["INB3", "INB4"], ["INB5"]])
+
+    with patch.object(InboxArchiveRepository, "archive_processed", batches):
+        total = await archiver.archive(session_factory)
+
+    assert total == 5
+    assert batches.await_count == 3
+    # Every batch uses the same cutoff and its own session
+    assert len({call.args[0] for call in batches.await_args_list}) == 1
+    assert session_factory.call_count == 3
@@ -0,0 +1,101 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy.dialects import postgresql
+
+from models import AutouploadEmail
+from repositories import AutouploadEmailRepository
+from repositories.autoupload_email import alias_index
+from repositories.invalidation import invalidation_bus
+
+
+@pytest.fixture
+def mock_session():
+    """Create a mock database session."""
+    session = AsyncMock()
+    session.add = MagicMock()
+    session.info = {}
+    session.execute.return_value = MagicMock()
+    return session
+
+
+@pytest.fixture
+def repository(mock_session):
+    """Create an AutouploadEmailRepository with a mock session."""
+    return AutouploadEmailRepository(session=mock_session)
+
+
+@pytest.fixture(autouse=True)
+def clear_alias_index():
+    """Start each test with an empty routing index."""
+    alias_index.clear()
+    yield
+    alias_index.clear()
+
+
+@pytest.fixture
+def listening(monkeypatch):
+    """Pretend the invalidation listener is connected."""
+    monkeypatch.setattr(
+        invalidation_bus, "_driver_connection", MagicMock(is_closed=MagicMock(return_value=False))
+    )
+
+
+def email_records():
+    return [
+        AutouploadEmail(id="a1", alias="claims", domain="upload.example.com", policy_holder_id="PH1A2B"),
+        AutouploadEmail(id="a2", alias="photos", domain="upload.example.com", policy_holder_id="PH1A2B"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_routing_index_loads_domain_once(repository, mock_session, listening):
+    """Test that a domain is loaded with one query and then served from memory."""
+    mock_session.exec.return_value = MagicMock(all=MagicMock(return_value=email_records()))
+
+    first = await repository.get_by_email("claims-ph1a2b@upload.example.com")
+    second = await repository.get_by_email("Photos-PH1A2B@upload.example.com")
+    missing = await repository.get_by_email("claims-other@upload.example.com")
+
+    assert [record.id for record in first] == ["a1"]
+    assert [record.id for record in second] == ["a2"]
+    assert missing == []
+    assert mock_session.exec.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_sql_fallback_is_one_join(repository, mock_session):
+    """Test that without the listener each lookup is a single joined query."""
+    mock_session.exec.return_value = MagicMock(all=MagicMock(return_value=email_records()[:1]))
+
+    records = await repository.get_by_email("claims-ph1a2b@upload.example.com")
+
+    assert [record.id for record in records] == ["a1"]
+    assert mock_session.exec.await_count == 1
+    sql = str(mock_session.exec.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "JOIN policyholders" in sql
+    assert "autoupload_emails.domain = " in sql
+    assert len(alias_index) == 0
+
+
+@pytest.mark.asyncio
+async def test_upsert_invalidates_routing_index(repository, mock_session):
+    """Test that upserting a record drops cached routes and notifies other workers."""
+    alias_index.set("upload.example.com", {})
+    mock_session.execute.return_value.scalars.return_value.all.return_value = email_records()[:1]
+
+    await repository.upsert(email_records()[0])
+
+    assert len(alias_index) == 0
+    sql = str(mock_session.execute.call_args_list[0].args[0])
+    assert "pg_notify" in sql
+
+
+@pytest.mark.asyncio
+async def test_upsert_updates_existing_columns(repository, mock_session):
+    """Test that a conflicting upsert overwrites only columns the table has."""
+    mock_session.execute.return_value.scalars.return_value.all.return_value = email_records()[:1]
+
+    await repository.upsert(email_records()[0])
+
+    sql = str(mock_session.execute.call_args_list[-1].args[0].compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (alias, policy_holder_id) DO UPDATE SET domain = excluded.domain, updated_at = excluded.updated_at" in sql
@@ -0,0 +1,239 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy.dialects import postgresql
+
+from models import Inbox
+from repositories import InboxRepository
+from repositories.base import count_cache
+from repositories.pagination import TotalMode
+
+
+@pytest.fixture
+def mock_session():
+    """Create a mock database session."""
+    session = AsyncMock()
+    session.add = MagicMock()
+    session.info = {}
+    session.execute.return_value = MagicMock()
+    return session
+
+
+@pytest.fixture
+def inbox_repository(mock_session):
+    """Create an InboxRepository with a mock session."""
+    return InboxRepository(session=mock_session)
+
+
+def executed_sql(mock_session, call_index=0):
+    """Compile the statement passed to session.execute for PostgreSQL."""
+    statement = mock_session.execute.call_args_list[call_index].args[0]
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_update_is_single_statement(inbox_repository, mock_session):
+    """Test that update issues one UPDATE ... RETURNING and no refresh."""
+    updated = Inbox(first_name="Jane", last_name="Doe")
+    mock_session.execute.return_value.scalars = MagicMock(
+        return_value=MagicMock(first=MagicMock(return_value=updated))
+    )
+
+    result = await inbox_repository.update("abc", {"priority": "high", "unknown": 1})
+
+    assert result is updated
+    mock_session.execute.assert_awaited_once()
+    sql = executed_sql(mock_session)
+    assert sql.startswith("UPDATE inbox SET priority=")
+    assert "unknown" not in sql
+    assert "RETURNING" in sql
+    mock_session.commit.assert_awaited_once()
+    mock_session.refresh.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_assign_moves_new_items_to_processing(inbox_repository, mock_session):
+    """Test that assignment decides the status transition in SQL."""
+    await inbox_repository.assign_to_user("INB123", "adjuster@example.com")
+
+    mock_session.execute.assert_awaited_once()
+    sql = executed_sql(mock_session)
+    assert "CASE WHEN (inbox.inbox_status = " in sql
+    assert "inbox.claim_id = " in sql and "OR inbox.id = " in sql
+
+
+@pytest.mark.asyncio
+async def test_create_uses_insert_returning(inbox_repository, mock_session):
+    """Test that create inserts and reads the row back in one statement."""
+    await inbox_repository.create_inbox_item({
+        "first_name": "Jane",
+        "last_name": "Doe",
+        "event_type": "collision",
+        "contact_email": "jane@example.com",
+    })
+
+    mock_session.execute.assert_awaited_once()
+    sql = executed_sql(mock_session)
+    assert sql.startswith("INSERT INTO inbox")
+    assert "RETURNING" in sql
+    mock_session.add.assert_not_called()
+    mock_session.refresh.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_writes_skip_database_maintained_columns(inbox_repository, mock_session):
+    """Test that trigger-maintained and generated columns are never written."""
+    await inbox_repository.update(
+        "INBOX-1", {"priority": "high", "document_count": 99, "search_vector": "x"}
+    )
+
+    sql = executed_sql(mock_session)
+    assert "priority=" in sql
+    assert "document_count=" not in sql
+    assert "search_vector=" not in sql
+
+
+@pytest.mark.asyncio
+async def test_delete_uses_delete_returning(inbox_repository, mock_session):
+    """Test that delete reports whether a row was removed from the RETURNING rows."""
+    mock_session.execute.return_value.scalars = MagicMock(
+        return_value=MagicMock(all=MagicMock(return_value=[]))
+    )
+
+    assert await inbox_repository.delete("missing") is False
+    sql = executed_sql(mock_session)
+    assert sql.startswith("DELETE FROM inbox")
+    assert "RETURNING" in sql
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_chunks_ordered_inserts(inbox_repository, mock_session):
+    """Test that bulk_create issues one ordered executemany INSERT ... RETURNING per chunk."""
+    mock_session.execute.return_value.scalars = MagicMock(
+        return_value=MagicMock(all=MagicMock(return_value=[]))
+    )
+    rows = [
+        {"first_name": f"Jane{i}", "last_name": "Doe", "event_type": "collision", "contact_email": "jane@example.com"}
+        for i in range(5)
+    ]
+
+    await inbox_repository.bulk_create(rows, chunk_size=2)
+
+    assert mock_session.execute.await_count == 3
+    statement, params = mock_session.execute.await_args_list[0].args
+    assert [row["first_name"] for row in params] == ["Jane0", "Jane1"]
+    assert statement._sort_by_parameter_order
+    sql = executed_sql(mock_session)
+    assert sql.startswith("INSERT INTO inbox")
+    assert "RETURNING" in sql
+    mock_session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_uses_executemany(inbox_repository, mock_session):
+    """Test that bulk_update passes the rows as executemany parameters."""
+    rows = [{"id": "a", "priority": "high"}, {"id": "b", "priority": "low"}]
+
+    assert await inbox_repository.bulk_update(rows) == 2
+
+    mock_session.execute.assert_awaited_once()
+    assert mock_session.execute.call_args.args[1] == rows
+    mock_session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_updates_on_conflict(inbox_repository, mock_session):
+    """Test that bulk_upsert writes ON CONFLICT DO UPDATE for the chosen columns."""
+    mock_session.execute.return_value.scalars = MagicMock(
+        return_value=MagicMock(all=MagicMock(return_value=[]))
+    )
+
+    await inbox_repository.bulk_upsert(
+        [{"first_name": "Jane", "last_name": "Doe", "event_type": "collision", "contact_email": "jane@example.com"}],
+        index_elements=["claim_id"],
+        update_columns=["first_name"],
+    )
+
+    sql = executed_sql(mock_session)
+    assert "ON CONFLICT (claim_id) DO UPDATE SET first_name = excluded.first_name" in sql
+    assert "RETURNING" in sql
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_needs_conflict_columns_on_partitioned_tables(inbox_repository, mock_session):
+    """Test that a partitioned table's (id, created_at) key is not used as the default conflict target."""
+    with pytest.raises(ValueError, match="partitioned table inbox"):
+        await inbox_repository.bulk_upsert(
+            [{"first_name": "Jane", "last_name": "Doe", "event_type": "collision", "contact_email": "jane@example.com"}]
+        )
+
+    mock_session.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_count_where_none_skips_query(inbox_repository, mock_session):
+    """Test that include_total=none does not touch the database."""
+    assert await inbox_repository.count_where(Inbox.priority == "high", mode=TotalMode.NONE) is None
+    mock_session.exec.assert_not_awaited()
+    mock_session.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_count_where_estimate_reads_plan_rows(inbox_repository, mock_session):
+    """Test that the estimate comes from the planner's row estimate."""
+    mock_session.execute.return_value.scalar_one = MagicMock(
+        return_value='[{"Plan": {"Node Type": "Seq Scan", "Plan Rows": 1234}}]'
+    )
+
+    total = await inbox_repository.count_where(Inbox.priority == "high", mode=TotalMode.ESTIMATE)
+
+    assert total == 1234
+    sql = executed_sql(mock_session)
+    assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT inbox.id")
+    assert "inbox.priority = %(priority_1)s" in sql
+
+
+@pytest.mark.asyncio
+async def test_count_where_estimate_keeps_values_bound(inbox_repository, mock_session):
+    """Test that filter values reach the EXPLAIN as parameters, not SQL text."""
+    mock_session.execute.return_value.scalar_one = MagicMock(return_value=[{"Plan": {"Plan Rows": 3}}])
+
+    total = await inbox_repository.count_where(Inbox.first_name == "Acme :ltd 100%", mode=TotalMode.ESTIMATE)
+
+    assert total == 3
+    compiled = mock_session.execute.call_args.args[0].compile(dialect=postgresql.dialect())
+    assert "Acme" not in str(compiled)
+    assert list(compiled.params.values()) == ["Acme :ltd 100%"]
+
+
+@pytest.mark.asyncio
+async def test_count_where_cached_reuses_count(inbox_repository, mock_session):
+    """Test that cached counts are computed once per filter set."""
+    count_cache.clear()
+    mock_session.exec.return_value = MagicMock(one=MagicMock(return_value=7))
+
+    first = await inbox_repository.count_where(Inbox.priority == "urgent", mode=TotalMode.CACHED)
+    second = await inbox_repository.count_where(Inbox.priority == "urgent", mode=TotalMode.CACHED)
+    await inbox_repository.count_where(Inbox.priority == "low", mode=TotalMode.CACHED)
+
+    assert first == second == 7
+    assert mock_session.exec.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_highlights_keeps_matching_fields(inbox_repository, mock_session):
+    """Test that highlights only include fields where the query matched."""
+    mock_session.execute.return_value.mappings = MagicMock(return_value=[
+        {
+            "id": "INB1",
+            "email_subject": "Deer collision",
+            "damage_description": "Hit a <mark>deer</mark> on the highway",
+            "raw_email_content": None,
+        },
+        {"id": "INB2", "email_subject": "", "damage_description": "Hail", "raw_email_content": ""},
+    ])
+
+    highlights = await inbox_repository.get_highlights(["INB1", "INB2"], "deer")
+
+    assert highlights == {"INB1": {"damage_description": "Hit a <mark>deer</mark> on the highway"}}
+    sql = executed_sql(mock_session)
+    assert "ts_headline" in sql
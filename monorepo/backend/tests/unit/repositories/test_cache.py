@@ -0,0 +1,45 @@
+from unittest.mock import patch
+
+from repositories.cache import TTLCache
+
+
+def test_entries_expire_after_ttl():
+    """Test that entries are served until their time to live runs out."""
+    cache = TTLCache(maxsize=10, ttl=30)
+
+    with patch("repositories.cache.time.monotonic", return_value=100.0):
+        cache.set("key", 1)
+    with patch("repositories.cache.time.monotonic", return_value=129.0):
+        assert cache.get("key") == 1
+    with patch("repositories.cache.time.monotonic", return_value=131.0):
+        assert cache.get("key") is None
+
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    """Test that the cache stays within maxsize by evicting the LRU entry."""
+    cache = TTLCache(maxsize=2, ttl=30)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_invalidate_matching_drops_entries_by_value():
+    """Test that entries can be dropped by value, under any key."""
+    cache = TTLCache(maxsize=10, ttl=30)
+    cache.set(("id", "PH1"), "PH1")
+    cache.set(("email", "a@example.com"), "PH1")
+    cache.set(("id", "PH2"), "PH2")
+
+    assert cache.invalidate_matching(lambda value: value == "PH1") == 2
+
+    assert cache.get(("id", "PH2")) == "PH2"
+    assert len(cache) == 1
@@ -0,0 +1,119 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy.dialects import postgresql
+
+from models.document import Document
+from repositories.document import DocumentRepository
+
+
+@pytest.fixture
+def mock_session():
+    """Create a mock database session."""
+    session = AsyncMock()
+    session.add = MagicMock()
+    session.info = {}
+    session.execute.return_value = MagicMock()
+    return session
+
+
+@pytest.fixture
+def document_repository(mock_session):
+    """Create a DocumentRepository with a mock session."""
+    return DocumentRepository(session=mock_session)
+
+
+def compiled(statement):
+    """Compile a statement for PostgreSQL."""
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_count_documents_uses_sql_count(document_repository, mock_session):
+    """Test that counting runs COUNT in the database instead of loading rows."""
+    mock_session.exec.return_value = MagicMock(one=MagicMock(return_value=42))
+
+    total = await document_repository.count_documents(claim_id="CLM-1")
+
+    assert total == 42
+    sql = compiled(mock_session.exec.call_args.args[0])
+    assert sql.startswith("SELECT count(*)")
+    assert "documents.claim_id = " in sql
+    mock_session.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_list_with_total_is_one_query(document_repository, mock_session):
+    """Test that the page and its total come from one windowed query."""
+    documents = [Document(file_name="a.jpg", file_url="u1"), Document(file_name="b.jpg", file_url="u2")]
+    mock_session.execute.return_value.all.return_value = [(document, 7) for document in documents]
+
+    page, total = await document_repository.list_documents_with_total(skip=0, limit=2, inbox_id="INBOX-1")
+
+    assert page == documents
+    assert total == 7
+    mock_session.execute.assert_awaited_once()
+    sql = compiled(mock_session.execute.call_args.args[0])
+    assert "count(*) OVER ()" in sql
+    assert "ORDER BY documents.created_at DESC, documents.id DESC" in sql
+
+
+@pytest.mark.asyncio
+async def test_list_with_total_past_last_page_counts(document_repository, mock_session):
+    """Test that an empty page past the end still reports the total."""
+    mock_session.execute.return_value.all.return_value = []
+    mock_session.exec.return_value = MagicMock(one=MagicMock(return_value=3))
+
+    page, total = await document_repository.list_documents_with_total(skip=100, limit=10)
+
+    assert page == []
+    assert total == 3
+
+
+@pytest.mark.asyncio
+async def test_transfer_is_one_update_returning(document_repository, mock_session):
+    """Test that transferring documents is a single set-based UPDATE."""
+    moved = [Document(file_name="a.jpg", file_url="u1", claim_id="CLM-1")]
+    mock_session.execute.return_value.scalars.return_value.all.return_value = moved
+
+    transferred = await document_repository.transfer_documents_to_claim("INBOX-1", "CLM-1")
+
+    assert transferred == moved
+    mock_session.execute.assert_awaited_once()
+    sql = compiled(mock_session.execute.call_args.args[0])
+    assert sql.startswith("UPDATE documents SET claim_id=CASE documents.inbox_id")
+    assert "inbox_id=" in sql
+    assert "WHERE documents.inbox_id IN" in sql
+    assert "RETURNING" in sql
+    mock_session.refresh.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_bulk_transfer_maps_each_inbox_to_its_claim(document_repository, mock_session):
+    """Test that documents of many inbox items move in one statement."""
+    await document_repository.transfer_documents_to_claims({"INBOX-1": "CLM-1", "INBOX-2": "CLM-2"})
+
+    mock_session.execute.assert_awaited_once()
+    statement = mock_session.execute.call_args.args[0]
+    sql = str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    assert "WHEN 'INBOX-1' THEN 'CLM-1' WHEN 'INBOX-2' THEN 'CLM-2'" in sql
+    assert "IN ('INBOX-1', 'INBOX-2')" in sql
+
+
+@pytest.mark.asyncio
+async def test_bulk_transfer_without_items_is_a_no_op(document_repository, mock_session):
+    """Test that an empty transfer issues no statement."""
+    assert await document_repository.transfer_documents_to_claims({}) == []
+    mock_session.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_rolls_back(document_repository, mock_session):
+    """Test that a failed batch insert leaves the session usable for the caller's next write."""
+    mock_session.execute.side_effect = Exception("insert failed")
+    document = MagicMock(dict=MagicMock(return_value={"file_name": "a.pdf", "file_type": "application/pdf", "file_url": "https://x/a.pdf"}))
+
+    with pytest.raises(Exception, match="insert failed"):
+        await document_repository.create_documents([document])
+
+    mock_session.rollback.assert_awaited_once()
+    mock_session.commit.assert_not_awaited()
@@ -0,0 +1,133 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy.dialects import postgresql
+
+from repositories import ExtractionResultRepository
+from repositories.extraction import ExtractionStore, extraction_key
+
+
+@pytest.fixture
+def store():
+    """Create an active ExtractionStore with mock sessions and no eviction job."""
+    store = ExtractionStore(enabled=True, interval=0)
+    store._session_factory = MagicMock(return_value=AsyncMock())
+    return store
+
+
+def test_key_covers_every_part():
+    """Test that changing any part of an extraction changes its key."""
+    parts = ("a" * 64, "application/pdf", "claims/extract_info", "gemini-2.5-pro-preview-03-25", 0.2, 65535, "v1")
+    key = extraction_key(*parts)
+
+    assert key == extraction_key(*parts)
+    assert len(key) == 64
+    others = ("b" * 64, "image/png", "claims/other", "gemini-1.5-flash", 0.7, 1024, "v2")
+    for index, other in enumerate(others):
+        changed = list(parts)
+        changed[index] = other
+        assert extraction_key(*changed) != key
+
+
+@pytest.mark.asyncio
+async def test_stored_result_skips_compute(store):
+    """Test that a stored result is served without calling Gemini."""
+    compute = AsyncMock()
+
+    with patch.object(ExtractionResultRepository, "get_result", AsyncMock(return_value={"claim": 1})):
+        result = await store.get_or_compute("KEY", "claims/extract_info", "model", compute)
+
+    assert result == {"claim": 1}
+    compute.assert_not_awaited()
+    assert store.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_compute_once(store):
+    """Test that concurrent requests for one key share a single Gemini call."""
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"claim": 1}
+
+    put = AsyncMock()
+    with patch.object(ExtractionResultRepository, "get_result", AsyncMock(return_value=None)), \
+            patch.object(ExtractionResultRepository, "put_result", put):
+        results = await asyncio.gather(
+            *(store.get_or_compute("KEY", "claims/extract_info", "model", compute) for _ in range(5))
+        )
+
+    assert results == [{"claim": 1}] * 5
+    assert calls == 1
+    put.assert_awaited_once_with("KEY", "claims/extract_info", "model", {"claim": 1})
+    assert store.stats()["inflight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_bypass_recomputes_and_replaces(store):
+    """Test that bypass skips the lookup but stores the fresh result."""
+    get_result = AsyncMock(return_value={"claim": "old"})
+    put = AsyncMock()
+
+    with patch.object(ExtractionResultRepository, "get_result", get_result), \
+            patch.object(ExtractionResultRepository, "put_result", put):
+        result = await store.get_or_compute(
+            "KEY", "claims/extract_info", "model", AsyncMock(return_value={"claim": "new"}), bypass=True
+        )
+
+    assert result == {"claim": "new"}
+    get_result.assert_not_awaited()
+    put.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_storage_errors_fall_back_to_compute(store):
+    """Test that an unavailable store does not fail the extraction."""
+    with patch.object(ExtractionResultRepository, "get_result", AsyncMock(side_effect=Exception("down"))), \
+            patch.object(ExtractionResultRepository, "put_result", AsyncMock(side_effect=Exception("down"))):
+        result = await store.get_or_compute(
+            "KEY", "claims/extract_info", "model", AsyncMock(return_value={"claim": 1})
+        )
+
+    assert result == {"claim": 1}
+
+
+@pytest.mark.asyncio
+async def test_uncacheable_result_is_not_stored(store):
+    """Test that results rejected by cacheable are returned but not stored."""
+    put = AsyncMock()
+
+    with patch.object(ExtractionResultRepository, "get_result", AsyncMock(return_value=None)), \
+            patch.object(ExtractionResultRepository, "put_result", put):
+        result = await store.get_or_compute(
+            "KEY",
+            "claims/extract_info",
+            "model",
+            AsyncMock(return_value={"raw_response": "not json"}),
+            cacheable=lambda result: "raw_response" not in result,
+        )
+
+    assert result == {"raw_response": "not json"}
+    put.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_evict_deletes_expired_and_least_recently_used():
+    """Test that eviction removes expired rows and those past max_entries by last use."""
+    session = AsyncMock()
+    session.info = {}
+    session.execute.return_value = MagicMock(rowcount=2)
+
+    deleted = await ExtractionResultRepository(session).evict(ttl_days=30, max_entries=1000)
+
+    expired, unused = [
+        str(call.args[0].compile(dialect=postgresql.dialect())) for call in session.execute.call_args_list
+    ]
+    assert "extraction_results.created_at <= " in expired
+    assert "ORDER BY extraction_results.last_used_at DESC" in unused
+    assert "OFFSET" in unused
+    assert deleted == 4
+    session.commit.assert_awaited_once()
@@ -0,0 +1,45 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlmodel import select
+
+from models import Inbox
+from repositories.fieldsets import field_columns, parse_fields, row_dicts
+from schemas.inbox import INBOX_LIST_FIELDS, InboxListItem
+
+
+def test_defaults_include_required_fields():
+    """Test that the list view is used when no fields are given."""
+    fields = parse_fields(None, InboxListItem.model_fields, ("first_name", "id"))
+
+    assert fields == ["id", "created_at", "first_name"]
+
+
+def test_requested_fields_are_validated():
+    """Test that unknown field names are rejected."""
+    assert parse_fields("priority, email_subject", InboxListItem.model_fields, INBOX_LIST_FIELDS) == [
+        "id", "created_at", "priority", "email_subject",
+    ]
+    with pytest.raises(ValueError, match="password"):
+        parse_fields("priority,password", InboxListItem.model_fields, INBOX_LIST_FIELDS)
+
+
+def test_list_view_selects_plain_columns():
+    """Test that only the selected columns are read, as tuples rather than entities."""
+    fields = parse_fields(None, InboxListItem.model_fields, INBOX_LIST_FIELDS)
+    statement = select(*field_columns(Inbox, fields))
+
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+
+    assert sql.startswith("SELECT inbox.id, inbox.created_at, inbox.claim_id")
+    for heavy in ("raw_email_content", "claim_metadata", "damage_description", "search_vector"):
+        assert f"inbox.{heavy}" not in sql
+
+
+def test_row_dicts_serialize_without_validation():
+    """Test that rows map to dicts matching the list item schema."""
+    rows = [("INBOX-1", None, "high")]
+
+    data = row_dicts(rows, ["id", "created_at", "priority"])
+
+    assert data == [{"id": "INBOX-1", "created_at": None, "priority": "high"}]
+    assert InboxListItem.model_validate(data[0]).model_dump(exclude_unset=True) == data[0]
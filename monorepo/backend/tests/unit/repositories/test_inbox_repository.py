@@ -0,0 +1,161 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy.dialects import postgresql
+
+from database import ROUTE_KEY
+from repositories import InboxRepository
+from models import Inbox
+from repositories.inbox import StatsMode, identifier_cache
+
+
+@pytest.fixture
+def mock_session():
+    """Create a mock database session."""
+    session = AsyncMock()
+    session.add = MagicMock()
+    session.info = {}
+    session.execute.return_value = MagicMock()
+    return session
+
+
+@pytest.fixture
+def inbox_repository(mock_session):
+    """Create an InboxRepository with a mock session."""
+    return InboxRepository(session=mock_session)
+
+
+@pytest.fixture(autouse=True)
+def clear_identifier_cache():
+    """Start each test with an empty identifier cache."""
+    identifier_cache.clear()
+    yield
+    identifier_cache.clear()
+
+
+def executed_sql(mock_session):
+    """Compile the statement passed to session.exec for PostgreSQL."""
+    statement = mock_session.exec.call_args.args[0]
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_stats_read_counter_table(inbox_repository, mock_session):
+    """Test that default stats are one read of the counter table."""
+    mock_session.exec.return_value = MagicMock(all=MagicMock(return_value=[
+        ("status", "new", 5),
+        ("status", "converted", 7),
+        ("priority", "normal", 10),
+        ("priority", "urgent", 2),
+        ("assignee", "", 9),
+        ("assignee", "adjuster@example.com", 3),
+    ]))
+
+    stats = await inbox_repository.get_inbox_stats()
+
+    mock_session.exec.assert_awaited_once()
+    sql = executed_sql(mock_session)
+    assert "sum(inbox_counters.count)" in sql
+    assert sql.endswith("GROUP BY inbox_counters.dimension, inbox_counters.key")
+    assert stats["total"] == 12
+    assert stats["status"] == {
+        "new": 5, "processing": 0, "converted": 7, "rejected": 0, "archived": 0,
+    }
+    assert stats["priority"] == {"normal": 10, "urgent": 2}
+    assert stats["assignee"] == {"unassigned": 9, "adjuster@example.com": 3}
+
+
+@pytest.mark.asyncio
+async def test_live_stats_use_one_grouping_sets_query(inbox_repository, mock_session):
+    """Test that live stats count every breakdown in a single query."""
+    mock_session.exec.return_value = MagicMock(all=MagicMock(return_value=[
+        ("new", None, None, 0b011, 4),
+        (None, "high", None, 0b101, 4),
+        (None, None, None, 0b110, 4),
+    ]))
+
+    stats = await inbox_repository.get_inbox_stats(StatsMode.LIVE)
+
+    mock_session.exec.assert_awaited_once()
+    assert "GROUP BY GROUPING SETS" in executed_sql(mock_session)
+    assert stats["total"] == 4
+    assert stats["status"]["new"] == 4
+    assert stats["priority"] == {"high": 4}
+    assert stats["assignee"] == {"unassigned": 4}
+
+
+def inbox_item(**overrides):
+    """Build an inbox row without touching the database."""
+    return Inbox.model_construct(id="INBOX-1", claim_id="CLM-1", **overrides)
+
+
+@pytest.mark.asyncio
+async def test_identifier_miss_matches_both_columns_in_one_query(inbox_repository, mock_session):
+    """Test that an unknown identifier is resolved by one query on id or claim_id."""
+    mock_session.exec.return_value = MagicMock(first=MagicMock(return_value=inbox_item()))
+
+    result = await inbox_repository.get_by_identifier("CLM-1")
+
+    assert result.id == "INBOX-1"
+    assert mock_session.exec.await_count == 1
+    sql = executed_sql(mock_session)
+    assert "inbox.claim_id = " in sql and "OR inbox.id = " in sql
+    assert identifier_cache.get("CLM-1") == ("INBOX-1", "CLM-1")
+    assert identifier_cache.get("INBOX-1") == ("INBOX-1", "CLM-1")
+
+
+@pytest.mark.asyncio
+async def test_identifier_hit_uses_primary_key(inbox_repository, mock_session):
+    """Test that a cached identifier is looked up by primary key only."""
+    identifier_cache.set("CLM-1", ("INBOX-1", "CLM-1"))
+    mock_session.exec.return_value = MagicMock(first=MagicMock(return_value=inbox_item()))
+
+    await inbox_repository.get_by_identifier("CLM-1")
+
+    sql = executed_sql(mock_session)
+    assert "inbox.id = " in sql
+    assert "claim_id" not in sql.split("WHERE", 1)[1]
+
+
+@pytest.mark.asyncio
+async def test_identifier_lookup_reads_from_replica(inbox_repository, mock_session):
+    """Test that resolving an identifier is routed to the read replica like other lookups."""
+    routes = []
+
+    async def exec(statement):
+        routes.append(mock_session.info.get(ROUTE_KEY))
+        return MagicMock(first=MagicMock(return_value=inbox_item()))
+
+    mock_session.exec.side_effect = exec
+
+    await inbox_repository.get_by_identifier("CLM-1")
+
+    assert routes == ["replica"]
+    assert ROUTE_KEY not in mock_session.info
+
+
+@pytest.mark.asyncio
+async def test_delete_evicts_cached_identifiers(inbox_repository, mock_session):
+    """Test that deleting an inbox item drops both of its cached identifiers."""
+    identifier_cache.set("INBOX-1", ("INBOX-1", "CLM-1"))
+    identifier_cache.set("CLM-1", ("INBOX-1", "CLM-1"))
+    mock_session.execute.return_value.scalars.return_value.all.return_value = [inbox_item()]
+
+    assert await inbox_repository.delete("INBOX-1") is True
+
+    assert identifier_cache.get("INBOX-1") is None
+    assert identifier_cache.get("CLM-1") is None
+
+
+@pytest.mark.asyncio
+async def test_search_with_fields_returns_rows(inbox_repository, mock_session):
+    """Test that selecting fields reads column tuples instead of entities."""
+    mock_session.exec.return_value = MagicMock(one=MagicMock(return_value=1))
+    mock_session.execute.return_value = MagicMock(all=MagicMock(return_value=[("INBOX-1", None)]))
+
+    items, total = await inbox_repository.search_inbox_items(fields=["id", "created_at"])
+
+    assert items == [("INBOX-1", None)]
+    assert total == 1
+    statement = mock_session.execute.call_args.args[0]
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert sql.startswith("SELECT inbox.id, inbox.created_at \nFROM inbox")
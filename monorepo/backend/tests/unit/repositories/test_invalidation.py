@@ -0,0 +1,83 @@
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from repositories.invalidation import InvalidationBus
+
+
+@pytest.fixture
+def bus():
+    """Create a bus with a recording handler on one topic."""
+    bus = InvalidationBus()
+    bus.received = []
+    bus.subscribe("things", bus.received.append)
+    return bus
+
+
+@pytest.mark.asyncio
+async def test_publish_runs_local_handlers_and_notifies(bus):
+    """Test that publishing invalidates locally and sends pg_notify on the session."""
+    session = AsyncMock()
+
+    await bus.publish(session, "things", "key-1")
+
+    assert bus.received == ["key-1"]
+    statement, params = session.execute.call_args.args
+    assert "pg_notify" in str(statement)
+    assert params["channel"] == bus.channel
+    assert json.loads(params["payload"]) == {"topic": "things", "key": "key-1"}
+
+
+def test_notifications_from_other_workers_are_dispatched(bus):
+    """Test that a NOTIFY payload reaches the topic's handlers only."""
+    bus._on_notify(None, 1, bus.channel, json.dumps({"topic": "things", "key": None}))
+    bus._on_notify(None, 1, bus.channel, json.dumps({"topic": "other", "key": "x"}))
+    bus._on_notify(None, 1, bus.channel, "not json")
+
+    assert bus.received == [None]
+
+
+def test_lost_listener_invalidates_everything(bus):
+    """Test that a dropped connection clears every topic and stops listening."""
+    bus._driver_connection = MagicMock(is_closed=MagicMock(return_value=False))
+    assert bus.listening
+
+    bus._on_terminate(bus._driver_connection)
+
+    assert bus.received == [None]
+    assert not bus.listening
+
+
+@pytest.mark.asyncio
+async def test_lost_listener_reconnects_with_backoff():
+    """Test that a dropped listener is re-established and everything is cleared again."""
+    bus = InvalidationBus(reconnect_min=0.001, reconnect_max=0.004)
+    bus.received = []
+    bus.subscribe("things", bus.received.append)
+    bus._listen = AsyncMock(side_effect=[True, False, False, True])
+    await bus.start(MagicMock())
+
+    bus._on_terminate(None)
+    await bus._reconnect_task
+
+    assert bus._listen.await_count == 4
+    # Once when the connection dropped, once when listening resumed
+    assert bus.received == [None, None]
+    assert bus._reconnect_task is None
+    await bus.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_cancels_reconnect():
+    """Test that stopping the bus ends pending reconnect attempts."""
+    bus = InvalidationBus(reconnect_min=60)
+    bus._listen = AsyncMock(return_value=False)
+
+    await bus.start(MagicMock())
+    assert bus._reconnect_task is not None
+
+    await bus.stop()
+
+    assert bus._reconnect_task is None
+    bus._on_terminate(None)
+    assert bus._reconnect_task is None
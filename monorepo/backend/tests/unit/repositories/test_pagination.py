@@ -0,0 +1,47 @@
+import pytest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from sqlalchemy.dialects import postgresql
+
+from models import Inbox
+from repositories.pagination import (
+    decode_cursor,
+    encode_cursor,
+    keyset_condition,
+    next_cursor,
+)
+
+
+def test_cursor_round_trip():
+    """Test that a cursor decodes back to the row it was built from."""
+    created_at = datetime(2025, 6, 17, 3, 29, 9, 409493, tzinfo=timezone.utc)
+
+    cursor = encode_cursor(created_at, "INB12AB34CD")
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, "INB12AB34CD")
+
+
+def test_decode_cursor_rejects_garbage():
+    """Test that malformed cursors raise ValueError."""
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_next_cursor_only_on_full_pages():
+    """Test that next_cursor points at the last row of a full page."""
+    created_at = datetime(2025, 6, 17, tzinfo=timezone.utc)
+    items = [SimpleNamespace(created_at=created_at, id=f"INB{i}") for i in range(3)]
+
+    assert next_cursor(items, limit=3) == encode_cursor(created_at, "INB2")
+    assert next_cursor(items, limit=4) is None
+    assert next_cursor([], limit=3) is None
+
+
+def test_keyset_condition_compares_row_values():
+    """Test that the keyset filter is a row comparison the index can serve."""
+    after = (datetime(2025, 6, 17, tzinfo=timezone.utc), "INB1")
+
+    sql = str(keyset_condition(Inbox, after).compile(dialect=postgresql.dialect()))
+
+    assert sql.startswith("(inbox.created_at, inbox.id) < (")
@@ -0,0 +1,164 @@
+from datetime import date, datetime, timezone
+from functools import partial
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from models import Claim, Inbox
+from repositories.pagination import keyset_condition
+from repositories.partitions import (
+    add_months,
+    create_partition_sql,
+    created_conditions,
+    maintain_partitions,
+    partition_month,
+    partition_name,
+    plan_partitions,
+)
+
+
+def compile_sql(clause):
+    return str(clause.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_add_months_crosses_years():
+    """Test that month arithmetic wraps around the year in both directions."""
+    assert add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+    assert add_months(date(2025, 1, 1), -1) == date(2024, 12, 1)
+
+
+def test_partition_names_round_trip():
+    """Test that a partition's month can be read back from its name."""
+    name = partition_name("inbox", date(2025, 10, 1))
+
+    assert name == "inbox_y2025m10"
+    assert partition_month(name) == date(2025, 10, 1)
+    assert partition_month("inbox_archive") is None
+
+
+def test_create_partition_sql_bounds_month_in_utc():
+    """Test that a partition covers exactly one calendar month in UTC."""
+    sql = create_partition_sql("claims", date(2025, 12, 1))
+
+    assert sql == (
+        "CREATE TABLE IF NOT EXISTS claims_y2025m12 PARTITION OF claims "
+        "FOR VALUES FROM ('2025-12-01 00:00:00+00') TO ('2026-01-01 00:00:00+00')"
+    )
+
+
+def test_plan_creates_missing_upcoming_months():
+    """Test that the current month and the premade ones are created if absent."""
+    missing, expired = plan_partitions(
+        ["inbox_y2025m10", "inbox_y2025m11"], today=date(2025, 10, 17), premake=3, retention=0
+    )
+
+    assert missing == [date(2025, 12, 1), date(2026, 1, 1)]
+    assert expired == []
+
+
+def test_plan_detaches_months_past_retention():
+    """Test that only months older than the retention window are detached."""
+    attached = ["claims_y2025m06", "claims_y2025m07", "claims_y2025m08", "claims_y2025m09", "claims_y2025m10"]
+
+    missing, expired = plan_partitions(attached, today=date(2025, 10, 17), premake=0, retention=2)
+
+    assert missing == []
+    assert expired == ["claims_y2025m06", "claims_y2025m07"]
+
+
+def test_created_conditions_bound_partition_key():
+    """Test that received dates become a half-open created_at range in UTC."""
+    lower, upper = created_conditions(Claim, date(2025, 10, 1), date(2025, 10, 31))
+
+    assert compile_sql(lower) == "claims.created_at >= '2025-10-01 00:00:00+00:00'"
+    assert compile_sql(upper) == "claims.created_at < '2025-11-01 00:00:00+00:00'"
+
+
+def test_keyset_condition_bounds_created_at_for_pruning():
+    """Test that the cursor also bounds created_at on its own."""
+    after = (datetime(2025, 6, 17, tzinfo=timezone.utc), "INB1")
+
+    sql = compile_sql(keyset_condition(Inbox, after))
+
+    assert sql.endswith("AND inbox.created_at <= '2025-06-17 00:00:00+00:00'")
+
+
+class FakeConnection:
+    """Records executed SQL and answers the catalog and emptiness queries."""
+
+    def __init__(self, partitions, nonempty=()):
+        self.partitions = partitions
+        self.nonempty = set(nonempty)
+        self.sql = []
+
+    async def execution_options(self, **kwargs):
+        return self
+
+    async def execute(self, statement, params=None):
+        sql = str(statement)
+        self.sql.append(sql)
+        result = MagicMock()
+        if "pg_inherits" in sql:
+            result.all.return_value = self.partitions.get(params["table"], [])
+        elif sql.startswith("SELECT EXISTS"):
+            result.scalar_one.return_value = sql.split("FROM ")[1].rstrip(")") in self.nonempty
+        else:
+            result.scalar_one.return_value = True
+        return result
+
+
+def fake_engine(connection):
+    engine = MagicMock()
+    for method in (engine.connect, engine.begin):
+        method.return_value.__aenter__ = AsyncMock(return_value=connection)
+        method.return_value.__aexit__ = AsyncMock(return_value=False)
+    return engine
+
+
+@pytest.mark.asyncio
+async def test_maintain_keeps_inbox_months_that_still_hold_items():
+    """Test that expired inbox months are only detached once the archive emptied them."""
+    connection = FakeConnection(
+        {"inbox": [("inbox_y2025m01", False), ("inbox_y2025m02", False)]},
+        nonempty={"inbox_y2025m02"},
+    )
+
+    with patch("repositories.partitions.plan_partitions", partial(plan_partitions, retention=3)):
+        changes = await maintain_partitions(fake_engine(connection), today=date(2025, 10, 15))
+
+    assert changes["inbox"]["detached"] == ["inbox_y2025m01"]
+    assert "ALTER TABLE inbox DETACH PARTITION inbox_y2025m01 CONCURRENTLY" in connection.sql
+    assert not any("DETACH PARTITION inbox_y2025m02" in sql for sql in connection.sql)
+
+
+@pytest.mark.asyncio
+async def test_maintain_unlinks_documents_of_detached_claims():
+    """Test that documents of claims in a detached month lose their claim_id."""
+    connection = FakeConnection({"claims": [("claims_y2025m01", False), ("claims_y2025m02", True)]})
+
+    with patch("repositories.partitions.plan_partitions", partial(plan_partitions, retention=3)):
+        changes = await maintain_partitions(fake_engine(connection), today=date(2025, 10, 15))
+
+    assert changes["claims"]["detached"] == ["claims_y2025m02", "claims_y2025m01"]
+    for name in ("claims_y2025m01", "claims_y2025m02"):
+        detach = next(i for i, sql in enumerate(connection.sql) if f"DETACH PARTITION {name}" in sql)
+        assert connection.sql[detach + 1] == (
+            f"UPDATE documents SET claim_id = NULL FROM {name} WHERE documents.claim_id = {name}.id"
+        )
+
+
+@pytest.mark.asyncio
+async def test_maintain_without_detach_only_creates_under_xact_lock():
+    """Test that create-only runs take a transaction lock, safe behind pgbouncer."""
+    connection = FakeConnection({"inbox": [("inbox_y2025m01", False)], "claims": [("claims_y2025m01", True)]})
+    engine = fake_engine(connection)
+
+    with patch("repositories.partitions.plan_partitions", partial(plan_partitions, retention=3)):
+        changes = await maintain_partitions(engine, today=date(2025, 10, 15), detach=False)
+
+    engine.begin.assert_called_once()
+    engine.connect.assert_not_called()
+    assert connection.sql[0] == "SELECT pg_try_advisory_xact_lock(:key)"
+    assert not any("DETACH" in sql or "unlock" in sql for sql in connection.sql)
+    assert changes["inbox"] == {"created": ["inbox_y2025m10", "inbox_y2025m11", "inbox_y2025m12", "inbox_y2026m01"], "detached": []}
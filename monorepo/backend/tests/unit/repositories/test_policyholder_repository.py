@@ -0,0 +1,131 @@
+import datetime
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from models import PolicyHolder
+from repositories import PolicyHolderRepository
+from repositories.invalidation import invalidation_bus
+from repositories.policyholder import policyholder_cache
+
+
+@pytest.fixture
+def mock_session():
+    """Create a mock database session."""
+    session = AsyncMock()
+    session.add = MagicMock()
+    session.info = {}
+    session.execute.return_value = MagicMock()
+    return session
+
+
+@pytest.fixture
+def repository(mock_session):
+    """Create a PolicyHolderRepository with a mock session."""
+    return PolicyHolderRepository(session=mock_session)
+
+
+@pytest.fixture(autouse=True)
+def clear_policyholder_cache():
+    """Start each test with an empty cache."""
+    policyholder_cache.clear()
+    yield
+    policyholder_cache.clear()
+
+
+@pytest.fixture
+def listening(monkeypatch):
+    """Pretend the invalidation listener is connected."""
+    monkeypatch.setattr(
+        invalidation_bus, "_driver_connection", MagicMock(is_closed=MagicMock(return_value=False))
+    )
+
+
+def policyholder():
+    return PolicyHolder(
+        id="PH1A2B3C",
+        first_name="Jane",
+        last_name="Doe",
+        date_of_birth=datetime.date(1990, 1, 1),
+        email="jane@example.com",
+        phone="555-0100",
+        address={"street": "1 Main St", "city": "Springfield", "state": "IL", "zip": "62701"},
+        linked_policies=["POL1"],
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_by_id_reads_through_cache(repository, mock_session, listening):
+    """Test that a policyholder is loaded once and then served from the cache."""
+    mock_session.exec.return_value = MagicMock(first=MagicMock(return_value=policyholder()))
+
+    first = await repository.get_by_id("PH1A2B3C")
+    second = await repository.get_by_id("PH1A2B3C")
+
+    assert first.email == second.email == "jane@example.com"
+    assert mock_session.exec.await_count == 1
+    assert policyholder_cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_misses_are_not_cached(repository, mock_session, listening):
+    """Test that an unknown policyholder is looked up again next time."""
+    mock_session.exec.return_value = MagicMock(first=MagicMock(return_value=None))
+
+    assert await repository.get_by_email("new@example.com") is None
+    assert await repository.get_by_email("new@example.com") is None
+
+    assert mock_session.exec.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_reads_skip_cache_without_listener(repository, mock_session):
+    """Test that without invalidations from other workers every read goes to the database."""
+    cached = policyholder()
+    policyholder_cache.set(("id", cached.id), cached)
+    mock_session.exec.return_value = MagicMock(first=MagicMock(return_value=policyholder()))
+
+    first = await repository.get_by_id(cached.id)
+    await repository.get_by_id(cached.id)
+
+    assert first is not cached
+    assert mock_session.exec.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_update_invalidates_every_key(repository, mock_session):
+    """Test that updating drops the id and email entries and notifies other workers."""
+    cached = policyholder()
+    policyholder_cache.set(("id", cached.id), cached)
+    policyholder_cache.set(("email", cached.email), cached)
+    mock_session.execute.return_value.scalars.return_value.first.return_value = cached
+
+    await repository.update_policyholder(cached.id, MagicMock(model_dump=MagicMock(return_value={"phone": "555-0199"})))
+
+    assert len(policyholder_cache) == 0
+    assert "pg_notify" in str(mock_session.execute.call_args_list[0].args[0])
+
+
+@pytest.mark.asyncio
+async def test_delete_removes_autoupload_emails_first(repository, mock_session):
+    """Test that deleting a policyholder deletes their emails in the same transaction and drops their routes."""
+    emails = MagicMock()
+    emails.scalars.return_value.all.return_value = ["claims.example.com", "claims.example.com", "example.org"]
+    deleted = MagicMock()
+    deleted.scalars.return_value.all.return_value = [policyholder()]
+    mock_session.execute.side_effect = lambda statement, *args, **kwargs: (
+        emails if "DELETE FROM autoupload_emails" in str(statement)
+        else deleted if "DELETE FROM policyholders" in str(statement)
+        else MagicMock()
+    )
+
+    assert await repository.delete_policyholder("PH1A2B3C") is True
+
+    statements = [str(call.args[0]) for call in mock_session.execute.call_args_list]
+    deletes = [sql for sql in statements if sql.startswith("DELETE")]
+    assert deletes[0].startswith("DELETE FROM autoupload_emails")
+    assert deletes[1].startswith("DELETE FROM policyholders")
+    payloads = [call.args[1]["payload"] for call in mock_session.execute.call_args_list if len(call.args) > 1]
+    assert '{"topic": "autoupload_emails", "key": "claims.example.com"}' in payloads
+    assert '{"topic": "autoupload_emails", "key": "example.org"}' in payloads
+    assert len(payloads) == 3
+    mock_session.commit.assert_awaited_once()
@@ -0,0 +1,83 @@
+from sqlalchemy.dialects import postgresql
+
+from models import Claim
+from repositories import ClaimRepository
+import pytest
+
+from repositories.search import (
+    NameMatch,
+    metadata_conditions,
+    name_condition,
+    name_rank,
+    parse_metadata,
+    text_condition,
+)
+
+
+def compile_sql(clause):
+    return str(clause.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_contains_match_keeps_ilike():
+    """Test that the default mode is the original substring match."""
+    sql = compile_sql(name_condition(Claim, "smi"))
+
+    assert sql == "claims.first_name ILIKE '%%smi%%' OR claims.last_name ILIKE '%%smi%%'"
+
+
+def test_fuzzy_match_adds_trigram_similarity():
+    """Test that fuzzy mode also accepts trigram-similar names."""
+    sql = compile_sql(name_condition(Claim, "jonh", NameMatch.FUZZY))
+
+    assert "claims.first_name %% 'jonh'" in sql
+    assert "claims.last_name %% 'jonh'" in sql
+
+
+def test_name_rank_uses_best_similarity():
+    """Test that ranking takes the closer of first and last name."""
+    sql = compile_sql(name_rank(Claim, "jonh"))
+
+    assert sql == "greatest(similarity(claims.first_name, 'jonh'), similarity(claims.last_name, 'jonh'))"
+
+
+def test_text_condition_uses_web_search_syntax():
+    """Test that q is parsed with websearch_to_tsquery against the search vector."""
+    sql = compile_sql(text_condition(Claim, "deer -hail"))
+
+    assert sql == "claims.search_vector @@ websearch_to_tsquery('english'::regconfig, 'deer -hail')"
+
+
+def test_metadata_conditions_use_path_ops_operators():
+    """Test that containment uses @> and key existence uses a jsonpath @? test."""
+    contains, has_key = metadata_conditions(Claim.claim_metadata, {"source": "mailgun_webhook"}, ["recipient"])
+
+    assert compile_sql(contains) == """claims.claim_metadata @> CAST('{"source": "mailgun_webhook"}' AS JSONB)"""
+    assert compile_sql(has_key) == """claims.claim_metadata @? CAST('$."recipient"' AS JSONPATH)"""
+
+
+def test_metadata_key_is_quoted_in_path():
+    """Test that a key cannot break out of the jsonpath string."""
+    (condition,) = metadata_conditions(Claim.claim_metadata, keys=['a" || $.b'])
+
+    assert condition.right.clause.value == '$."a\\" || $.b"'
+
+
+def test_metadata_conditions_empty_without_filters():
+    """Test that no conditions are added when no metadata filter is given."""
+    assert metadata_conditions(Claim.claim_metadata) == []
+
+
+@pytest.mark.parametrize("value", ["not json", "[1, 2]", '"source"'])
+def test_parse_metadata_rejects_non_objects(value):
+    """Test that only JSON objects are accepted as metadata filters."""
+    with pytest.raises(ValueError, match="JSON object"):
+        parse_metadata(value)
+
+
+def test_search_vector_is_not_written():
+    """Test that the generated column is left out of INSERT and UPDATE values."""
+    repository = ClaimRepository(session=None)
+
+    values = repository._column_values({"damage_description": "Hit a deer", "search_vector": "x"})
+
+    assert values == {"damage_description": "Hit a deer"}
@@ -0,0 +1,76 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from models import Document
+from repositories import DocumentRepository, UnitOfWork
+
+
+@pytest.fixture
+def mock_session():
+    """Create a mock database session."""
+    session = AsyncMock()
+    session.add = MagicMock()
+    session.info = {}
+    return session
+
+
+@pytest.fixture
+def document_repository(mock_session):
+    """Create a DocumentRepository with a mock session."""
+    return DocumentRepository(session=mock_session)
+
+
+@pytest.mark.asyncio
+async def test_save_commits_outside_unit_of_work(document_repository, mock_session):
+    """Test that repository writes commit and refresh on their own by default."""
+    document = Document(file_name="a.pdf", file_url="/uploads/a.pdf")
+
+    await document_repository._save(document)
+
+    mock_session.commit.assert_awaited_once()
+    mock_session.refresh.assert_awaited_once_with(document)
+    mock_session.flush.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_commits_once(document_repository, mock_session):
+    """Test that writes inside a unit of work flush and commit once at the end."""
+    uow = UnitOfWork(session=mock_session)
+
+    async with uow.transaction():
+        await document_repository._save(Document(file_name="a.pdf", file_url="/uploads/a.pdf"))
+        await document_repository._save(Document(file_name="b.pdf", file_url="/uploads/b.pdf"))
+        assert uow.active
+
+    assert mock_session.flush.await_count == 2
+    mock_session.refresh.assert_not_awaited()
+    mock_session.commit.assert_awaited_once()
+    assert not uow.active
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_rolls_back_on_error(document_repository, mock_session):
+    """Test that a failing step rolls back the whole unit of work."""
+    uow = UnitOfWork(session=mock_session)
+
+    with pytest.raises(RuntimeError):
+        async with uow.transaction():
+            await document_repository._save(Document(file_name="a.pdf", file_url="/uploads/a.pdf"))
+            await document_repository._rollback()
+            raise RuntimeError("conversion failed")
+
+    mock_session.commit.assert_not_awaited()
+    mock_session.rollback.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_nested_unit_of_work_joins_outer(mock_session):
+    """Test that nested transactions do not commit early."""
+    uow = UnitOfWork(session=mock_session)
+
+    async with uow.transaction():
+        async with uow.transaction():
+            pass
+        mock_session.commit.assert_not_awaited()
+
+    mock_session.commit.assert_awaited_once()
@@ -5,7 +5,7 @@ from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
 from routes.ai.routes import router as ai_router
-from services.gemini import GeminiService
+from services.gemini import GeminiService, get_gemini_service
 
 
 @pytest.fixture
@@ -33,11 +33,8 @@ def mock_gemini_service():
 def override_dependencies(app, mock_gemini_service):
     """Override the dependencies for testing."""
     
-    def get_gemini_service():
-        return mock_gemini_service
-    
     app.dependency_overrides = {
-        GeminiService: get_gemini_service,
+        get_gemini_service: lambda: mock_gemini_service,
     }
     
     yield
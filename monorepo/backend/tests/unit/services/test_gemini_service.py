@@ -0,0 +1,129 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from fastapi import HTTPException
+
+import services.gemini as gemini
+from services.gemini import GeminiService, SchemaType, get_gemini_service, start_gemini_service, stop_gemini_service
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_service():
+    """Start and end each test without a shared service."""
+    gemini._gemini_service = None
+    yield
+    gemini._gemini_service = None
+
+
+def test_api_key_client(monkeypatch):
+    """Test that without service account credentials the client gets the API key."""
+    monkeypatch.delenv("GOOGLE_APPLICATION_CREDENTIALS_JSON", raising=False)
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+
+    with patch("services.gemini.genai") as mock_genai:
+        service = GeminiService()
+
+    mock_genai.Client.assert_called_once_with(api_key="test-key")
+    assert service.client is mock_genai.Client.return_value
+
+
+def test_service_is_shared_across_requests():
+    """Test that the dependency builds one service per worker and reuses it."""
+    with patch("services.gemini.GeminiService") as mock_service:
+        first = get_gemini_service()
+        second = get_gemini_service()
+
+    mock_service.assert_called_once_with()
+    assert first is second
+
+
+def test_unconfigured_service_is_unavailable():
+    """Test that a service that cannot be built answers 503 and is retried later."""
+    with patch("services.gemini.GeminiService", side_effect=ValueError("no credentials")) as mock_service:
+        assert start_gemini_service() is None
+        with pytest.raises(HTTPException) as error:
+            get_gemini_service()
+
+    assert error.value.status_code == 503
+    assert mock_service.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_stop_closes_client():
+    """Test that shutdown releases the shared client."""
+    service = MagicMock(close=AsyncMock())
+    gemini._gemini_service = service
+
+    await stop_gemini_service()
+
+    service.close.assert_awaited_once_with()
+    assert gemini._gemini_service is None
+
+
+@pytest.mark.asyncio
+async def test_close_releases_async_client():
+    """Test that close awaits the async client's aclose, which owns the call connections."""
+    with patch("services.gemini.genai"):
+        service = GeminiService()
+    service.client.aio.aclose = AsyncMock()
+
+    await service.close()
+
+    service.client.aio.aclose.assert_awaited_once_with()
+    service.client.close.assert_called_once_with()
+
+
+@pytest.mark.asyncio
+async def test_calls_use_async_client():
+    """Test that text generation awaits the async client instead of blocking the loop."""
+    with patch("services.gemini.genai"):
+        service = GeminiService()
+    service.client.aio.models.generate_content = AsyncMock(return_value=MagicMock(text="hello"))
+
+    assert await service.generate_text("Say hello") == "hello"
+
+    service.client.aio.models.generate_content.assert_awaited_once()
+    service.client.models.generate_content.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_are_capped():
+    """Test that no more than max_concurrency calls are in flight at once."""
+    with patch("services.gemini.genai"):
+        service = GeminiService(max_concurrency=2)
+    in_flight = 0
+    peak = 0
+
+    async def slow_call(**kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return MagicMock(text="ok")
+
+    service.client.aio.models.generate_content = slow_call
+
+    results = await asyncio.gather(*(service.generate_text(f"Prompt {i}") for i in range(5)))
+
+    assert results == ["ok"] * 5
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_documents_are_stored_by_content():
+    """Test that extractions are looked up by document content, not by upload."""
+    with patch("services.gemini.genai"):
+        service = GeminiService()
+
+    with patch("repositories.extraction.extraction_store") as store:
+        store.active = True
+        store.get_or_compute = AsyncMock(return_value={"claim": 1})
+        await service.process_document(b"%PDF-1", SchemaType.CLAIM_EXTRACT)
+        await service.process_document(b"%PDF-1", SchemaType.CLAIM_EXTRACT, bypass_cache=True)
+        await service.process_document(b"%PDF-1", SchemaType.CLAIM_EXTRACT, temperature=0.5)
+
+    first, again, warmer = store.get_or_compute.await_args_list
+    assert first.args[0] == again.args[0] != warmer.args[0]
+    assert again.kwargs["bypass"] is True
+    service.client.aio.models.generate_content.assert_not_called()
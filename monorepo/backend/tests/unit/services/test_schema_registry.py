@@ -0,0 +1,82 @@
+import json
+import pytest
+from pydantic import ValidationError
+
+from services.schema_registry import SCHEMA_DIR, SchemaRegistry, SchemaType
+
+
+def write_schemas(directory, **overrides):
+    """Write a minimal schema for every SchemaType, with overrides by name."""
+    for schema_type in SchemaType:
+        path = directory / f"{schema_type.value}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        content = overrides.get(schema_type.value, {"type": "OBJECT", "properties": {"name": {"type": "STRING"}}})
+        path.write_text(content if isinstance(content, str) else json.dumps(content))
+
+
+def test_repository_schemas_load():
+    """Test that every schema shipped with the package is valid and versioned."""
+    registry = SchemaRegistry(SCHEMA_DIR)
+
+    schemas = registry.load()
+
+    for schema_type in SchemaType:
+        assert registry.get(schema_type) is schemas[schema_type.value]
+        assert len(registry.get(schema_type).version) == 64
+
+
+def test_configs_are_built_once_and_shared(tmp_path):
+    """Test that calls with the same settings get the same prebuilt config."""
+    write_schemas(tmp_path)
+    registry = SchemaRegistry(tmp_path)
+    registry.load()
+
+    config = registry.config(SchemaType.CLAIM_EXTRACT, 0.2, 65535)
+
+    assert registry.config(SchemaType.CLAIM_EXTRACT, 0.2, 65535) is config
+    assert config.response_schema is registry.get(SchemaType.CLAIM_EXTRACT).schema
+    assert registry.config(SchemaType.CLAIM_EXTRACT, 0.7, 65535) is not config
+
+
+def test_shared_configs_cannot_be_changed(tmp_path):
+    """Test that a shared config rejects assignment but can be copied with changes."""
+    write_schemas(tmp_path)
+    registry = SchemaRegistry(tmp_path)
+    registry.load()
+    config = registry.config(SchemaType.CLAIM_EXTRACT, 0.2, 65535)
+
+    with pytest.raises(ValidationError):
+        config.temperature = 1.0
+
+    assert config.model_copy(update={"temperature": 1.0}).temperature == 1.0
+    assert registry.config(SchemaType.CLAIM_EXTRACT, 0.2, 65535).temperature == 0.2
+
+
+def test_version_follows_content_not_formatting(tmp_path):
+    """Test that reformatting a schema keeps its version and editing it changes it."""
+    schema = {"type": "OBJECT", "properties": {"name": {"type": "STRING"}}}
+    write_schemas(tmp_path, **{"claims/extract_info": json.dumps(schema, indent=2)})
+    original = SchemaRegistry(tmp_path).load()["claims/extract_info"].version
+
+    write_schemas(tmp_path, **{"claims/extract_info": json.dumps(schema)})
+    reformatted = SchemaRegistry(tmp_path).load()["claims/extract_info"].version
+
+    schema["properties"]["age"] = {"type": "INTEGER"}
+    write_schemas(tmp_path, **{"claims/extract_info": schema})
+    edited = SchemaRegistry(tmp_path).load()["claims/extract_info"].version
+
+    assert original == reformatted != edited
+
+
+def test_invalid_schemas_fail_loading(tmp_path):
+    """Test that malformed files and missing schema types are all reported."""
+    write_schemas(tmp_path, **{"claims/extract_info": "{not json", "policyholders/extract_info": {"typo": "OBJECT"}})
+    (tmp_path / "policyholders" / "claim_analysis.json").unlink()
+
+    with pytest.raises(ValueError) as error:
+        SchemaRegistry(tmp_path).load()
+
+    message = str(error.value)
+    assert "claims/extract_info:" in message
+    assert "policyholders/extract_info:" in message
+    assert "policyholders/claim_analysis: no schema file" in message